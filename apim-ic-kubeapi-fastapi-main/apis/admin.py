@@ -0,0 +1,152 @@
+import setting.k8s as k8s
+from monitoring.admin import require_admin
+from monitoring.memory import GroupBy, tracker
+from monitoring.profiler import list_profiles, profile_path
+from monitoring.tracing import memory_exporter
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from fastapi.responses import FileResponse
+
+import asyncio
+
+
+router = APIRouter(
+    prefix="/admin",
+    dependencies=[Depends(require_admin)]
+)
+
+@router.get(
+    '/profiles',
+    tags=["Admin"],
+    summary="저장된 요청 프로파일 목록",
+    description="X-Profile 헤더로 수집한 요청 프로파일 파일 목록을 반환합니다. (X-Admin-Token 필요)",
+    responses={
+        200: {"description": "프로파일 목록"},
+        403: {"description": "관리자 토큰 없음 또는 불일치"}
+    }
+)
+async def read_profiles():
+    return {"data": list_profiles()}
+
+@router.get(
+    '/profiles/{profile_id}',
+    tags=["Admin"],
+    summary="요청 프로파일 다운로드",
+    description="`.folded`는 flamegraph.pl / inferno / speedscope, `.pstats`는 snakeviz / flameprof로 열 수 있습니다. (X-Admin-Token 필요)",
+    responses={
+        200: {"description": "프로파일 파일"},
+        403: {"description": "관리자 토큰 없음 또는 불일치"},
+        404: {"description": "프로파일 없음"}
+    }
+)
+async def read_profile(profile_id: str):
+    path = profile_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile '{profile_id}' not found")
+    media_type = "text/plain" if profile_id.endswith(".folded") else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=profile_id)
+
+@router.get(
+    '/memory',
+    tags=["Admin"],
+    summary="메모리 추적 상태",
+    description="tracemalloc 추적 여부, 현재 / 최대 추적 메모리와 저장된 스냅샷 목록을 반환합니다. (X-Admin-Token 필요)",
+)
+async def read_memory_status():
+    return tracker.status()
+
+@router.post(
+    '/memory/start',
+    tags=["Admin"],
+    summary="메모리 추적 시작",
+    description="tracemalloc을 시작합니다. 추적 중에는 할당마다 비용이 추가되므로 진단이 끝나면 중지하세요. (X-Admin-Token 필요)",
+)
+async def start_memory_tracing(frames: int = Query(k8s.MEMORY_TRACE_FRAMES, ge=1, le=100, description="할당마다 저장할 트레이스백 깊이")):
+    return tracker.start(frames)
+
+@router.post(
+    '/memory/stop',
+    tags=["Admin"],
+    summary="메모리 추적 중지",
+    description="tracemalloc을 중지하고 저장된 스냅샷을 모두 삭제합니다. (X-Admin-Token 필요)",
+)
+async def stop_memory_tracing():
+    return tracker.stop()
+
+@router.post(
+    '/memory/snapshots/{name}',
+    tags=["Admin"],
+    summary="메모리 스냅샷 저장",
+    description="현재 할당 상태를 이름을 붙여 저장하고 모듈별 상위 할당을 반환합니다. (X-Admin-Token 필요)",
+    responses={
+        200: {"description": "스냅샷 저장"},
+        409: {"description": "메모리 추적이 시작되지 않음"}
+    }
+)
+async def create_memory_snapshot(name: str):
+    try:
+        # 스냅샷 수집 / 집계는 무거우므로 스레드에서 실행 (GIL 전환으로 다른 요청도 진행)
+        return await asyncio.to_thread(tracker.take, name)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.get(
+    '/memory/snapshots/{name}',
+    tags=["Admin"],
+    summary="스냅샷 상위 할당 위치",
+    description="스냅샷의 상위 할당 위치를 모듈(apis.servers, cache.informer ...) / 파일 / 줄 단위로 묶어 반환합니다. (X-Admin-Token 필요)",
+    responses={
+        200: {"description": "상위 할당 위치"},
+        404: {"description": "스냅샷 없음"}
+    }
+)
+async def read_memory_snapshot(name: str, group: GroupBy = "module", limit: int = Query(20, ge=1, le=500)):
+    try:
+        return await asyncio.to_thread(tracker.top, name, group, limit)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Snapshot '{name}' not found")
+
+@router.delete(
+    '/memory/snapshots/{name}',
+    tags=["Admin"],
+    summary="메모리 스냅샷 삭제",
+    description="저장된 스냅샷을 삭제합니다. (X-Admin-Token 필요)",
+)
+async def delete_memory_snapshot(name: str):
+    if not tracker.delete(name):
+        raise HTTPException(status_code=404, detail=f"Snapshot '{name}' not found")
+    return {"message": "deleted", "name": name}
+
+@router.get(
+    '/memory/diff',
+    tags=["Admin"],
+    summary="메모리 스냅샷 비교",
+    description="base 대비 target 스냅샷에서 늘어나거나 줄어든 할당을 모듈 / 파일 / 줄 단위로 묶어 변화량 순으로 반환합니다. (X-Admin-Token 필요)",
+    responses={
+        200: {"description": "스냅샷 비교"},
+        404: {"description": "스냅샷 없음"}
+    }
+)
+async def read_memory_diff(base: str, target: str, group: GroupBy = "module", limit: int = Query(20, ge=1, le=500)):
+    try:
+        return await asyncio.to_thread(tracker.diff, base, target, group, limit)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Snapshot {e} not found")
+
+
+@router.get(
+    '/traces',
+    tags=["Admin"],
+    summary="최근 트레이스 조회",
+    description="TRACE_EXPORTER=memory로 보관 중인 최근 trace와 span 목록을 반환합니다. 응답 헤더 X-Trace-Id로 특정 요청만 조회할 수 있습니다. (X-Admin-Token 필요)",
+    responses={
+        200: {"description": "trace 목록"},
+        404: {"description": "메모리 exporter 미사용"}
+    }
+)
+async def read_traces(trace_id: Optional[str] = None, limit: int = Query(20, ge=1, le=500)):
+    exporter = memory_exporter()
+    if exporter is None:
+        raise HTTPException(status_code=404, detail="In-memory trace exporter is not enabled (TRACE_EXPORTER=memory)")
+    return {"data": exporter.traces(trace_id, limit)}
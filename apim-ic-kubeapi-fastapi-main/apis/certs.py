@@ -1,17 +1,40 @@
 import setting.k8s as k8s
+from clients.kube import get_kube_client, list_items
+from cache.informer import Informer
+from cache.kube_cache import get_secret_informer, get_name_resolver
+from cache.resolver import NameResolver, NAMESPACE_QUERY_DESCRIPTION
+from utils.streaming import StreamFormat, STREAM_QUERY_DESCRIPTION, list_pages, cached_pages, list_response, stream_list_response
+from utils.etag import IF_NONE_MATCH_DESCRIPTION, etag_matches, not_modified, version_etag
 from schema.cert import CertificateItem, CertificateResponse
+from monitoring.timing import TimedRoute
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Header, Query
 from fastapi.responses import JSONResponse
 
+from typing import Optional
+
 import httpx
-import orjson
 import base64
 
 router = APIRouter(
-    prefix="/kubeapi/certs"
+    prefix="/kubeapi/certs",
+    route_class=TimedRoute
 )
 
+async def _list_tls_secret_metadata(client: httpx.AsyncClient, url: str) -> list:
+    # type 필터는 fieldSelector로 KubeAPI에서 처리하고, 인증서/키 data 없이 metadata만 전송받음
+    return await list_items(client, url, k8s.API_HEADER_METADATA, {"fieldSelector": k8s.TLS_SECRET_FIELD_SELECTOR})
+
+def _tls_secret_item(item: dict) -> dict:
+    metadata = item.get("metadata", {})
+    return {
+        "name": metadata.get("name", ""),
+        "namespace": metadata.get("namespace", ""),
+        "uid" : metadata.get("uid", ""),
+        # PartialObjectMetadata에는 type이 없음 (fieldSelector로 보장됨)
+        "type": item.get("type", k8s.TLS_SECRET_TYPE)
+    }
+
 @router.post(
     '/',
     response_model=CertificateResponse,
@@ -25,7 +48,7 @@ router = APIRouter(
         500: {"description": "서버 내부 오류"}
     }
 )
-async def create_tls_secret(cert_item: CertificateItem):
+async def create_tls_secret(cert_item: CertificateItem, client: httpx.AsyncClient = Depends(get_kube_client)):
     # Validate input
     if not all([cert_item.namespace, cert_item.name, cert_item.tls_crt, cert_item.tls_key]):
         raise HTTPException(status_code=400, detail="Invalid certificate details")
@@ -46,28 +69,27 @@ async def create_tls_secret(cert_item: CertificateItem):
     }
 
     # Create secret in Kubernetes
-    async with httpx.AsyncClient(verify=False) as client:
-        try:
-            response = await client.post(
-                url=f"https://kubernetes.default.svc.cluster.local/api/v1/namespaces/{cert_item.namespace}/secrets",
-                headers=k8s.API_HEADER,
-                json=secret_payload
-            )
-            
-            # Check response status
-            if response.status_code not in [200, 201]:
-                raise HTTPException(status_code=response.status_code, detail=response.text)
-            
-            return CertificateResponse(
-                data=[{
-                    "name": cert_item.name,
-                    "namespace": cert_item.namespace,
-                    "status": "Created"
-                }]
-            )
+    try:
+        response = await client.post(
+            url=f"{k8s.API_URL_CORE}/namespaces/{cert_item.namespace}/secrets",
+            headers=k8s.API_HEADER,
+            json=secret_payload
+        )
         
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+        # Check response status
+        if response.status_code not in [200, 201]:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+        
+        return CertificateResponse(
+            data=[{
+                "name": cert_item.name,
+                "namespace": cert_item.namespace,
+                "status": "Created"
+            }]
+        )
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 @router.get(
     '/',
@@ -80,28 +102,29 @@ async def create_tls_secret(cert_item: CertificateItem):
         400: {"description": "잘못된 요청"}
     }
 )
-async def read_namespace_tls_secrets():
-    async with httpx.AsyncClient(verify=False) as client:
-        response = await client.get(
-            url=k8s.API_URL_TLS_SECRET,
-            headers=k8s.API_HEADER,
+async def read_tls_secrets(
+    stream: Optional[StreamFormat] = Query(None, description=STREAM_QUERY_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None, description=IF_NONE_MATCH_DESCRIPTION),
+    client: httpx.AsyncClient = Depends(get_kube_client),
+    informer: Optional[Informer] = Depends(get_secret_informer)
+):
+    if stream:
+        pages = cached_pages(informer.list()) if informer is not None else list_pages(
+            client, k8s.API_URL_TLS_SECRET, k8s.API_HEADER_METADATA, {"fieldSelector": k8s.TLS_SECRET_FIELD_SELECTOR}
         )
-        
-        response_json = orjson.loads(response.text)
-        
-        # Filter only TLS type secrets
-        tls_secrets = [
-            {
-                "name": item.get("metadata", {}).get("name", ""),
-                "namespace": item.get("metadata", {}).get("namespace", ""),
-                "uid" : item.get("metadata", {}).get("uid", ""),
-                "type": item.get("type", "")
-            }
-            for item in response_json.get("items", [])
-            if item.get("type") == "kubernetes.io/tls"
-        ]
-            
-    return CertificateResponse(data=tls_secrets)
+        return await stream_list_response(pages, _tls_secret_item, stream)
+
+    # TLS Secret 캐시(metadata만 보관)가 동기화됐으면 KubeAPI 호출 없이 응답
+    etag = None
+    if informer is not None:
+        etag = version_etag(informer.version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        items = informer.list()
+    else:
+        items = await _list_tls_secret_metadata(client, k8s.API_URL_TLS_SECRET)
+    
+    return list_response(items, _tls_secret_item, etag, if_none_match)
 
 @router.get(
     '/{namespace}',
@@ -114,28 +137,30 @@ async def read_namespace_tls_secrets():
         400: {"description": "잘못된 요청"}
     }
 )
-async def read_namespace_tls_secrets(namespace: str):
-    async with httpx.AsyncClient(verify=False) as client:
-        response = await client.get(
-            url=f"https://kubernetes.default.svc.cluster.local/api/v1/namespaces/{namespace}/secrets",
-            headers=k8s.API_HEADER,
+async def read_namespace_tls_secrets(
+    namespace: str,
+    stream: Optional[StreamFormat] = Query(None, description=STREAM_QUERY_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None, description=IF_NONE_MATCH_DESCRIPTION),
+    client: httpx.AsyncClient = Depends(get_kube_client),
+    informer: Optional[Informer] = Depends(get_secret_informer)
+):
+    url = f"{k8s.API_URL_CORE}/namespaces/{namespace}/secrets"
+    if stream:
+        pages = cached_pages(informer.list(namespace)) if informer is not None else list_pages(
+            client, url, k8s.API_HEADER_METADATA, {"fieldSelector": k8s.TLS_SECRET_FIELD_SELECTOR}
         )
-        
-        response_json = orjson.loads(response.text)
-        
-        # Filter only TLS type secrets
-        tls_secrets = [
-            {
-                "name": item.get("metadata", {}).get("name", ""),
-                "namespace": item.get("metadata", {}).get("namespace", ""),
-                "uid" : item.get("metadata", {}).get("uid", ""),
-                "type": item.get("type", "")
-            }
-            for item in response_json.get("items", [])
-            if item.get("type") == "kubernetes.io/tls"
-        ]
-            
-    return CertificateResponse(data=tls_secrets)
+        return await stream_list_response(pages, _tls_secret_item, stream)
+
+    etag = None
+    if informer is not None:
+        etag = version_etag(informer.version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        items = informer.list(namespace)
+    else:
+        items = await _list_tls_secret_metadata(client, url)
+    
+    return list_response(items, _tls_secret_item, etag, if_none_match)
 
 @router.delete(
     "/",
@@ -145,47 +170,43 @@ async def read_namespace_tls_secrets(namespace: str):
     responses={
         200: {"description": "Cert가 성공적으로 삭제됨"},
         404: {"description": "Cert를 찾을 수 없음"},
+        409: {"description": "같은 이름의 Cert가 여러 네임스페이스에 존재함"},
         400: {"description": "잘못된 요청"}
     }
 )
-async def delete_cert(name: str):
-    async with httpx.AsyncClient(verify=False) as client:
-        response = await client.get(
-            url=k8s.API_URL_TLS_SECRET,
-            headers=k8s.API_HEADER
-        )
-        response_json = response.json()
-        
-        found_cert = next(
-            (item for item in response_json.get("items", []) 
-             if item["metadata"]["name"] == name or item["metadata"]["name"] == f"{name}-cert"),
-            None
-        )
+async def delete_cert(
+    name: str,
+    namespace: Optional[str] = Query(None, description=NAMESPACE_QUERY_DESCRIPTION),
+    client: httpx.AsyncClient = Depends(get_kube_client),
+    resolver: NameResolver = Depends(get_name_resolver)
+):
+    # 생성 시 붙는 -cert 접미사 이름도 함께 탐색 (TLS Secret metadata 캐시, 미스 시 이름으로만 조회)
+    found_cert = await resolver.resolve(client, "secrets", name, namespace, aliases=[f"{name}-cert"])
 
-        if not found_cert:
-            raise HTTPException(
-                status_code=404, 
-                detail=f"TLS-Secret with name {name} not found"
-            )
+    if not found_cert:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"TLS-Secret with name {name} not found"
+        )
 
-        # 찾은 Cert의 namespace 추출
-        cert_name = found_cert["metadata"]["name"]
-        namespace = found_cert["metadata"]["namespace"]
+    # 찾은 Cert의 namespace 추출
+    cert_name = found_cert["metadata"]["name"]
+    namespace = found_cert["metadata"]["namespace"]
 
-        delete_response = await client.delete(
-            url=f"https://kubernetes.default.svc.cluster.local/api/v1/namespaces/{namespace}/secrets/{cert_name}",
-            headers=k8s.API_HEADER
+    delete_response = await client.delete(
+        url=f"{k8s.API_URL_CORE}/namespaces/{namespace}/secrets/{cert_name}",
+        headers=k8s.API_HEADER
+    )
+    
+    if delete_response.status_code != 200:
+        raise HTTPException(
+            status_code=delete_response.status_code,
+            detail=f"Error: {delete_response.text}"
         )
-        
-        if delete_response.status_code != 200:
-            raise HTTPException(
-                status_code=delete_response.status_code,
-                detail=f"Error: {delete_response.text}"
-            )
 
-        return JSONResponse(
-            status_code=delete_response.status_code,
-            content={
-                "message": f"{namespace} 네임스페이스의 {name} TLS-Secret이 성공적으로 삭제됨"
-            }
-        )
\ No newline at end of file
+    return JSONResponse(
+        status_code=delete_response.status_code,
+        content={
+            "message": f"{namespace} 네임스페이스의 {name} TLS-Secret이 성공적으로 삭제됨"
+        }
+    )
\ No newline at end of file
@@ -0,0 +1,34 @@
+from cache.kube_cache import get_informers
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+
+router = APIRouter()
+
+@router.get(
+    '/healthz',
+    tags=["Health"],
+    summary="Liveness 확인",
+    description="프로세스가 응답 가능한지 확인합니다.",
+)
+async def liveness():
+    return {"status": "ok"}
+
+@router.get(
+    '/readyz',
+    tags=["Health"],
+    summary="Readiness 확인",
+    description="모든 Informer 캐시의 초기 동기화가 완료되었는지 확인합니다.",
+    responses={
+        200: {"description": "초기 동기화 완료"},
+        503: {"description": "초기 동기화 진행 중"}
+    }
+)
+async def readiness(request: Request):
+    caches = {name: informer.ready for name, informer in get_informers(request).items()}
+    ready = all(caches.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "caches": caches}
+    )
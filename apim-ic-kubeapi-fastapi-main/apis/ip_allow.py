@@ -1,19 +1,22 @@
-import json
 import setting.k8s as k8s
+from clients.kube import get_kube_client
+from clients.policy_db import PolicyDBClient, get_policy_db
 from schema.ip import Allow
 from temp import ip_ac_tmp 
+from utils import cidr
+from monitoring.timing import TimedRoute, decode
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
 from fastapi.responses import JSONResponse
 
 import re
 import httpx
 import orjson
-import requests
 
 
 router = APIRouter(
-    prefix="/kubeapi/ipallow"
+    prefix="/kubeapi/ipallow",
+    route_class=TimedRoute
 )
 
 @router.get(
@@ -26,12 +29,12 @@ router = APIRouter(
         400: {"description": "잘못된 요청"}
     }
 )
-async def read_ip_allow():
-    a = requests.get(k8s.DB_URL_Policy)
+async def read_ip_allow(db: PolicyDBClient = Depends(get_policy_db)):
+    a = await db.list()
     return JSONResponse(
         status_code = a.status_code,
         content={
-                 "data" : json.loads(a.text)
+                 "data" : decode(a)
             }
     )
 
@@ -45,12 +48,12 @@ async def read_ip_allow():
         400: {"description": "잘못된 요청"}
     }
 )
-async def read_ip_allow(policy_id : str):
-    a = requests.get(k8s.DB_URL_Policy+policy_id)
+async def read_ip_allow(policy_id : str, db: PolicyDBClient = Depends(get_policy_db)):
+    a = await db.get(policy_id)
     return JSONResponse(
         status_code = a.status_code,
         content={
-                 "data" : json.loads(a.text)
+                 "data" : decode(a)
             }
     )
 
@@ -93,7 +96,11 @@ async def read_ip_allow(policy_id : str):
     },
     status_code=201
 )
-async def create_ip_allow(body_data : Allow):
+async def create_ip_allow(
+    body_data : Allow,
+    client: httpx.AsyncClient = Depends(get_kube_client),
+    db: PolicyDBClient = Depends(get_policy_db)
+):
     # if(body_data.ApplyRange == "http"):
     #     AppendData = ""
         
@@ -134,35 +141,44 @@ async def create_ip_allow(body_data : Allow):
                     
     # elif(body_data.ApplyRange == "server" or body_data.ApplyRange == "location"): 
         
+    # IP 목록 검증 후 중복/겹침/인접 대역을 최소 CIDR 집합으로 정규화
+    try:
+        normalized = cidr.aggregate(body_data.AllowIP)
+    except cidr.InvalidAddressError as e:
+        return JSONResponse(
+            status_code=422,
+            content={"message": str(e), "invalid": e.invalid}
+        )
+    body_data.AllowIP = normalized.addresses
+
     k8s_body_data = ip_ac_tmp.ip_allow_json(body_data.PolicyName, body_data.AllowIP)
     
-    async with httpx.AsyncClient(verify=False) as client:
-        response = await client.post(
-                    url = k8s.API_URL_POLICY,
-                    headers = k8s.API_HEADER, 
-                    json = k8s_body_data
-                )
-        if(response.status_code > 299):
-            return JSONResponse(
-                status_code=response.status_code,
-                content={"message": response.status_code}
-            )
-        data = response.json()
-        uid = data.get('metadata', {}).get('uid', None)
-        print(uid)
-        
-        database = requests.post(k8s.DB_URL_Policy,json=ip_ac_tmp.ip_al_db_cu(body_data,uid))
-        if(database.status_code > 299):
-            return JSONResponse(
-                status_code=database.status_code,
-                content={"message": database.status_code}
+    response = await client.post(
+                url = k8s.API_URL_POLICY,
+                headers = k8s.API_HEADER, 
+                json = k8s_body_data
             )
+    if(response.status_code > 299):
+        return JSONResponse(
+            status_code=response.status_code,
+            content={"message": response.status_code}
+        )
+    data = decode(response)
+    uid = data.get('metadata', {}).get('uid', None)
+    print(uid)
+    
+    database = await db.create(ip_ac_tmp.ip_al_db_cu(body_data,uid))
+    if(database.status_code > 299):
         return JSONResponse(
             status_code=database.status_code,
             content={"message": database.status_code}
         )
+    return JSONResponse(
+        status_code=database.status_code,
+        content={"message": database.status_code, "normalized": normalized.summary()}
+    )
     
-            
+        
 
 @router.put(
     "/{policy_name}",
@@ -174,7 +190,12 @@ async def create_ip_allow(body_data : Allow):
         400: {"description": "잘못된 요청"},
     }
 )
-async def update_ip_allow(policy_name : str ,body_data: dict):
+async def update_ip_allow(
+    policy_name : str,
+    body_data: dict,
+    client: httpx.AsyncClient = Depends(get_kube_client),
+    db: PolicyDBClient = Depends(get_policy_db)
+):
     body_data = Allow(PolicyName=policy_name, **body_data)
     # if(body_data.ApplyRange == "http"): 
     #     async with httpx.AsyncClient(verify=False) as client:
@@ -207,25 +228,34 @@ async def update_ip_allow(policy_name : str ,body_data: dict):
 
         
     # elif(body_data.ApplyRange == "server" or body_data.ApplyRange == "location"):
+    # IP 목록 검증 후 중복/겹침/인접 대역을 최소 CIDR 집합으로 정규화
+    try:
+        normalized = cidr.aggregate(body_data.AllowIP)
+    except cidr.InvalidAddressError as e:
+        return JSONResponse(
+            status_code=422,
+            content={"message": str(e), "invalid": e.invalid}
+        )
+    body_data.AllowIP = normalized.addresses
+
     k8s_body_data = ip_ac_tmp.ip_allow_json(policy_name, body_data.AllowIP)
-    async with httpx.AsyncClient(verify=False) as client:
-        response = await client.patch(
-            url = k8s.API_URL_POLICY + policy_name +"-ip-allow",
-            headers = k8s.API_HEADER_UPDATE, 
-            json=k8s_body_data
+    response = await client.patch(
+        url = k8s.API_URL_POLICY + policy_name +"-ip-allow",
+        headers = k8s.API_HEADER_UPDATE, 
+        json=k8s_body_data
+    )
+    print(response.text)
+    if (response.status_code > 299):
+        return JSONResponse(
+            status_code=response.status_code,
+            content={"message": response.status_code}
         )
-        print(response.text)
-        if (response.status_code > 299):
-            return JSONResponse(
-                status_code=response.status_code,
-                content={"message": response.status_code}
-            )
-        data = response.json()
-        uid = data.get('metadata', {}).get('uid', None)
-    database = requests.put(k8s.DB_URL_Policy+uid,json=ip_ac_tmp.ip_al_db_cu(body_data,uid))
+    data = decode(response)
+    uid = data.get('metadata', {}).get('uid', None)
+    database = await db.update(uid, ip_ac_tmp.ip_al_db_cu(body_data,uid))
     return JSONResponse(
         status_code=database.status_code,
-        content={"message": database.status_code}
+        content={"message": database.status_code, "normalized": normalized.summary()}
     )
     # return JSONResponse(
     #         status_code=response.status_code,
@@ -243,22 +273,25 @@ async def update_ip_allow(policy_name : str ,body_data: dict):
         400: {"description": "잘못된 요청"}
     }
 )
-async def delete_ip_allow(policy_name : str):
-    async with httpx.AsyncClient(verify=False) as client:
-        response = await client.delete(
-            url = k8s.API_URL_POLICY + policy_name + "-ip-allow",
-            headers = k8s.API_HEADER
+async def delete_ip_allow(
+    policy_name : str,
+    client: httpx.AsyncClient = Depends(get_kube_client),
+    db: PolicyDBClient = Depends(get_policy_db)
+):
+    response = await client.delete(
+        url = k8s.API_URL_POLICY + policy_name + "-ip-allow",
+        headers = k8s.API_HEADER
+    )
+    if (response.status_code > 299):
+        return JSONResponse(
+            status_code=response.status_code,
+            content={"message": response.status_code}
         )
-        if (response.status_code > 299):
-            return JSONResponse(
-                status_code=response.status_code,
-                content={"message": response.status_code}
-            )
-    data = response.json()
+    data = decode(response)
     uid = data.get('details', {}).get('uid', None)
     # print(data)
     # print(uid)
-    database = requests.delete(k8s.DB_URL_Policy+uid)
+    database = await db.delete(uid)
     return JSONResponse(
             status_code=database.status_code,
             content={"message": database.status_code}
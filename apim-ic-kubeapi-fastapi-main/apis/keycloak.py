@@ -1,5 +1,6 @@
 import setting.k8s as k8s
 from schema.ip import Deny
+from monitoring.timing import TimedRoute
 
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
@@ -9,7 +10,8 @@ import httpx
 
 
 router = APIRouter(
-    prefix="/kubeapi/oidc"
+    prefix="/kubeapi/oidc",
+    route_class=TimedRoute
 )
 
 @router.get(
@@ -0,0 +1,18 @@
+from monitoring.metrics import render
+
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+
+
+router = APIRouter()
+
+@router.get(
+    '/metrics',
+    tags=["Monitoring"],
+    summary="Prometheus 메트릭",
+    description="요청 지연(라우터 태그별), KubeAPI / 정책 DB 호출 지연과 횟수, 커넥션 풀 사용량, 캐시 크기를 Prometheus 텍스트 형식으로 반환합니다.",
+    response_class=Response,
+)
+async def metrics(request: Request):
+    body, content_type = render(request.app.state)
+    return Response(content=body, media_type=content_type)
@@ -1,5 +1,6 @@
 import setting.k8s as k8s
 from schema.route import RouteItem, RouteResponse
+from monitoring.timing import TimedRoute
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse
@@ -8,7 +9,8 @@ import httpx
 import orjson
 
 router = APIRouter(
-    prefix="/kubeapi/routes"
+    prefix="/kubeapi/routes",
+    route_class=TimedRoute
 )
 
 @router.post(
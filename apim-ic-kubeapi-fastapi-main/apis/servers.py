@@ -1,16 +1,69 @@
 import setting.k8s as k8s
-from schema.server import VirtualServerSpec, VirtualServerMetadata, VirtualServerResponse, VirtualServerListResponse, Upstream, Policy, Route, CreateServerRequest
+from clients.kube import get_kube_client, list_items, patch_object
+from cache.informer import Informer
+from cache.kube_cache import get_virtualserver_informer, get_name_resolver
+from cache.resolver import NameResolver, NAMESPACE_QUERY_DESCRIPTION
+from utils.streaming import StreamFormat, STREAM_QUERY_DESCRIPTION, list_pages, cached_pages, list_response, stream_list_response
+from utils.etag import IF_NONE_MATCH_DESCRIPTION, etag_matches, not_modified, version_etag
+from schema.server import VirtualServerSpec, VirtualServerListResponse, Policy, TLSRedirect, CreateServerRequest
+from monitoring.timing import TimedRoute
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Header, Query
 from fastapi.responses import JSONResponse
 
+from typing import Optional
+
 import httpx
-import orjson
 
 router = APIRouter(
-    prefix="/kubeapi/servers"
+    prefix="/kubeapi/servers",
+    route_class=TimedRoute
 )
 
+# 목록 응답은 모델 생성/재검증 없이 원본 JSON을 VirtualServerResponse 스키마 그대로 dict로 투영
+_POLICY_NAMESPACE = Policy.model_fields["namespace"].default
+_REDIRECT_ENABLE = TLSRedirect.model_fields["enable"].default
+_REDIRECT_CODE = TLSRedirect.model_fields["code"].default
+
+def _policy_items(policies: Optional[list]) -> list:
+    return [{"name": p["name"], "namespace": p.get("namespace", _POLICY_NAMESPACE)} for p in policies or []]
+
+def _tls_item(tls: Optional[dict]) -> Optional[dict]:
+    if tls is None:
+        return None
+    redirect = tls.get("redirect")
+    return {
+        "secret": tls["secret"],
+        "redirect": None if redirect is None else {
+            "enable": redirect.get("enable", _REDIRECT_ENABLE),
+            "code": redirect.get("code", _REDIRECT_CODE)
+        }
+    }
+
+def _virtual_server_item(item: dict) -> dict:
+    metadata = item["metadata"]
+    spec = item["spec"]
+    return {
+        "metadata": {
+            "uid": metadata["uid"],
+            "name": metadata["name"],
+            "namespace": metadata["namespace"]
+        },
+        "spec": {
+            "host": spec["host"],
+            "tls": _tls_item(spec.get("tls")),
+            "policies": _policy_items(spec.get("policies")),
+            "upstreams": [
+                {"name": u["name"], "service": u["service"], "port": u["port"]}
+                for u in spec.get("upstreams", [])
+            ],
+            "routes": [
+                {"path": r["path"], "policies": _policy_items(r.get("policies")), "action": r.get("action")}
+                for r in spec.get("routes", [])
+            ]
+        }
+    }
+
 @router.get(
     '/',
     response_model=VirtualServerListResponse,
@@ -22,35 +75,27 @@ router = APIRouter(
         400: {"description": "잘못된 요청"}
     }
 )
-async def read_servers():
-    async with httpx.AsyncClient(verify=False) as client:
-        response = await client.get(
-            url=k8s.API_URL_VIRTUALSERVER,
-            headers=k8s.API_HEADER, 
-            )
-        response_json = response.json()
+async def read_servers(
+    stream: Optional[StreamFormat] = Query(None, description=STREAM_QUERY_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None, description=IF_NONE_MATCH_DESCRIPTION),
+    client: httpx.AsyncClient = Depends(get_kube_client),
+    informer: Optional[Informer] = Depends(get_virtualserver_informer)
+):
+    if stream:
+        pages = cached_pages(informer.list()) if informer is not None else list_pages(client, k8s.API_URL_VIRTUALSERVER, k8s.API_HEADER)
+        return await stream_list_response(pages, _virtual_server_item, stream)
 
-        servers = []
+    # 캐시 동기화가 끝났으면 KubeAPI 호출 없이 메모리에서 응답
+    etag = None
+    if informer is not None:
+        etag = version_etag(informer.version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        items = informer.list()
+    else:
+        items = await list_items(client, k8s.API_URL_VIRTUALSERVER, k8s.API_HEADER)
 
-        for item in response_json.get("items", []):
-            servers.append(
-                VirtualServerResponse(
-                    metadata=VirtualServerMetadata(
-                        uid=item["metadata"]["uid"],
-                        name=item["metadata"]["name"],
-                        namespace=item["metadata"]["namespace"]
-                    ),
-                    spec=VirtualServerSpec(
-                        host=item["spec"]["host"],
-                        tls=item["spec"].get("tls"),
-                        policies=[Policy(**p) for p in item["spec"].get("policies", [])],
-                        upstreams=[Upstream(**u) for u in item["spec"].get("upstreams", [])],
-                        routes=[Route(**r) for r in item["spec"].get("routes", [])]
-                    )
-                )
-            )
-
-    return VirtualServerListResponse(data=servers)
+    return list_response(items, _virtual_server_item, etag, if_none_match)
 
 @router.get(
     '/{namespace}',
@@ -63,35 +108,32 @@ async def read_servers():
         400: {"description": "잘못된 요청"}
     }
 )
-async def read_namespace_servers(namespace: str):
-    async with httpx.AsyncClient(verify=False) as client:
-        response = await client.get(
-            url=f"https://kubernetes.default.svc.cluster.local/apis/k8s.nginx.org/v1/namespaces/{namespace}/virtualservers",
-            headers=k8s.API_HEADER, 
-            )
-        response_json = response.json()
-
-        servers = []
+async def read_namespace_servers(
+    namespace: str,
+    stream: Optional[StreamFormat] = Query(None, description=STREAM_QUERY_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None, description=IF_NONE_MATCH_DESCRIPTION),
+    client: httpx.AsyncClient = Depends(get_kube_client),
+    informer: Optional[Informer] = Depends(get_virtualserver_informer)
+):
+    if stream:
+        pages = cached_pages(informer.list(namespace)) if informer is not None else list_pages(
+            client,
+            f"{k8s.API_URL_NGINX}/namespaces/{namespace}/virtualservers",
+            k8s.API_HEADER
+        )
+        return await stream_list_response(pages, _virtual_server_item, stream)
 
-        for item in response_json.get("items", []):
-            servers.append(
-                VirtualServerResponse(
-                    metadata=VirtualServerMetadata(
-                        uid=item["metadata"]["uid"],
-                        name=item["metadata"]["name"],
-                        namespace=item["metadata"]["namespace"]
-                    ),
-                    spec=VirtualServerSpec(
-                        host=item["spec"]["host"],
-                        tls=item["spec"].get("tls"),
-                        policies=[Policy(**p) for p in item["spec"].get("policies", [])],
-                        upstreams=[Upstream(**u) for u in item["spec"].get("upstreams", [])],
-                        routes=[Route(**r) for r in item["spec"].get("routes", [])]
-                    )
-                )
-            )
+    # namespace 인덱스로 해당 namespace의 VirtualServer만 조회
+    etag = None
+    if informer is not None:
+        etag = version_etag(informer.version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        items = informer.list(namespace)
+    else:
+        items = await list_items(client, f"{k8s.API_URL_NGINX}/namespaces/{namespace}/virtualservers", k8s.API_HEADER)
 
-    return VirtualServerListResponse(data=servers)
+    return list_response(items, _virtual_server_item, etag, if_none_match)
 
 @router.post(
     "/",
@@ -104,7 +146,7 @@ async def read_namespace_servers(namespace: str):
         409: {"description": "이름이 동일한 Server가 이미 존재함"}
         }
 )
-async def create_servers(request: CreateServerRequest):
+async def create_servers(request: CreateServerRequest, client: httpx.AsyncClient = Depends(get_kube_client)):
 
     name = request.name
     namespace = request.namespace
@@ -133,12 +175,11 @@ async def create_servers(request: CreateServerRequest):
         }
     }
 
-    async with httpx.AsyncClient(verify=False) as client:
-        response = await client.post(
-            url=f"https://kubernetes.default.svc.cluster.local/apis/k8s.nginx.org/v1/namespaces/{namespace}/virtualservers",
-            headers=k8s.API_HEADER,
-            json=virtual_server_data
-        )
+    response = await client.post(
+        url=f"{k8s.API_URL_NGINX}/namespaces/{namespace}/virtualservers",
+        headers=k8s.API_HEADER,
+        json=virtual_server_data
+    )
 
     if response.status_code != 201:
         raise HTTPException(
@@ -159,53 +200,48 @@ async def create_servers(request: CreateServerRequest):
     responses={
         200: {"description": "Server가 성공적으로 삭제됨"},
         404: {"description": "Server를 찾을 수 없음"},
+        409: {"description": "같은 이름의 Server가 여러 네임스페이스에 존재함"},
         400: {"description": "잘못된 요청"}
     }
 )
-async def delete_server(name: str):
-    # VirtualServer가 배포된 네임스페이스 탐색
-    async with httpx.AsyncClient(verify=False) as client:
-        response = await client.get(
-            url=k8s.API_URL_VIRTUALSERVER,
-            headers=k8s.API_HEADER
-        )
-        response_json = response.json()
-        
-        found_vs = next(
-            (item for item in response_json.get("items", []) 
-             if item["metadata"]["name"] == name),
-            None
-        )
-
-        # VirtualServer를 찾지 못한 경우 404 에러 발생
-        if not found_vs:
-            raise HTTPException(
-                status_code=404, 
-                detail=f"VirtualServer with name {name} not found"
-            )
+async def delete_server(
+    name: str,
+    namespace: Optional[str] = Query(None, description=NAMESPACE_QUERY_DESCRIPTION),
+    client: httpx.AsyncClient = Depends(get_kube_client),
+    resolver: NameResolver = Depends(get_name_resolver)
+):
+    # VirtualServer가 배포된 네임스페이스 탐색 (name 인덱스, 미스 시 이름으로만 조회)
+    found_vs = await resolver.resolve(client, "virtualservers", name, namespace)
 
-        # 찾은 VirtualServer의 namespace 추출
-        vs_name = found_vs["metadata"]["name"]
-        namespace = found_vs["metadata"]["namespace"]
-
-        # VirtualServer 삭제
-        delete_response = await client.delete(
-            url=f"https://kubernetes.default.svc.cluster.local/apis/k8s.nginx.org/v1/namespaces/{namespace}/virtualservers/{vs_name}",
-            headers=k8s.API_HEADER
+    # VirtualServer를 찾지 못한 경우 404 에러 발생
+    if not found_vs:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"VirtualServer with name {name} not found"
         )
-        
-        if delete_response.status_code != 200:
-            raise HTTPException(
-                status_code=delete_response.status_code,
-                detail=f"Error: {delete_response.text}"
-            )
 
-        return JSONResponse(
+    # 찾은 VirtualServer의 namespace 추출
+    vs_name = name
+    namespace = found_vs["metadata"]["namespace"]
+
+    # VirtualServer 삭제
+    delete_response = await client.delete(
+        url=f"{k8s.API_URL_NGINX}/namespaces/{namespace}/virtualservers/{vs_name}",
+        headers=k8s.API_HEADER
+    )
+    
+    if delete_response.status_code != 200:
+        raise HTTPException(
             status_code=delete_response.status_code,
-            content={
-                "message": f"{namespace} 네임스페이스의 {name} Server가 성공적으로 삭제됨"
-            }
+            detail=f"Error: {delete_response.text}"
         )
+
+    return JSONResponse(
+        status_code=delete_response.status_code,
+        content={
+            "message": f"{namespace} 네임스페이스의 {name} Server가 성공적으로 삭제됨"
+        }
+    )
     
 @router.put(
     "/{name}",
@@ -215,78 +251,72 @@ async def delete_server(name: str):
     responses={
         200: {"description": "Server가 성공적으로 업데이트됨"},
         404: {"description": "Server를 찾을 수 없음"},
+        409: {"description": "같은 이름의 Server가 여러 네임스페이스에 존재함 또는 다른 요청이 같은 필드를 먼저 변경함"},
         400: {"description": "잘못된 요청"}
     }
 )
-async def update_server(name: str, data: VirtualServerSpec):
-    # VirtualServer 탐색
-    async with httpx.AsyncClient(verify=False) as client:
-        # 전체 VirtualServer 목록에서 해당 이름의 서버 찾기
-        response = await client.get(
-            url=k8s.API_URL_VIRTUALSERVER,
-            headers=k8s.API_HEADER
-        )
-        response_json = response.json()
-        
-        # 원본 서버 찾기
-        found_vs = next(
-            (item for item in response_json.get("items", []) 
-             if item["metadata"]["name"] == name),
-            None
-        )
+async def update_server(
+    name: str,
+    data: VirtualServerSpec,
+    namespace: Optional[str] = Query(None, description=NAMESPACE_QUERY_DESCRIPTION),
+    client: httpx.AsyncClient = Depends(get_kube_client),
+    resolver: NameResolver = Depends(get_name_resolver)
+):
+    # VirtualServer 탐색 (name 인덱스, 미스 시 이름으로만 조회)
+    found_vs = await resolver.resolve(client, "virtualservers", name, namespace)
 
-        # VirtualServer를 찾지 못한 경우 404 에러 발생
-        if not found_vs:
-            raise HTTPException(
-                status_code=404, 
-                detail=f"VirtualServer with name {name} not found"
-            )
-
-        # 원본 서버의 실제 이름과 네임스페이스 추출
-        vs_name = found_vs["metadata"]["name"]
-        namespace = found_vs["metadata"]["namespace"]
+    # VirtualServer를 찾지 못한 경우 404 에러 발생
+    if not found_vs:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"VirtualServer with name {name} not found"
+        )
 
-        resource_version = found_vs['metadata']['resourceVersion']
+    # 원본 서버의 실제 이름과 네임스페이스 추출
+    # 캐시된 객체의 resourceVersion으로 낙관적 동시성 제어
+    # (409 시 patch_object가 최신 객체를 확인하여, 같은 필드를 다른 쓰기가 바꿨으면 409 반환)
+    vs_name = name
+    namespace = found_vs["metadata"]["namespace"]
 
-        # 업데이트할 VirtualServer 데이터 준비
-        virtual_server_data = {
-            "apiVersion": "k8s.nginx.org/v1",
-            "kind": "VirtualServer",
-            "metadata": {
-                "name": vs_name,
-                "namespace": namespace,
-                "resourceVersion": resource_version
-            },
-            "spec": {
-                "host": data.host,
-                "tls": data.tls.model_dump() if data.tls else None,
-                "policies": [policy.model_dump() for policy in data.policies] if data.policies else [],
-                "upstreams": [upstream.model_dump() for upstream in data.upstreams],
-                "routes": [
-                    {
-                        "path": route.path,
-                        "policies": [policy.model_dump() for policy in route.policies] if route.policies else [],
-                        "action": route.action #.model_dump(by_alias=True) // Action 모델 변경 시 수정
-                    }
-                    for route in data.routes
-                ]
-            }
+    # 업데이트할 VirtualServer 데이터 준비
+    virtual_server_data = {
+        "apiVersion": "k8s.nginx.org/v1",
+        "kind": "VirtualServer",
+        "metadata": {
+            "name": vs_name,
+            "namespace": namespace
+        },
+        "spec": {
+            "host": data.host,
+            "tls": data.tls.model_dump() if data.tls else None,
+            "policies": [policy.model_dump() for policy in data.policies] if data.policies else [],
+            "upstreams": [upstream.model_dump() for upstream in data.upstreams],
+            "routes": [
+                {
+                    "path": route.path,
+                    "policies": [policy.model_dump() for policy in route.policies] if route.policies else [],
+                    "action": route.action #.model_dump(by_alias=True) // Action 모델 변경 시 수정
+                }
+                for route in data.routes
+            ]
         }
+    }
 
-        # VirtualServer 업데이트 요청
-        update_response = await client.put(
-            url=f"https://kubernetes.default.svc.cluster.local/apis/k8s.nginx.org/v1/namespaces/{namespace}/virtualservers/{vs_name}",
-            headers=k8s.API_HEADER,
-            json=virtual_server_data
-        )
-
-        if update_response.status_code not in [200, 201]:
-            raise HTTPException(
-                status_code=update_response.status_code,
-                detail=f"Kubernetes API error: {update_response.text}"
-            )
+    # VirtualServer 업데이트 요청 (객체당 쓰기 1회)
+    update_response = await patch_object(
+        client,
+        f"{k8s.API_URL_NGINX}/namespaces/{namespace}/virtualservers/{vs_name}",
+        virtual_server_data,
+        base=found_vs
+    )
 
-        return JSONResponse(
-            status_code=200,
-            content={"message": f"{vs_name} Server가 {namespace} 네임스페이스에서 성공적으로 업데이트됨"}
+    if update_response.status_code not in [200, 201]:
+        raise HTTPException(
+            status_code=update_response.status_code,
+            detail=f"Kubernetes API error: {update_response.text}"
         )
+
+    return JSONResponse(
+        status_code=200,
+        content={"message": f"{vs_name} Server가 {namespace} 네임스페이스에서 성공적으로 업데이트됨"}
+    )
@@ -1,16 +1,41 @@
 import setting.k8s as k8s
-from schema.upstream import UpstreamItem, UpstreamResponse, UpstreamCreateRequest, UpstreamUpdateRequest
+from clients.kube import get_kube_client, list_items, patch_object, revert_manifest
+from clients.resilience import error_status
+from cache.informer import Informer
+from cache.kube_cache import get_service_informer, get_name_resolver
+from cache.resolver import AmbiguousNameError, NameResolver, NAMESPACE_QUERY_DESCRIPTION
+from utils.streaming import StreamFormat, STREAM_QUERY_DESCRIPTION, list_pages, cached_pages, list_response, stream_list_response
+from utils.etag import IF_NONE_MATCH_DESCRIPTION, etag_matches, not_modified, version_etag
+from schema.upstream import UpstreamResponse, UpstreamCreateRequest, UpstreamUpdateRequest, UpstreamBatchRequest, UpstreamBatchResult, UpstreamBatchResponse
+from monitoring.timing import TimedRoute, decode
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Header, Query
 from fastapi.responses import JSONResponse
 
+from typing import Dict, List, Optional, Tuple
+
+import asyncio
+import logging
 import httpx
 import orjson
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
-    prefix="/kubeapi/upstreams"
+    prefix="/kubeapi/upstreams",
+    route_class=TimedRoute
 )
 
+def _upstream_item(item: dict) -> dict:
+    # UpstreamItem 스키마 그대로 투영 (목록 응답은 모델 생성/재검증 없이 orjson 직렬화)
+    metadata = item.get("metadata", {})
+    return {
+        "uid": metadata.get("uid", ""),
+        "name": metadata.get("name", ""),
+        "namespace": metadata.get("namespace", ""),
+        "ports": [port.get("port", 0) for port in item.get("spec", {}).get("ports", [])]
+    }
+
 @router.get(
     '/',
     response_model=UpstreamResponse,
@@ -22,26 +47,27 @@ router = APIRouter(
         400: {"description": "잘못된 요청"}
     }
 )
-async def read_upstreams():
-    async with httpx.AsyncClient(verify=False) as client:
-        response = await client.get(
-            url=k8s.API_URL_SERVICE,
-            headers=k8s.API_HEADER, 
-        )
-        response_json = orjson.loads(response.text)
-        
-        items_data = [
-            UpstreamItem(
-                uid=item.get("metadata", {}).get("uid", ""),
-                name=item.get("metadata", {}).get("name", ""),
-                namespace=item.get("metadata", {}).get("namespace", ""),
-                ports=[port.get("port", 0) for port in item.get("spec", {}).get("ports", [])]
-            )
-            for item in response_json.get("items", [])
-        ]
-          
-            
-    return UpstreamResponse(data=items_data)
+async def read_upstreams(
+    stream: Optional[StreamFormat] = Query(None, description=STREAM_QUERY_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None, description=IF_NONE_MATCH_DESCRIPTION),
+    client: httpx.AsyncClient = Depends(get_kube_client),
+    informer: Optional[Informer] = Depends(get_service_informer)
+):
+    if stream:
+        pages = cached_pages(informer.list()) if informer is not None else list_pages(client, k8s.API_URL_SERVICE, k8s.API_HEADER)
+        return await stream_list_response(pages, _upstream_item, stream)
+
+    # 캐시 동기화가 끝났으면 KubeAPI 호출 없이 메모리에서 응답
+    etag = None
+    if informer is not None:
+        etag = version_etag(informer.version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        items = informer.list()
+    else:
+        items = await list_items(client, k8s.API_URL_SERVICE, k8s.API_HEADER)
+    
+    return list_response(items, _upstream_item, etag, if_none_match)
 
 @router.get(
     '/{namespace}',
@@ -54,92 +80,267 @@ async def read_upstreams():
         400: {"description": "잘못된 요청"}
     }
 )
-async def read_namespace_upstreams(namespace: str):
-    async with httpx.AsyncClient(verify=False) as client:
-        response = await client.get(
-            url=f"https://kubernetes.default.svc.cluster.local/api/v1/namespaces/{namespace}/services",
-            headers=k8s.API_HEADER, 
-            )
-        response_json = orjson.loads(response.text)
+async def read_namespace_upstreams(
+    namespace: str,
+    stream: Optional[StreamFormat] = Query(None, description=STREAM_QUERY_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None, description=IF_NONE_MATCH_DESCRIPTION),
+    client: httpx.AsyncClient = Depends(get_kube_client),
+    informer: Optional[Informer] = Depends(get_service_informer)
+):
+    if stream:
+        pages = cached_pages(informer.list(namespace)) if informer is not None else list_pages(
+            client,
+            f"{k8s.API_URL_CORE}/namespaces/{namespace}/services",
+            k8s.API_HEADER
+        )
+        return await stream_list_response(pages, _upstream_item, stream)
+
+    # namespace 인덱스로 해당 namespace의 Service만 조회
+    etag = None
+    if informer is not None:
+        etag = version_etag(informer.version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        items = informer.list(namespace)
+    else:
+        items = await list_items(client, f"{k8s.API_URL_CORE}/namespaces/{namespace}/services", k8s.API_HEADER)
         
-        items_data = [
-            UpstreamItem(
-                uid=item.get("metadata", {}).get("uid", ""),
-                name=item.get("metadata", {}).get("name", ""),
-                namespace=item.get("metadata", {}).get("namespace", ""),
-                ports=[port.get("port", 0) for port in item.get("spec", {}).get("ports", [])]
-            )
-            for item in response_json.get("items", [])
-        ]
-            
-    return UpstreamResponse(data=items_data)
+    return list_response(items, _upstream_item, etag, if_none_match)
 
-@router.post(
-    '/',
-    tags=["Upstreams"],
-    summary="클러스터 외부 연결 Upstream 생성",
-    description="외부 연결 Service를 생성합니다.",
-    responses={
-        200: {"description": "Upstreams가 성공적으로 생성됨"},
-        400: {"description": "잘못된 요청"}
-    }
-)
-async def create_upstreams(request: UpstreamCreateRequest):
-    service_manifest = {
+# ---- Service / Endpoints 쓰기 헬퍼 ----
+
+# 재생성/원복 시 서버가 채우는 필드는 제외
+_SERVER_METADATA_FIELDS = ("uid", "resourceVersion", "creationTimestamp", "deletionTimestamp",
+                           "deletionGracePeriodSeconds", "generation", "managedFields", "selfLink")
+
+def _collection_url(namespace: str, resource: str) -> str:
+    return f"{k8s.API_URL_CORE}/namespaces/{namespace}/{resource}"
+
+def _object_url(namespace: str, resource: str, name: str) -> str:
+    return f"{_collection_url(namespace, resource)}/{name}"
+
+def _service_manifest(name: str, namespace: str, service_port: int, target_port: int) -> dict:
+    return {
         "apiVersion": "v1",
         "kind": "Service",
         "metadata": {
-            "name": request.name,
-            "namespace": request.namespace,
+            "name": name,
+            "namespace": namespace,
             "labels" : {
                 "upstream": "external"
             }
         },
         "spec": {
-            "ports": [{"port": request.service_port, "targetPort": request.target_port}]
+            "ports": [{"port": service_port, "targetPort": target_port}]
         }
     }
 
-    endpoints_manifest = {
+def _endpoints_manifest(name: str, namespace: str, external_ips: List[str], target_port: int) -> dict:
+    return {
         "apiVersion": "v1",
         "kind": "Endpoints",
         "metadata": {
-            "name": request.name,
-            "namespace": request.namespace
+            "name": name,
+            "namespace": namespace
         },
         "subsets": [{
-            "addresses": [{"ip": ip} for ip in request.external_ips],
-            "ports": [{"port": request.target_port}]
+            "addresses": [{"ip": ip} for ip in external_ips],
+            "ports": [{"port": target_port}]
         }]
     }
 
-    async with httpx.AsyncClient(verify=False) as client:
-        svc_response = await client.post(
-            url=f"https://kubernetes.default.svc.cluster.local/api/v1/namespaces/{request.namespace}/services",
+async def _list_services(client: httpx.AsyncClient) -> List[dict]:
+    # 클러스터 내 모든 Service 조회
+    return await list_items(client, k8s.API_URL_SERVICE, k8s.API_HEADER)
+
+def _is_external(item: dict) -> bool:
+    return item.get("metadata", {}).get("labels", {}).get("upstream") == "external"
+
+async def _delete_object(client: httpx.AsyncClient, namespace: str, resource: str, name: str) -> httpx.Response:
+    return await client.delete(url=_object_url(namespace, resource, name), headers=k8s.API_HEADER)
+
+def _deleted_object(response: httpx.Response) -> Optional[dict]:
+    # DELETE 응답 본문은 삭제된 객체 (Status가 오면 복원 불가)
+    try:
+        obj = decode(response)
+    except orjson.JSONDecodeError:
+        return None
+    return None if obj.get("kind") == "Status" else obj
+
+def _clean_for_create(obj: dict) -> dict:
+    obj = {key: value for key, value in obj.items() if key != "status"}
+    obj["metadata"] = {
+        key: value for key, value in obj.get("metadata", {}).items()
+        if key not in _SERVER_METADATA_FIELDS
+    }
+    if obj.get("kind") == "Service":
+        # clusterIP는 재할당 (외부 Upstream은 DNS 이름으로 참조)
+        obj["spec"] = {key: value for key, value in obj.get("spec", {}).items() if key not in ("clusterIP", "clusterIPs")}
+    return obj
+
+async def _restore_object(client: httpx.AsyncClient, namespace: str, resource: str, obj: Optional[dict]):
+    if obj is None:
+        logger.error("%s/%s 삭제 보상 실패: 복원할 객체 정보 없음", namespace, resource)
+        return
+    response = await client.post(
+        url=_collection_url(namespace, resource),
+        headers=k8s.API_HEADER,
+        json=_clean_for_create(obj)
+    )
+    if response.status_code != 201:
+        logger.error("%s/%s/%s 삭제 보상 실패: %s", namespace, resource, obj["metadata"].get("name"), response.text)
+
+async def _revert_object(client: httpx.AsyncClient, namespace: str, resource: str, manifest: dict, previous: dict, current: dict):
+    # 이 요청이 쓴 필드(manifest)만 업데이트 이전 값(previous)으로 되돌림
+    # base=current(이 요청의 patch 결과)로 보내므로, 그 뒤 다른 쓰기가 같은 필드를 바꿨으면 덮어쓰지 않고 409
+    # (server-side apply는 apiVersion/kind가 필요하므로 K8S_UPDATE_STRATEGY와 관계없이 merge patch 사용)
+    url = _object_url(namespace, resource, previous["metadata"]["name"])
+    response = await patch_object(client, url, revert_manifest(manifest, previous), base=current, strategy="merge")
+    if response.status_code == 409:
+        logger.warning("%s/%s/%s 업데이트 보상 생략: 다른 쓰기가 같은 필드를 먼저 변경함", namespace, resource, previous["metadata"]["name"])
+    elif response.status_code not in [200, 201]:
+        logger.error("%s/%s/%s 업데이트 보상 실패: %s", namespace, resource, previous["metadata"]["name"], response.text)
+
+def _succeeded(result, statuses) -> bool:
+    # gather(return_exceptions=True) 결과: 예외는 실패한 응답과 같이 처리
+    return isinstance(result, httpx.Response) and result.status_code in statuses
+
+def _raise_first_error(*results):
+    # 보상 후 원래 예외를 다시 발생 (main.py 예외 처리기가 502 / 503 / 504로 응답)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+async def _compensate(description: str, *calls):
+    # 보상 작업의 실패는 원래 오류를 가리지 않도록 로그만 남김
+    for result in await asyncio.gather(*calls, return_exceptions=True):
+        if isinstance(result, BaseException):
+            logger.error("%s 보상 실패: %r", description, result)
+        elif isinstance(result, httpx.Response) and result.status_code >= 400 and result.status_code != 404:
+            logger.error("%s 보상 실패: %s", description, result.text)
+
+async def _create_upstream(client: httpx.AsyncClient, request: UpstreamCreateRequest) -> Tuple[int, dict]:
+    service_manifest = _service_manifest(request.name, request.namespace, request.service_port, request.target_port)
+    endpoints_manifest = _endpoints_manifest(request.name, request.namespace, request.external_ips, request.target_port)
+
+    # Service와 Endpoints는 독립 객체이므로 동시에 생성 (한쪽이 예외로 끝나도 다른 쪽 결과를 받아 보상)
+    svc_response, ep_response = await asyncio.gather(
+        client.post(
+            url=_collection_url(request.namespace, "services"),
             headers=k8s.API_HEADER,
             json=service_manifest
-            )
-        
-        ep_response = await client.post(
-            url=f"https://kubernetes.default.svc.cluster.local/api/v1/namespaces/{request.namespace}/endpoints",
+        ),
+        client.post(
+            url=_collection_url(request.namespace, "endpoints"),
             headers=k8s.API_HEADER,
             json=endpoints_manifest
-        )
+        ),
+        return_exceptions=True
+    )
+    svc_ok = _succeeded(svc_response, (201,))
+    ep_ok = _succeeded(ep_response, (201,))
 
-    if svc_response.status_code != 201 or ep_response.status_code != 201:
-        return JSONResponse(
-            status_code=400,
-            content={"message": "Upstream 생성 실패", "details": {
-                "service": svc_response.text,
-                "endpoints": ep_response.text
-            }}
+    if not (svc_ok and ep_ok):
+        # 보상: 한쪽만 생성된 경우 생성된 객체를 삭제하여 고아 리소스 방지
+        await _compensate(
+            f"{request.namespace}/{request.name} 생성",
+            *([_delete_object(client, request.namespace, "services", request.name)] if svc_ok else []),
+            *([_delete_object(client, request.namespace, "endpoints", request.name)] if ep_ok else [])
         )
+        _raise_first_error(svc_response, ep_response)
+        return 400, {"message": "Upstream 생성 실패", "details": {
+            "service": svc_response.text,
+            "endpoints": ep_response.text
+        }}
+
+    return 201, {"message": f"{request.namespace} 네임스페이스에 {request.name} Upstream이 성공적으로 생성되었습니다."}
 
-    return JSONResponse(
-        status_code=201,
-        content={"message": f"{request.namespace} 네임스페이스에 {request.name} Upstream이 성공적으로 생성되었습니다."}
+async def _delete_upstream(client: httpx.AsyncClient, found_svc: dict) -> Tuple[int, dict]:
+    name = found_svc["metadata"]["name"]
+    namespace = found_svc["metadata"]["namespace"]
+
+    # Endpoints와 Service 동시 삭제
+    ep_response, svc_response = await asyncio.gather(
+        _delete_object(client, namespace, "endpoints", name),
+        _delete_object(client, namespace, "services", name),
+        return_exceptions=True
     )
 
+    # Endpoints와 Service 삭제 결과 확인 (예외면 상태 코드 없음)
+    ep_status = ep_response.status_code if isinstance(ep_response, httpx.Response) else None
+    svc_status = svc_response.status_code if isinstance(svc_response, httpx.Response) else None
+
+    if ep_status == 404 and svc_status == 404:
+        return 404, {"message": f"Upstream '{name}'를 찾을 수 없습니다."}
+
+    ep_ok = _succeeded(ep_response, (200, 202, 204))
+    svc_ok = _succeeded(svc_response, (200, 202, 204))
+
+    if not (ep_ok and svc_ok):
+        # 보상: 다른 쪽 삭제가 실패(404 제외)하면 삭제된 객체를 삭제 직전 상태로 재생성
+        if ep_ok and svc_status != 404:
+            await _compensate(f"{namespace}/{name} 삭제", _restore_object(client, namespace, "endpoints", _deleted_object(ep_response)))
+        if svc_ok and ep_status != 404:
+            await _compensate(f"{namespace}/{name} 삭제", _restore_object(client, namespace, "services", _deleted_object(svc_response) or found_svc))
+        _raise_first_error(ep_response, svc_response)
+        return 400, {"message": "Upstream 삭제 실패", "details": {
+            "endpoints": ep_response.text,
+            "service": svc_response.text
+        }}
+
+    return 200, {"message": f"Upstream '{name}'가 성공적으로 삭제되었습니다."}
+
+async def _update_upstream(client: httpx.AsyncClient, found_svc: dict, request: UpstreamUpdateRequest) -> Tuple[int, dict]:
+    # 원본 서비스의 실제 이름과 네임스페이스 추출
+    vs_name = found_svc["metadata"]["name"]
+    namespace = found_svc["metadata"]["namespace"]
+
+    # 업데이트할 Service / Endpoints 매니페스트 준비
+    service_manifest = _service_manifest(vs_name, namespace, request.service_port, request.target_port)
+    endpoints_manifest = _endpoints_manifest(vs_name, namespace, request.external_ips, request.target_port)
+
+    # 객체당 쓰기 1회: Service를 먼저 patch하고 성공한 경우에만 Endpoints를 patch
+    # (생성 / 삭제와 달리 순차 실행: 동시에 쓰면 Service 실패 시 Endpoints 원복을 위해 사전 조회가 필요함)
+    svc_response = await patch_object(
+        client,
+        _object_url(namespace, "services", vs_name),
+        service_manifest,
+        base=found_svc
+    )
+    if svc_response.status_code == 409:
+        return 409, {"detail": f"Upstream 업데이트 충돌: 다른 요청이 Service를 변경했습니다. 다시 조회 후 시도하세요. - {svc_response.text}"}
+    if svc_response.status_code not in [200, 201]:
+        return 400, {"detail": f"Upstream 업데이트 실패: Service - {svc_response.text}"}
+
+    try:
+        ep_response = await patch_object(client, _object_url(namespace, "endpoints", vs_name), endpoints_manifest)
+    except Exception as e:
+        ep_response = e
+    if not _succeeded(ep_response, (200, 201)):
+        # 보상: Service만 반영된 경우 이 요청이 쓴 Service 필드만 업데이트 이전 값으로 원복 (예외면 원복 후 다시 발생)
+        await _compensate(
+            f"{namespace}/{vs_name} 업데이트",
+            _revert_object(client, namespace, "services", service_manifest, found_svc, decode(svc_response))
+        )
+        _raise_first_error(ep_response)
+        return 400, {"detail": f"Upstream 업데이트 실패: Endpoints - {ep_response.text}"}
+
+    return 200, {"message": f"{namespace} 네임스페이스의 {vs_name} Upstream이 성공적으로 업데이트되었습니다."}
+
+@router.post(
+    '/',
+    tags=["Upstreams"],
+    summary="클러스터 외부 연결 Upstream 생성",
+    description="외부 연결 Service를 생성합니다.",
+    responses={
+        200: {"description": "Upstreams가 성공적으로 생성됨"},
+        400: {"description": "잘못된 요청"}
+    }
+)
+async def create_upstreams(request: UpstreamCreateRequest, client: httpx.AsyncClient = Depends(get_kube_client)):
+    status_code, content = await _create_upstream(client, request)
+    return JSONResponse(status_code=status_code, content=content)
+
     
 @router.delete(
     '/',
@@ -149,72 +350,27 @@ async def create_upstreams(request: UpstreamCreateRequest):
     responses={
         200: {"description": "Upstream이 성공적으로 삭제됨"},
         404: {"description": "Upstream을 찾을 수 없음"},
+        409: {"description": "같은 이름의 Upstream이 여러 네임스페이스에 존재함"},
         400: {"description": "잘못된 요청"}
     }
 )
-async def delete_upstreams(name: str):
-    async with httpx.AsyncClient(verify=False) as client:
-        # 클러스터 내 모든 Service 조회
-        response = await client.get(
-            url="https://kubernetes.default.svc.cluster.local/api/v1/services",
-            headers=k8s.API_HEADER
-        )
-        response_json = orjson.loads(response.text)
-
-        # 이름이 name과 일치하는 Service 찾기
-        found_svc = next(
-            (
-                item for item in response_json.get("items", [])
-                if item["metadata"]["name"] == name
-                and item.get("metadata", {}).get("labels", {}).get("upstream") == "external"
-            ),
-            None
-        )
-
-        # 해당하는 Service가 없으면 404 반환
-        if not found_svc:
-            return JSONResponse(
-                status_code=404,
-                content={"message": f"외부 Upstream '{name}'를 찾을 수 없습니다."}
-            )
-
-        namespace = found_svc["metadata"]["namespace"]
+async def delete_upstreams(
+    name: str,
+    namespace: Optional[str] = Query(None, description=NAMESPACE_QUERY_DESCRIPTION),
+    client: httpx.AsyncClient = Depends(get_kube_client),
+    resolver: NameResolver = Depends(get_name_resolver)
+):
+    found_svc = await resolver.resolve(client, "services", name, namespace, predicate=_is_external)
 
-        # Endpoints 삭제
-        ep_response = await client.delete(
-            url=f"https://kubernetes.default.svc.cluster.local/api/v1/namespaces/{namespace}/endpoints/{name}",
-            headers=k8s.API_HEADER
-        )
-
-        # Service 삭제
-        svc_response = await client.delete(
-            url=f"https://kubernetes.default.svc.cluster.local/api/v1/namespaces/{namespace}/services/{name}",
-            headers=k8s.API_HEADER
-        )
-
-    # Endpoints와 Service 삭제 결과 확인
-    ep_status = ep_response.status_code
-    svc_status = svc_response.status_code
-
-    if ep_status == 404 and svc_status == 404:
+    # 해당하는 Service가 없으면 404 반환
+    if not found_svc:
         return JSONResponse(
             status_code=404,
-            content={"message": f"Upstream '{name}'를 찾을 수 없습니다."}
+            content={"message": f"외부 Upstream '{name}'를 찾을 수 없습니다."}
         )
 
-    if ep_status not in [200, 202, 204] or svc_status not in [200, 202, 204]:
-        return JSONResponse(
-            status_code=400,
-            content={"message": "Upstream 삭제 실패", "details": {
-                "endpoints": ep_response.text,
-                "service": svc_response.text
-            }}
-        )
-
-    return JSONResponse(
-        status_code=200,
-        content={"message": f"Upstream '{name}'가 성공적으로 삭제되었습니다."}
-    )
+    status_code, content = await _delete_upstream(client, found_svc)
+    return JSONResponse(status_code=status_code, content=content)
 
 @router.put(
     "/{name}",
@@ -224,103 +380,100 @@ async def delete_upstreams(name: str):
     responses={
         200: {"description": "Upstream이 성공적으로 업데이트됨"},
         404: {"description": "Upstream을 찾을 수 없음"},
+        409: {"description": "같은 이름의 Upstream이 여러 네임스페이스에 존재함 또는 다른 요청이 같은 필드를 먼저 변경함"},
         400: {"description": "잘못된 요청"}
     }
 )
-async def update_upstreams(name: str, request: UpstreamUpdateRequest):
-    async with httpx.AsyncClient(verify=False) as client:
-        # 클러스터 내 모든 Service 조회
-        response = await client.get(
-            url="https://kubernetes.default.svc.cluster.local/api/v1/services",
-            headers=k8s.API_HEADER
-        )
-        response_json = orjson.loads(response.text)
-
-        # 이름이 name과 일치하는 외부 Service 찾기
-        found_svc = next(
-            (
-                item for item in response_json.get("items", [])
-                if item["metadata"]["name"] == name
-                and item.get("metadata", {}).get("labels", {}).get("upstream") == "external"
-            ),
-            None
+async def update_upstreams(
+    name: str,
+    request: UpstreamUpdateRequest,
+    namespace: Optional[str] = Query(None, description=NAMESPACE_QUERY_DESCRIPTION),
+    client: httpx.AsyncClient = Depends(get_kube_client),
+    resolver: NameResolver = Depends(get_name_resolver)
+):
+    found_svc = await resolver.resolve(client, "services", name, namespace, predicate=_is_external)
+
+    # 해당하는 Service가 없으면 404 반환
+    if not found_svc:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"외부 Upstream '{name}'를 찾을 수 없습니다."
         )
 
-        # 해당하는 Service가 없으면 404 반환
-        if not found_svc:
-            raise HTTPException(
-                status_code=404, 
-                detail=f"외부 Upstream '{name}'를 찾을 수 없습니다."
-            )
+    status_code, content = await _update_upstream(client, found_svc, request)
+    if status_code >= 400:
+        raise HTTPException(status_code=status_code, detail=content["detail"])
 
-        # 원본 서비스의 실제 이름과 네임스페이스 추출
-        vs_name = found_svc["metadata"]["name"]
-        namespace = found_svc["metadata"]["namespace"]
+    return JSONResponse(status_code=status_code, content=content)
 
-        # Service와 Endpoints의 개별 리소스 버전 획득
-        service_resource_version = found_svc['metadata']['resourceVersion']
-        
-        # Endpoints 리소스 버전 조회
-        ep_response = await client.get(
-            url=f"https://kubernetes.default.svc.cluster.local/api/v1/namespaces/{namespace}/endpoints/{vs_name}",
-            headers=k8s.API_HEADER
-        )
-        endpoints_resource_version = orjson.loads(ep_response.text)['metadata']['resourceVersion']
-
-        # 업데이트할 Service 매니페스트 준비
-        service_manifest = {
-            "apiVersion": "v1",
-            "kind": "Service",
-            "metadata": {
-                "name": vs_name,
-                "namespace": namespace,
-                "resourceVersion": service_resource_version,
-                "labels": {
-                    "upstream": "external"
-                }
-            },
-            "spec": {
-                "ports": [{"port": request.service_port, "targetPort": request.target_port}]
-            }
-        }
+@router.post(
+    ":batch",
+    response_model=UpstreamBatchResponse,
+    tags=["Upstreams"],
+    summary="외부 Upstream 일괄 생성/수정/삭제",
+    description="여러 외부 Upstream 작업을 동시 실행 수를 제한하여 처리하고 항목별 결과를 반환합니다.",
+    responses={
+        200: {"description": "일괄 작업이 처리됨 (항목별 결과는 data 참조)"},
+        400: {"description": "잘못된 요청"}
+    }
+)
+async def batch_upstreams(
+    request: UpstreamBatchRequest,
+    client: httpx.AsyncClient = Depends(get_kube_client),
+    informer: Optional[Informer] = Depends(get_service_informer)
+):
+    # 수정/삭제 대상 Service는 항목마다 조회하지 않고 한 번에 조회 (캐시 동기화 시 KubeAPI 호출 없음)
+    # 이름 -> 네임스페이스별 Service 목록 (같은 이름이 여러 네임스페이스에 있으면 namespace로 지정해야 함)
+    services: Dict[str, List[dict]] = {}
+    if any(operation.op != "create" for operation in request.operations):
+        items = informer.list() if informer is not None else await _list_services(client)
+        for item in items:
+            if _is_external(item):
+                services.setdefault(item["metadata"]["name"], []).append(item)
 
-        # 업데이트할 Endpoints 매니페스트 준비
-        endpoints_manifest = {
-            "apiVersion": "v1",
-            "kind": "Endpoints",
-            "metadata": {
-                "name": vs_name,
-                "namespace": namespace,
-                "resourceVersion": endpoints_resource_version
-            },
-            "subsets": [{
-                "addresses": [{"ip": ip} for ip in request.external_ips],
-                "ports": [{"port": request.target_port}]
-            }]
-        }
+    def find(operation) -> Optional[dict]:
+        # 단건 API의 NameResolver.resolve와 같은 규칙: 없으면 None, 둘 이상이면 AmbiguousNameError(409)
+        matches = [
+            item for item in services.get(operation.name, [])
+            if operation.namespace is None or item["metadata"].get("namespace") == operation.namespace
+        ]
+        if len(matches) > 1:
+            raise AmbiguousNameError("services", operation.name, sorted(item["metadata"].get("namespace", "") for item in matches))
+        return matches[0] if matches else None
 
-        # Service 업데이트 요청
-        svc_response = await client.put(
-            url=f"https://kubernetes.default.svc.cluster.local/api/v1/namespaces/{namespace}/services/{vs_name}",
-            headers=k8s.API_HEADER,
-            json=service_manifest
-        )
+    semaphore = asyncio.Semaphore(request.concurrency or k8s.K8S_BATCH_CONCURRENCY)
 
-        # Endpoints 업데이트 요청
-        ep_response = await client.put(
-            url=f"https://kubernetes.default.svc.cluster.local/api/v1/namespaces/{namespace}/endpoints/{vs_name}",
-            headers=k8s.API_HEADER,
-            json=endpoints_manifest
-        )
+    async def run(index: int, operation) -> UpstreamBatchResult:
+        async with semaphore:
+            try:
+                if operation.op == "create":
+                    status_code, content = await _create_upstream(client, operation)
+                else:
+                    found_svc = find(operation)
+                    if found_svc is None:
+                        status_code, content = 404, {"message": f"외부 Upstream '{operation.name}'를 찾을 수 없습니다."}
+                    elif operation.op == "update":
+                        status_code, content = await _update_upstream(client, found_svc, operation)
+                    else:
+                        status_code, content = await _delete_upstream(client, found_svc)
+            except HTTPException as e:
+                # 항목 하나의 오류가 일괄 작업 전체 응답을 가리지 않도록 항목별 결과로 반환
+                detail = e.detail if isinstance(e.detail, dict) else {"message": str(e.detail)}
+                status_code, content = e.status_code, {"message": detail.get("message", ""), "details": detail}
+            except Exception as e:
+                status_code, message = error_status(e)
+                if status_code == 500:
+                    logger.exception("Upstream 일괄 작업 %d(%s %s) 실패", index, operation.op, operation.name)
+                content = {"message": message}
 
-        # 업데이트 결과 확인
-        if svc_response.status_code not in [200, 201] or ep_response.status_code not in [200, 201]:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Upstream 업데이트 실패: Service - {svc_response.text}, Endpoints - {ep_response.text}"
-            )
+        return UpstreamBatchResult(
+            index=index,
+            op=operation.op,
+            name=operation.name,
+            status_code=status_code,
+            message=content.get("message") or content.get("detail", ""),
+            details=content.get("details")
+        )
 
-        return JSONResponse(
-            status_code=200,
-            content={"message": f"{namespace} 네임스페이스의 {vs_name} Upstream이 성공적으로 업데이트되었습니다."}
-        )
\ No newline at end of file
+    results = await asyncio.gather(*(run(index, operation) for index, operation in enumerate(request.operations)))
+    return UpstreamBatchResponse(data=results)
\ No newline at end of file
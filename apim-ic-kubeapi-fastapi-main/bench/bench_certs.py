@@ -0,0 +1,154 @@
+"""TLS Secret 목록 조회 벤치마크
+
+기존 방식(전체 Secret LIST 후 Python에서 type 필터)과
+fieldSelector + PartialObjectMetadataList 방식의 전송 바이트와 지연을 비교합니다.
+
+    python -m bench.bench_certs --secrets 20000 --tls-ratio 0.1 --bandwidth-mbps 200
+"""
+from typing import List
+
+import argparse
+import asyncio
+import base64
+import os
+import statistics
+import time
+import httpx
+import orjson
+
+API_URL_TLS_SECRET = "https://kubernetes.default.svc.cluster.local/api/v1/secrets"
+METADATA_ACCEPT = "application/json;as=PartialObjectMetadataList;v=v1;g=meta.k8s.io,application/json"
+
+
+def build_secrets(count: int, tls_ratio: float, payload_bytes: int) -> List[dict]:
+    tls_every = max(1, round(1 / tls_ratio)) if tls_ratio > 0 else 0
+    payload = base64.b64encode(os.urandom(payload_bytes)).decode()
+    secrets = []
+    for i in range(count):
+        is_tls = tls_every and i % tls_every == 0
+        secrets.append({
+            "metadata": {
+                "name": f"secret-{i}",
+                "namespace": f"ns-{i % 50}",
+                "uid": f"00000000-0000-0000-0000-{i:012d}",
+                "resourceVersion": str(1000 + i),
+                "managedFields": [{"manager": "kubectl", "operation": "Update", "fieldsType": "FieldsV1"}],
+            },
+            "type": "kubernetes.io/tls" if is_tls else "kubernetes.io/service-account-token",
+            "data": (
+                {"tls.crt": payload, "tls.key": payload}
+                if is_tls else {"token": payload, "ca.crt": payload, "namespace": "ZGVmYXVsdA=="}
+            ),
+        })
+    return secrets
+
+
+class FakeSecretApi:
+    """fieldSelector와 PartialObjectMetadataList Accept를 해석하는 최소 KubeAPI"""
+
+    def __init__(self, secrets: List[dict], bandwidth_mbps: float):
+        self.secrets = secrets
+        self.bandwidth = bandwidth_mbps * 1_000_000 / 8 if bandwidth_mbps > 0 else 0
+        self.bytes_sent = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        items = self.secrets
+        selector = request.url.params.get("fieldSelector", "")
+        if selector.startswith("type="):
+            items = [item for item in items if item["type"] == selector[len("type="):]]
+
+        if "as=PartialObjectMetadataList" in request.headers.get("accept", ""):
+            body = {
+                "kind": "PartialObjectMetadataList",
+                "apiVersion": "meta.k8s.io/v1",
+                "metadata": {"resourceVersion": "1"},
+                "items": [
+                    {"kind": "PartialObjectMetadata", "apiVersion": "meta.k8s.io/v1", "metadata": item["metadata"]}
+                    for item in items
+                ],
+            }
+        else:
+            body = {"kind": "SecretList", "apiVersion": "v1", "metadata": {"resourceVersion": "1"}, "items": items}
+
+        content = orjson.dumps(body)
+        self.bytes_sent += len(content)
+        if self.bandwidth:
+            await asyncio.sleep(len(content) / self.bandwidth)
+        return httpx.Response(200, content=content, headers={"Content-Type": "application/json"})
+
+
+async def legacy_list(client: httpx.AsyncClient) -> list:
+    # 변경 전: 전체 Secret을 받아 Python에서 필터
+    response = await client.get(url=API_URL_TLS_SECRET)
+    return [
+        {
+            "name": item.get("metadata", {}).get("name", ""),
+            "namespace": item.get("metadata", {}).get("namespace", ""),
+            "uid": item.get("metadata", {}).get("uid", ""),
+            "type": item.get("type", ""),
+        }
+        for item in orjson.loads(response.text).get("items", [])
+        if item.get("type") == "kubernetes.io/tls"
+    ]
+
+
+async def metadata_list(client: httpx.AsyncClient) -> list:
+    # 변경 후: apis/certs.py의 _list_tls_secret_metadata와 동일한 요청
+    response = await client.get(
+        url=API_URL_TLS_SECRET,
+        params={"fieldSelector": "type=kubernetes.io/tls"},
+        headers={"Accept": METADATA_ACCEPT},
+    )
+    return [
+        {
+            "name": item["metadata"].get("name", ""),
+            "namespace": item["metadata"].get("namespace", ""),
+            "uid": item["metadata"].get("uid", ""),
+            "type": item.get("type", "kubernetes.io/tls"),
+        }
+        for item in orjson.loads(response.content).get("items", [])
+    ]
+
+
+async def measure(name: str, fn, api: FakeSecretApi, rounds: int) -> dict:
+    async with httpx.AsyncClient(transport=httpx.MockTransport(api.handler)) as client:
+        api.bytes_sent = 0
+        durations = []
+        result = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            result = await fn(client)
+            durations.append((time.perf_counter() - start) * 1000)
+    return {
+        "name": name,
+        "items": len(result),
+        "bytes_per_call": api.bytes_sent // rounds,
+        "p50_ms": statistics.median(durations),
+        "max_ms": max(durations),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--secrets", type=int, default=10000)
+    parser.add_argument("--tls-ratio", type=float, default=0.1)
+    parser.add_argument("--payload-bytes", type=int, default=1500, help="Secret data 항목당 원본 크기")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0, help="0이면 전송 지연 없음")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    api = FakeSecretApi(build_secrets(args.secrets, args.tls_ratio, args.payload_bytes), args.bandwidth_mbps)
+    results = [
+        await measure("legacy (full list + python filter)", legacy_list, api, args.rounds),
+        await measure("fieldSelector + metadata only", metadata_list, api, args.rounds),
+    ]
+    assert results[0]["items"] == results[1]["items"]
+
+    print(f"{'mode':<38}{'items':>8}{'bytes/call':>14}{'p50 ms':>10}{'max ms':>10}")
+    for r in results:
+        print(f"{r['name']:<38}{r['items']:>8}{r['bytes_per_call']:>14,}{r['p50_ms']:>10.1f}{r['max_ms']:>10.1f}")
+    print(f"bytes reduction: {results[0]['bytes_per_call'] / max(1, results[1]['bytes_per_call']):.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
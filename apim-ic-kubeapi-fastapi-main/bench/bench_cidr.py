@@ -0,0 +1,109 @@
+"""IP Allow/Deny 목록 정규화(utils.cidr.aggregate) 검증 및 처리 시간
+
+잘못된 항목이 모두 InvalidAddressError로 보고되는지, 무작위 IPv4 / IPv6 목록의 결과가
+ipaddress.collapse_addresses와 같은 대역인지 확인하고 --sizes 건수별 처리 시간을 출력합니다.
+검증에 실패하면 exit 1.
+
+    python -m bench.bench_cidr --sizes 1000 100000
+"""
+from utils import cidr
+
+import argparse
+import ipaddress
+import random
+import sys
+import time
+
+VALID = {
+    "10.0.0.1": ["10.0.0.1"],
+    "10.0.0.1/32": ["10.0.0.1"],
+    "10.0.0.7/24": ["10.0.0.0/24"],
+    " 10.0.0.0/8 ": ["10.0.0.0/8"],
+    "::1": ["::1"],
+    "2001:db8::1/32": ["2001:db8::/32"],
+    "0.0.0.0/0": ["0.0.0.0/0"],
+}
+
+INVALID = [
+    "1.2.3.4/",
+    "1.2.3.4//24",
+    "1.2.3.4/abc",
+    "1.2.3.4/33",
+    "1.2.3.4/-1",
+    "1.2.3.4/ 8",
+    "1.2.3.4/٨",
+    "::1/129",
+    "::1/",
+    "1.2.3",
+    "",
+    "/24",
+]
+
+
+def check_cases() -> bool:
+    ok = True
+    for entry, expected in VALID.items():
+        result = cidr.aggregate([entry]).addresses
+        if result != expected:
+            print(f"FAIL valid {entry!r}: {result} != {expected}")
+            ok = False
+    for entry in INVALID:
+        try:
+            result = cidr.aggregate(["10.0.0.1", entry]).addresses
+        except cidr.InvalidAddressError as e:
+            if e.invalid != [entry]:
+                print(f"FAIL invalid {entry!r}: reported {e.invalid}")
+                ok = False
+        else:
+            print(f"FAIL invalid {entry!r}: accepted as {result}")
+            ok = False
+    return ok
+
+
+def random_entries(size: int) -> list:
+    entries = []
+    for _ in range(size):
+        if random.random() < 0.9:
+            address = ipaddress.IPv4Address(random.getrandbits(32) & 0xFFFF00FF | 0x0A000000)
+            prefix = random.choice((32, 32, 32, 30, 28, 24))
+        else:
+            address = ipaddress.IPv6Address(0x20010DB8 << 96 | random.getrandbits(24))
+            prefix = random.choice((128, 128, 120, 112))
+        # 단일 호스트는 절반만 접두사 표기
+        entries.append(str(address) if prefix in (32, 128) and random.random() < 0.5 else f"{address}/{prefix}")
+    return entries
+
+
+def expected(entries: list) -> set:
+    networks = [ipaddress.ip_network(entry.strip(), strict=False) for entry in entries]
+    collapsed = []
+    for version in (4, 6):
+        collapsed += ipaddress.collapse_addresses(n for n in networks if n.version == version)
+    return {str(network) for network in collapsed}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    ok = check_cases()
+    for size in args.sizes:
+        entries = random_entries(size)
+        start = time.perf_counter()
+        result = cidr.aggregate(entries)
+        seconds = time.perf_counter() - start
+        # 단일 호스트는 접두사 없이 표기하므로 비교 전에 /32, /128을 붙임
+        actual = {address if "/" in address else str(ipaddress.ip_network(address)) for address in result.addresses}
+        same = actual == expected(entries)
+        ok = ok and same
+        print(f"n={size:7d}  output {len(result.addresses):7d}  {seconds * 1000:8.1f}ms  same={same}")
+
+    print("OK" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
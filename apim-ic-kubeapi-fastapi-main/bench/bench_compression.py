@@ -0,0 +1,79 @@
+"""응답 압축 CPU 시간 대 전송 바이트 비교 (COMPRESS_MIN_SIZE / GZIP_LEVEL / BROTLI_QUALITY 조정용)
+
+VirtualServer 목록 응답(list_response와 같은 투영 + orjson)을 --sizes 항목 수만큼 만들어
+인코딩 / 레벨별 압축 시간, 압축 후 크기, 해제 시간과 --mbps 회선에서의 전송 시간을 비교합니다.
+벤치마크용 객체는 실제 객체보다 반복이 많아 압축률이 높게 나오므로, 레벨을 정할 때는 실제 응답을 저장해 --files로 측정합니다.
+net은 압축하지 않고 보낼 때보다 줄어든 응답 시간(전송 시간 감소 - 압축 시간)이며, 음수면 압축이 손해입니다.
+gzip 해제 시간은 K8S_ACCEPT_ENCODING=gzip으로 KubeAPI 응답을 받을 때 이 서비스가 쓰는 CPU 시간과 같습니다.
+
+    python -m bench.bench_compression --sizes 1 3 10 100 1000 5000 --mbps 20
+    curl -s -H 'Accept-Encoding: identity' http://127.0.0.1:8000/kubeapi/servers/ > servers.json
+    python -m bench.bench_compression --files servers.json
+"""
+from apis.servers import _virtual_server_item
+from bench.bench_lists import measure, virtual_server
+from utils.compression import ENCODERS, ENCODINGS
+
+import argparse
+import sys
+import zlib
+import orjson
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DECODERS = {
+    "gzip": lambda data: zlib.decompress(data, 31),
+    "br": lambda data: brotli.decompress(data),
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 3, 10, 100, 1000, 5000], help="목록 항목 수")
+    parser.add_argument("--files", nargs="+", default=[], help="측정할 응답 본문 파일 (지정하면 --sizes 대신 사용)")
+    parser.add_argument("--gzip-levels", type=int, nargs="+", default=[1, 5, 9])
+    parser.add_argument("--brotli-qualities", type=int, nargs="+", default=[1, 4, 6])
+    parser.add_argument("--mbps", type=float, default=20.0, help="클라이언트 회선 속도(Mbit/s)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    codecs = [("gzip", level) for level in args.gzip_levels]
+    if "br" in ENCODINGS:
+        codecs += [("br", quality) for quality in args.brotli_qualities]
+    else:
+        print("brotli 패키지가 없어 gzip만 측정합니다.")
+    bytes_per_second = args.mbps * 1e6 / 8
+
+    payloads = []
+    for path in args.files:
+        with open(path, "rb") as f:
+            payloads.append((path, f.read()))
+    if not payloads:
+        for size in args.sizes:
+            payloads.append((f"n={size:5d}", orjson.dumps({"data": [_virtual_server_item(virtual_server(index)) for index in range(size)]})))
+
+    for label, body in payloads:
+        raw_transfer = len(body) / bytes_per_second
+        print(f"{label}  raw {len(body):9d} B  transfer {raw_transfer * 1000:8.2f}ms")
+        for encoding, level in codecs:
+            encode = lambda: ENCODERS[encoding](level).compress(body, True)
+            data = encode()
+            decode = DECODERS[encoding]
+            assert decode(data) == body
+            encode_s = measure(encode, args.repeat)
+            decode_s = measure(lambda: decode(data), args.repeat)
+            transfer = len(data) / bytes_per_second
+            net = raw_transfer - transfer - encode_s
+            print(
+                f"  {encoding:4s} {level:2d}  {len(data):9d} B  x{len(body) / len(data):5.1f}"
+                f"  encode {encode_s * 1000:7.2f}ms ({len(body) / encode_s / 1e6:6.0f} MB/s)"
+                f"  decode {decode_s * 1000:6.2f}ms  transfer {transfer * 1000:8.2f}ms  net {net * 1000:+8.2f}ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""목록 응답 직렬화 비용 비교 (모델 생성 + response_model 재검증 vs dict 투영 + orjson)
+
+VirtualServer / Service를 --sizes 개수만큼 만들어 두 경로의 CPU 시간을 비교하고,
+투영 결과가 기존 응답과 같은지(그리고 response_model 스키마로 검증되는지) 확인합니다.
+
+    python -m bench.bench_lists --sizes 100 1000 10000
+"""
+from apis.servers import _virtual_server_item
+from apis.upstreams import _upstream_item
+from schema.server import VirtualServerListResponse, VirtualServerResponse, VirtualServerMetadata, VirtualServerSpec, Policy, Upstream, Route
+from schema.upstream import UpstreamResponse, UpstreamItem
+from utils.streaming import list_response
+
+from pydantic import TypeAdapter
+
+import argparse
+import json
+import sys
+import time
+import orjson
+
+
+def virtual_server(index: int) -> dict:
+    return {
+        "apiVersion": "k8s.nginx.org/v1",
+        "kind": "VirtualServer",
+        "metadata": {"uid": f"vs-{index}", "name": f"server-{index}", "namespace": f"ns-{index % 10}", "resourceVersion": str(index), "labels": {"app": "apim"}},
+        "spec": {
+            "host": f"{index}.example.com",
+            "tls": {"secret": f"server-{index}-cert", "redirect": {"enable": True}},
+            "policies": [{"name": "ip-allow"}],
+            "upstreams": [{"name": f"backend-{n}", "service": f"upstream-{n}", "port": 80, "lb-method": "round_robin"} for n in range(3)],
+            "routes": [
+                {"path": "/", "action": {"pass": "backend-0"}},
+                {"path": "/api", "policies": [{"name": "jwt", "namespace": "default"}], "action": {"proxy": {"upstream": "backend-1"}}},
+            ],
+        },
+        "status": {"state": "Valid"},
+    }
+
+
+def service(index: int) -> dict:
+    return {
+        "metadata": {"uid": f"svc-{index}", "name": f"upstream-{index}", "namespace": f"ns-{index % 10}", "resourceVersion": str(index)},
+        "spec": {"ports": [{"port": 80, "targetPort": 8080}, {"port": 443, "targetPort": 8443}], "clusterIP": "10.0.0.1"},
+    }
+
+
+def legacy_virtual_server(item: dict) -> VirtualServerResponse:
+    # 변경 전 read_servers의 항목 생성
+    return VirtualServerResponse(
+        metadata=VirtualServerMetadata(uid=item["metadata"]["uid"], name=item["metadata"]["name"], namespace=item["metadata"]["namespace"]),
+        spec=VirtualServerSpec(
+            host=item["spec"]["host"],
+            tls=item["spec"].get("tls"),
+            policies=[Policy(**p) for p in item["spec"].get("policies", [])],
+            upstreams=[Upstream(**u) for u in item["spec"].get("upstreams", [])],
+            routes=[Route(**r) for r in item["spec"].get("routes", [])]
+        )
+    )
+
+
+def legacy_upstream(item: dict) -> UpstreamItem:
+    return UpstreamItem(
+        uid=item["metadata"]["uid"], name=item["metadata"]["name"], namespace=item["metadata"]["namespace"],
+        ports=[port.get("port", 0) for port in item["spec"].get("ports", [])]
+    )
+
+
+def legacy_body(adapter: TypeAdapter, content) -> bytes:
+    # FastAPI serialize_response: response_model로 재검증 -> json 모드 dump -> JSONResponse(json.dumps)
+    validated = adapter.validate_python(content, from_attributes=True)
+    return json.dumps(adapter.dump_python(validated, mode="json"), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def measure(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args()
+
+    cases = (
+        ("servers", virtual_server, legacy_virtual_server, VirtualServerListResponse, _virtual_server_item),
+        ("upstreams", service, legacy_upstream, UpstreamResponse, _upstream_item),
+    )
+    ok = True
+    for label, make, legacy_item, model, project in cases:
+        adapter = TypeAdapter(model)
+        for size in args.sizes:
+            items = [make(index) for index in range(size)]
+            legacy = lambda: legacy_body(adapter, model(data=[legacy_item(item) for item in items]))
+            fast = lambda: list_response(items, project).body
+
+            same = orjson.loads(legacy()) == orjson.loads(fast())
+            adapter.validate_json(fast())
+            ok = ok and same
+            legacy_s, fast_s = measure(legacy), measure(fast)
+            print(f"{label:9s} n={size:6d}  model {legacy_s * 1000:8.1f}ms  projection {fast_s * 1000:7.1f}ms  x{legacy_s / fast_s:5.1f}  same={same}")
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
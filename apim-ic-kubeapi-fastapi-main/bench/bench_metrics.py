@@ -0,0 +1,114 @@
+"""메트릭 기록 오버헤드 측정 (요청 미들웨어, Server-Timing 미들웨어, 트레이싱 미들웨어, KubeAPI / 정책 DB 호출 transport 래퍼)
+
+KubeAPI 흐름 제어 transport는 제한에 걸리지 않는 경우(토큰 / 슬롯 확보 즉시 성공)의 비용을,
+재시도 / 차단기 transport는 재시도 없이 성공하는 경우의 비용을,
+응답 압축 미들웨어는 COMPRESS_MIN_SIZE 미만이라 압축하지 않는 응답의 비용을 측정합니다.
+
+같은 ASGI 앱 / transport를 메트릭 래퍼 유무로 --calls 회씩 호출하여 호출당 추가 시간(µs)을 비교합니다.
+트레이싱은 샘플링되지 않은 요청(운영 기본값)을 기준으로 budget을 적용하고, 샘플링된 요청은 참고용으로 출력합니다.
+추가 시간이 --budget µs를 넘으면 exit 1.
+
+    python -m bench.bench_metrics --calls 50000 --budget 50
+"""
+from monitoring.metrics import (
+    MetricsMiddleware, InstrumentedTransport, KUBE_REQUEST_SECONDS, KUBE_REQUESTS, kube_request_labels,
+)
+from monitoring.timing import TimingMiddleware
+from monitoring.tracing import TracingMiddleware
+from clients.flowcontrol import Budget, FlowControlTransport
+from clients.resilience import CircuitBreaker, ResilientTransport
+from utils.compression import CompressionMiddleware
+import monitoring.tracing as tracing
+
+from types import SimpleNamespace
+
+import argparse
+import asyncio
+import sys
+import time
+import httpx
+
+ROUTE = SimpleNamespace(tags=["Upstreams"], path="/kubeapi/upstreams/")
+START = {"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]}
+BODY = {"type": "http.response.body", "body": b'{"data":[]}'}
+
+
+async def endpoint(scope, receive, send):
+    # 라우팅 결과만 흉내 내는 최소 ASGI 앱
+    scope["route"] = ROUTE
+    await send(START)
+    await send(BODY)
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def time_asgi(app, calls: int, headers=()) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/kubeapi/upstreams/", "headers": list(headers)}
+    start = time.perf_counter()
+    for _ in range(calls):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / calls
+
+
+async def time_transport(transport: httpx.AsyncBaseTransport, calls: int) -> float:
+    request = httpx.Request("PATCH", "https://kube/api/v1/namespaces/ns-0/services/upstream-0")
+    start = time.perf_counter()
+    for _ in range(calls):
+        await transport.handle_async_request(request)
+    return (time.perf_counter() - start) / calls
+
+
+def best(values) -> float:
+    return min(values) * 1e6
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=50.0, help="허용 오버헤드(µs)")
+    args = parser.parse_args()
+
+    mock = httpx.MockTransport(lambda request: httpx.Response(200))
+    instrumented = InstrumentedTransport(mock, KUBE_REQUEST_SECONDS, KUBE_REQUESTS, kube_request_labels, "kube")
+    flow = FlowControlTransport(instrumented, Budget("read", 1e9, 10**9, 50), Budget("write", 1e9, 10**9, 20))
+    resilient = ResilientTransport(flow, "kube", 2, {"GET", "HEAD"}, CircuitBreaker("kube"))
+    middleware = MetricsMiddleware(endpoint)
+    compression = CompressionMiddleware(endpoint)
+    accept_encoding = [(b"accept-encoding", b"gzip, deflate, br")]
+    server_timing = TimingMiddleware(endpoint, debug=True)
+    # 부모 context가 없는 요청은 샘플링하지 않고, traceparent의 sampled 플래그가 있으면 기록
+    provider = tracing.configure("memory", 0.0)
+    traced = TracingMiddleware(endpoint)
+    sampled = [(b"traceparent", b"00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01")]
+
+    cases = (
+        ("request middleware", lambda: time_asgi(endpoint, args.calls), lambda: time_asgi(middleware, args.calls)),
+        ("server timing", lambda: time_asgi(endpoint, args.calls), lambda: time_asgi(server_timing, args.calls)),
+        ("compression skip", lambda: time_asgi(endpoint, args.calls, accept_encoding), lambda: time_asgi(compression, args.calls, accept_encoding)),
+        ("kube transport", lambda: time_transport(mock, args.calls), lambda: time_transport(instrumented, args.calls)),
+        ("kube flow control", lambda: time_transport(instrumented, args.calls), lambda: time_transport(flow, args.calls)),
+        ("kube retry/breaker", lambda: time_transport(flow, args.calls), lambda: time_transport(resilient, args.calls)),
+        ("tracing unsampled", lambda: time_asgi(endpoint, args.calls), lambda: time_asgi(traced, args.calls)),
+        ("tracing sampled", lambda: time_asgi(endpoint, args.calls // 10, sampled), lambda: time_asgi(traced, args.calls // 10, sampled)),
+    )
+    ok = True
+    for label, bare, wrapped in cases:
+        bare_us = best([await bare() for _ in range(args.repeat)])
+        wrapped_us = best([await wrapped() for _ in range(args.repeat)])
+        overhead = wrapped_us - bare_us
+        budget = "" if label == "tracing sampled" else f"  (budget {args.budget:.0f}µs)"
+        ok = ok and (overhead < args.budget or not budget)
+        print(f"{label:20s} bare {bare_us:7.2f}µs  instrumented {wrapped_us:7.2f}µs  overhead {overhead:6.2f}µs{budget}")
+    tracing.shutdown(provider)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,71 @@
+"""정책 DB가 느릴 때 이벤트 루프 응답성 확인
+
+느린 정책 DB 대역(응답마다 --db-delay 초 지연)을 두고 GET /kubeapi/ipallow/ 를
+동시에 호출하는 동안 /healthz 응답 시간을 측정합니다. DB 호출이 루프를 막으면
+/healthz 지연이 DB 지연만큼 늘어나므로, 최대 지연이 --max-lag-ms를 넘으면 실패(exit 1)합니다.
+
+    python -m bench.bench_policy_db --db-delay 0.5 --concurrency 50
+"""
+from clients.policy_db import PolicyDBClient
+from main import app
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import httpx
+
+
+def slow_db_transport(delay: float) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json=[{"Id": "policy-1", "IPArr": ["10.0.0.1"]}])
+
+    return httpx.MockTransport(handler)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-delay", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--max-lag-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    app.state.policy_db = await PolicyDBClient(transport=slow_db_transport(args.db_delay)).start()
+    app.state.informers = {}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://app") as client:
+        done = asyncio.Event()
+        probe_ms = []
+
+        async def probe():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/healthz")
+                probe_ms.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.get("/kubeapi/ipallow/") for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+
+    await app.state.policy_db.close()
+
+    ok = sum(1 for r in responses if r.status_code == 200)
+    print(f"policy DB calls: {ok}/{args.concurrency} ok, wall {elapsed:.2f}s (DB delay {args.db_delay}s each)")
+    print(f"/healthz during load: n={len(probe_ms)} p50={statistics.median(probe_ms):.1f}ms max={max(probe_ms):.1f}ms")
+
+    if max(probe_ms) > args.max_lag_ms or ok != args.concurrency:
+        print("FAIL: event loop was blocked while waiting on the policy DB")
+        return 1
+    print("OK: event loop stayed responsive")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
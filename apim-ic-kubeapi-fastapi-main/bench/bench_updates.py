@@ -0,0 +1,141 @@
+"""업데이트 1건당 KubeAPI 왕복 횟수 비교
+
+인메모리 KubeAPI(bench.fake_apiserver)에 Service/Endpoints/VirtualServer를 --objects개씩 두고
+PUT /kubeapi/upstreams/{name}, PUT /kubeapi/servers/{name} 을 호출하여 메서드별 호출 수를 셉니다.
+
+    legacy   : 이전 방식 (전체 목록 조회 -> Endpoints GET -> PUT x2 / 전체 목록 조회 -> PUT)
+    cold     : patch, 캐시 미사용 (metadata.name fieldSelector 조회 + 객체당 PATCH 1회)
+    warm     : patch, Informer 캐시 동기화 완료 (객체당 PATCH 1회)
+    conflict : warm + 캐시된 resourceVersion이 오래된 경우 (409 -> GET -> PATCH 재시도)
+    overlap  : conflict + 다른 쓰기가 Service spec을 바꾼 경우 (덮어쓰지 않고 upstream 업데이트는 409, failures = updates)
+
+    python -m bench.bench_updates --objects 1000 --updates 50
+"""
+from bench.fake_apiserver import FakeKubeAPI
+from cache.kube_cache import build_informers
+from clients.kube import KubeClientPool
+from main import app
+
+import setting.k8s as k8s
+
+import argparse
+import asyncio
+import sys
+import httpx
+
+UPSTREAM_UPDATE = {"external_ips": ["192.168.100.20"], "service_port": 80, "target_port": 8080}
+SERVER_UPDATE = {
+    "host": "www.example.com",
+    "upstreams": [{"name": "backend", "service": "upstream-0", "port": 80}],
+    "routes": [{"path": "/", "action": {"pass": "backend"}}],
+}
+
+
+def seed(fake: FakeKubeAPI, objects: int):
+    for index in range(objects):
+        namespace = f"ns-{index % 10}"
+        name = f"upstream-{index}"
+        fake.add("services", namespace, name, {"spec": {"ports": [{"port": 80, "targetPort": 80}]}}, labels={"upstream": "external"})
+        fake.add("endpoints", namespace, name, {"subsets": [{"addresses": [{"ip": "10.0.0.1"}], "ports": [{"port": 80}]}]}, labels={"upstream": "external"})
+        fake.add("virtualservers", namespace, f"server-{index}", {"spec": {"host": f"{index}.example.com", "upstreams": []}})
+
+
+async def legacy_updates(client: httpx.AsyncClient, fake: FakeKubeAPI, updates: int):
+    # 변경 전 update_upstreams / update_server의 호출 순서 재현
+    for index in range(updates):
+        services = (await client.get(k8s.API_URL_SERVICE, headers=k8s.API_HEADER)).json()["items"]
+        svc = next(item for item in services if item["metadata"]["name"] == f"upstream-{index}")
+        namespace = svc["metadata"]["namespace"]
+        base = f"{k8s.API_URL_CORE}/namespaces/{namespace}"
+        ep = (await client.get(f"{base}/endpoints/upstream-{index}", headers=k8s.API_HEADER)).json()
+        await client.put(f"{base}/services/upstream-{index}", headers=k8s.API_HEADER, json=svc)
+        await client.put(f"{base}/endpoints/upstream-{index}", headers=k8s.API_HEADER, json=ep)
+
+        servers = (await client.get(k8s.API_URL_VIRTUALSERVER, headers=k8s.API_HEADER)).json()["items"]
+        vs = next(item for item in servers if item["metadata"]["name"] == f"server-{index}")
+        await client.put(
+            f"{k8s.API_URL_NGINX}/namespaces/{namespace}/virtualservers/server-{index}",
+            headers=k8s.API_HEADER,
+            json=vs
+        )
+
+
+async def app_updates(api: httpx.AsyncClient, updates: int, offset: int = 0) -> int:
+    failures = 0
+    for index in range(offset, offset + updates):
+        responses = (
+            await api.put(f"/kubeapi/upstreams/upstream-{index}", json=UPSTREAM_UPDATE),
+            await api.put(f"/kubeapi/servers/server-{index}", json=SERVER_UPDATE),
+        )
+        failures += sum(1 for response in responses if response.status_code != 200)
+    return failures
+
+
+async def start_informers(client: httpx.AsyncClient) -> dict:
+    informers = build_informers()
+    for informer in informers.values():
+        informer.start(client)
+    for informer in informers.values():
+        await informer.wait_synced(timeout=30)
+    return informers
+
+
+def report(label: str, fake: FakeKubeAPI, updates: int, failures: int = 0):
+    calls = {method: count for method, count in sorted(fake.calls.items()) if method != "WATCH"}
+    total = sum(calls.values())
+    detail = " ".join(f"{method}={count / updates:.1f}" for method, count in calls.items())
+    print(f"{label:9s} {total / updates:5.1f} round-trips per (upstream + server) update  [{detail}]  failures={failures}")
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=1000)
+    parser.add_argument("--updates", type=int, default=50)
+    args = parser.parse_args()
+
+    fake = FakeKubeAPI()
+    seed(fake, max(args.objects, args.updates * 4))
+    pool = KubeClientPool(transport=fake.transport())
+    client = await pool.start()
+    app.state.kube_pool = pool
+
+    await legacy_updates(client, fake, args.updates)
+    report("legacy", fake, args.updates)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://app") as api:
+        app.state.informers = {}
+        fake.reset_calls()
+        failures = await app_updates(api, args.updates)
+        report("cold", fake, args.updates, failures)
+
+        app.state.informers = await start_informers(client)
+        fake.reset_calls()
+        failures = await app_updates(api, args.updates, offset=args.updates)
+        report("warm", fake, args.updates, failures)
+
+        # 캐시 동기화 이후 watch에 반영되지 않은 변경으로 resourceVersion이 오래된 상태
+        for index in range(args.updates * 2, args.updates * 3):
+            fake.bump("services", f"ns-{index % 10}", f"upstream-{index}")
+            fake.bump("virtualservers", f"ns-{index % 10}", f"server-{index}")
+        fake.reset_calls()
+        failures = await app_updates(api, args.updates, offset=args.updates * 2)
+        report("conflict", fake, args.updates, failures)
+
+        # 업데이트가 쓰는 필드(Service spec.ports)를 다른 쓰기가 변경한 상태
+        for index in range(args.updates * 3, args.updates * 4):
+            fake.bump("services", f"ns-{index % 10}", f"upstream-{index}", {"spec": {"ports": [{"port": 81, "targetPort": 81}]}})
+            fake.bump("virtualservers", f"ns-{index % 10}", f"server-{index}")
+        fake.reset_calls()
+        failures = await app_updates(api, args.updates, offset=args.updates * 3)
+        report("overlap", fake, args.updates, failures)
+
+        for informer in app.state.informers.values():
+            await informer.stop()
+
+    await pool.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,370 @@
+"""벤치마크용 인메모리 KubeAPI / 정책 DB
+
+프로세스 내에서는 httpx.MockTransport로 감싸 KubeClientPool(transport=...),
+PolicyDBClient(transport=...)에 넣어 사용하고, 별도 프로세스로 띄울 때는 HTTP 서버로 실행합니다.
+
+    python -m bench.fake_apiserver --port 8001 --objects 1000 --size 2048 --latency 0.005
+    K8S_API_URL=http://127.0.0.1:8001 K8S_TOKEN=dev DB_URL_POLICY=http://127.0.0.1:8001/db/ipac/ uvicorn main:app
+
+Service / Endpoints / Secret / VirtualServer / Policy를 메모리에 저장하고
+limit/continue, fieldSelector·labelSelector('=' 조건), metadata-only Accept, resourceVersion 충돌(409),
+merge/apply patch, watch(ADDED/MODIFIED/DELETED 이벤트 전달)를 흉내 내며 메서드별 호출 수를 셉니다.
+"""
+from collections import Counter
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import argparse
+import asyncio
+import base64
+import copy
+import re
+import httpx
+import orjson
+
+_PATH = re.compile(
+    r"/(?:api/v1|apis/k8s\.nginx\.org/v1)(?:/namespaces/(?P<namespace>[^/]+))?"
+    r"/(?P<resource>services|endpoints|secrets|virtualservers|policies)(?:/(?P<name>[^/]+))?/?$"
+)
+_KINDS = {
+    "services": "Service",
+    "endpoints": "Endpoints",
+    "secrets": "Secret",
+    "virtualservers": "VirtualServer",
+    "policies": "Policy",
+}
+DB_PATH = "/db/ipac/"
+POLICY_NAMESPACE = "nginx-ingress"
+
+
+def merge_patch(target, patch):
+    # RFC 7386 JSON merge patch: dict는 재귀 병합, null은 삭제, 그 외(목록 포함)는 교체
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merge_patch(result.get(key), value)
+    return result
+
+
+def _field(obj: dict, path: str):
+    # fieldSelector 경로 (type, metadata.name, metadata.namespace 등)
+    for part in path.split("."):
+        obj = obj.get(part, {}) if isinstance(obj, dict) else {}
+    return obj
+
+
+def _selectors(value: str):
+    for selector in filter(None, value.split(",")):
+        key, _, expected = selector.partition("=")
+        yield key, expected
+
+
+class FakeKubeAPI:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.store: Dict[str, Dict[Tuple[str, str], dict]] = {resource: {} for resource in _KINDS}
+        self.calls: Counter = Counter()
+        self._resource_version = 1000
+        self._watchers: List[Tuple[str, Callable[[dict], bool], asyncio.Queue]] = []
+
+    # ---- 데이터 준비 ----
+
+    def _next_version(self) -> str:
+        self._resource_version += 1
+        return str(self._resource_version)
+
+    def add(self, resource: str, namespace: str, name: str, body: Optional[dict] = None, labels: Optional[dict] = None) -> dict:
+        obj = copy.deepcopy(body or {})
+        obj.setdefault("kind", _KINDS[resource])
+        obj["metadata"] = {
+            **obj.get("metadata", {}),
+            "name": name,
+            "namespace": namespace,
+            "uid": f"{resource}-{namespace}-{name}",
+            "resourceVersion": self._next_version(),
+        }
+        if labels:
+            obj["metadata"]["labels"] = labels
+        event = "MODIFIED" if (namespace, name) in self.store[resource] else "ADDED"
+        self.store[resource][(namespace, name)] = obj
+        self._notify(resource, event, obj)
+        return obj
+
+    def _notify(self, resource: str, event_type: str, obj: dict):
+        for watched, accept, queue in self._watchers:
+            if watched == resource and accept(obj):
+                queue.put_nowait((event_type, obj))
+
+    def populate(self, objects: int, size: int = 0, namespaces: int = 10):
+        """종류별 objects개 생성, 각 객체에 size 바이트 내외의 annotation(last-applied 등) 추가"""
+        padding = {"kubectl.kubernetes.io/last-applied-configuration": "x" * size} if size else {}
+        certificate = base64.b64encode(b"-----BEGIN CERTIFICATE-----" + b"A" * max(size, 1024)).decode()
+        for index in range(objects):
+            namespace = f"ns-{index % namespaces}"
+            metadata = {"annotations": padding}
+            self.add("services", namespace, f"upstream-{index}", {
+                "metadata": metadata,
+                "spec": {"ports": [{"port": 80, "targetPort": 8080, "protocol": "TCP"}], "clusterIP": "10.96.0.1", "type": "ClusterIP"},
+            }, labels={"upstream": "external"})
+            self.add("endpoints", namespace, f"upstream-{index}", {
+                "metadata": metadata,
+                "subsets": [{"addresses": [{"ip": f"192.168.{index // 250 % 250}.{index % 250 + 1}"}], "ports": [{"port": 8080}]}],
+            }, labels={"upstream": "external"})
+            self.add("virtualservers", namespace, f"server-{index}", {
+                "apiVersion": "k8s.nginx.org/v1",
+                "metadata": metadata,
+                "spec": {
+                    "host": f"server-{index}.example.com",
+                    "tls": {"secret": f"server-{index}-cert", "redirect": {"enable": True}},
+                    "policies": [{"name": f"policy-{index}-ip-allow", "namespace": POLICY_NAMESPACE}],
+                    "upstreams": [{"name": "backend", "service": f"upstream-{index}", "port": 80}],
+                    "routes": [{"path": "/", "action": {"pass": "backend"}}],
+                },
+            })
+            self.add("secrets", namespace, f"server-{index}-cert", {
+                "metadata": metadata,
+                "type": "kubernetes.io/tls",
+                "data": {"tls.crt": certificate, "tls.key": certificate},
+            })
+            self.add("policies", POLICY_NAMESPACE, f"policy-{index}-ip-allow", {
+                "apiVersion": "k8s.nginx.org/v1",
+                "metadata": metadata,
+                "spec": {"accessControl": {"allow": ["10.0.0.0/8"]}},
+            }, labels={"type": "ip-allow"})
+
+    def bump(self, resource: str, namespace: str, name: str, changes: Optional[dict] = None):
+        # watch로 전달되지 않은 외부 변경 흉내 (캐시의 resourceVersion이 오래된 상태, changes는 merge patch로 적용)
+        key = (namespace, name)
+        if changes:
+            self.store[resource][key] = merge_patch(self.store[resource][key], changes)
+        self.store[resource][key]["metadata"]["resourceVersion"] = self._next_version()
+
+    def reset_calls(self):
+        self.calls.clear()
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    # ---- 요청 처리 ----
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        match = _PATH.search(request.url.path)
+        if match is None:
+            return self._status(404, "NotFound")
+        namespace, resource, name = match.group("namespace", "resource", "name")
+        store = self.store[resource]
+
+        if params.get("watch"):
+            self.calls["WATCH"] += 1
+            return httpx.Response(200, content=self._watch(request, resource, namespace))
+
+        self.calls[request.method] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if request.method == "GET" and name is None:
+            return self._list(request, resource, namespace)
+        if request.method == "POST":
+            return self._create(store, resource, namespace, orjson.loads(request.content))
+
+        key = (namespace, name)
+        if key not in store:
+            return self._status(404, "NotFound")
+        if request.method == "GET":
+            return httpx.Response(200, json=store[key])
+        if request.method == "DELETE":
+            deleted = store.pop(key)
+            self._notify(resource, "DELETED", deleted)
+            if resource == "policies":
+                # ip_allow/ip_deny는 삭제 응답의 Status.details.uid를 사용
+                return httpx.Response(200, json={
+                    "kind": "Status", "status": "Success",
+                    "details": {"name": name, "kind": "policies", "uid": deleted["metadata"]["uid"]},
+                })
+            return httpx.Response(200, json=deleted)
+        if request.method in ("PUT", "PATCH"):
+            return self._update(request, resource, key)
+        return self._status(405, "MethodNotAllowed")
+
+    def _status(self, code: int, reason: str) -> httpx.Response:
+        return httpx.Response(code, json={"kind": "Status", "status": "Failure", "reason": reason, "code": code})
+
+    def _matcher(self, request: httpx.Request, namespace: Optional[str]) -> Callable[[dict], bool]:
+        params = request.url.params
+        fields = list(_selectors(params.get("fieldSelector", "")))
+        labels = list(_selectors(params.get("labelSelector", "")))
+
+        def accept(obj: dict) -> bool:
+            return (namespace is None or obj["metadata"]["namespace"] == namespace) \
+                and all(_field(obj, field) == value for field, value in fields) \
+                and all(obj["metadata"].get("labels", {}).get(label) == value for label, value in labels)
+
+        return accept
+
+    async def _watch(self, request: httpx.Request, resource: str, namespace: Optional[str]) -> AsyncIterator[bytes]:
+        # timeoutSeconds 동안 변경 이벤트를 한 줄씩 전달 (resourceVersion 이전 이벤트 재생은 생략)
+        metadata_only = "PartialObjectMetadata" in request.headers.get("accept", "")
+        watcher = (resource, self._matcher(request, namespace), asyncio.Queue())
+        self._watchers.append(watcher)
+        deadline = asyncio.get_running_loop().time() + float(request.url.params.get("timeoutSeconds", 300))
+        try:
+            while True:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    return
+                # wait_for는 이벤트 도착과 취소가 겹치면 취소를 삼킬 수 있어 (Informer.stop이 멈춤) wait로 대기
+                getter = asyncio.ensure_future(watcher[2].get())
+                try:
+                    done, _ = await asyncio.wait({getter}, timeout=remaining)
+                finally:
+                    getter.cancel()
+                if not done:
+                    return
+                event_type, obj = getter.result()
+                if metadata_only:
+                    obj = {"kind": "PartialObjectMetadata", "metadata": obj["metadata"]}
+                yield orjson.dumps({"type": event_type, "object": obj}) + b"\n"
+        finally:
+            self._watchers.remove(watcher)
+
+    def _list(self, request: httpx.Request, resource: str, namespace: Optional[str]) -> httpx.Response:
+        params = request.url.params
+        accept = self._matcher(request, namespace)
+        items = [obj for _, obj in sorted(self.store[resource].items()) if accept(obj)]
+
+        metadata = {"resourceVersion": str(self._resource_version)}
+        limit = int(params.get("limit", 0) or 0)
+        if limit:
+            offset = int(params.get("continue", 0) or 0)
+            if offset + limit < len(items):
+                metadata["continue"] = str(offset + limit)
+            items = items[offset:offset + limit]
+
+        if "PartialObjectMetadataList" in request.headers.get("accept", ""):
+            items = [{"kind": "PartialObjectMetadata", "metadata": obj["metadata"]} for obj in items]
+        return httpx.Response(200, json={"kind": f"{_KINDS[resource]}List", "metadata": metadata, "items": items})
+
+    def _create(self, store: dict, resource: str, namespace: Optional[str], body: dict) -> httpx.Response:
+        name = body["metadata"]["name"]
+        namespace = namespace or body["metadata"].get("namespace", "default")
+        if (namespace, name) in store:
+            return self._status(409, "AlreadyExists")
+        return httpx.Response(201, json=self.add(resource, namespace, name, body))
+
+    def _update(self, request: httpx.Request, resource: str, key: Tuple[str, str]) -> httpx.Response:
+        store = self.store[resource]
+        current = store[key]
+        body = orjson.loads(request.content)
+        expected = body.get("metadata", {}).get("resourceVersion")
+        # PUT은 resourceVersion 필수, PATCH는 지정된 경우에만 전제 조건으로 검사
+        if (request.method == "PUT" or expected) and expected != current["metadata"]["resourceVersion"]:
+            return self._status(409, "Conflict")
+
+        updated = body if request.method == "PUT" else merge_patch(current, body)
+        updated["metadata"] = {**current["metadata"], **updated.get("metadata", {}), "resourceVersion": self._next_version()}
+        store[key] = updated
+        self._notify(resource, "MODIFIED", updated)
+        return httpx.Response(200, json=updated)
+
+
+class FakePolicyDB:
+    """IP 정책 DB(k8s.DB_URL_Policy) 흉내: Id 기준 CRUD"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.records: Dict[str, dict] = {}
+        self.calls: Counter = Counter()
+
+    def populate(self, policies: int):
+        for index in range(policies):
+            uid = f"policies-{POLICY_NAMESPACE}-policy-{index}-ip-allow"
+            self.records[uid] = {"PolicyName": f"policy-{index}-ip-allow", "Id": uid, "IPArr": ["10.0.0.0/8"], "ApplyRange": "server"}
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls[request.method] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        policy_id = request.url.path.rsplit(DB_PATH, 1)[-1].strip("/")
+        if request.method == "GET" and not policy_id:
+            return httpx.Response(200, json=list(self.records.values()))
+        if request.method == "POST":
+            record = orjson.loads(request.content)
+            self.records[record["Id"]] = record
+            return httpx.Response(201, json=record)
+        if policy_id not in self.records:
+            return httpx.Response(404, json={"message": "not found"})
+        if request.method == "GET":
+            return httpx.Response(200, json=self.records[policy_id])
+        if request.method == "PUT":
+            self.records[policy_id] = orjson.loads(request.content)
+            return httpx.Response(200, json=self.records[policy_id])
+        if request.method == "DELETE":
+            return httpx.Response(200, json=self.records.pop(policy_id))
+        return httpx.Response(405, json={"message": "method not allowed"})
+
+
+def asgi_app(kube: FakeKubeAPI, db: FakePolicyDB):
+    """두 fake를 하나의 HTTP 서버로 노출 (DB_PATH 하위는 정책 DB, 나머지는 KubeAPI)"""
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                await send({"type": message["type"] + ".complete"})
+                if message["type"] == "lifespan.shutdown":
+                    return
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        request = httpx.Request(
+            scope["method"],
+            httpx.URL(path=scope["path"], query=scope["query_string"]),
+            headers=[(key.decode("latin-1"), value.decode("latin-1")) for key, value in scope["headers"]],
+            content=body,
+        )
+        handler = db.handle if scope["path"].startswith(DB_PATH) else kube.handle
+        response = await handler(request)
+        await send({
+            "type": "http.response.start",
+            "status": response.status_code,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        # watch 응답은 이벤트가 생길 때마다 전송
+        async for chunk in response.aiter_bytes():
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--objects", type=int, default=1000, help="종류별 객체 수")
+    parser.add_argument("--size", type=int, default=0, help="객체당 추가 annotation 바이트")
+    parser.add_argument("--latency", type=float, default=0.0, help="요청당 지연(초)")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    kube = FakeKubeAPI(latency=args.latency)
+    kube.populate(args.objects, args.size)
+    db = FakePolicyDB(latency=args.latency)
+    db.populate(args.objects)
+    uvicorn.run(asgi_app(kube, db), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
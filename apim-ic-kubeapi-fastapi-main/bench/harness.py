@@ -0,0 +1,48 @@
+"""벤치마크 공통: fake KubeAPI / 정책 DB에 연결한 앱을 프로세스 내에서 띄움"""
+from bench.fake_apiserver import FakeKubeAPI, FakePolicyDB
+from cache.kube_cache import build_informers
+from clients.kube import KubeClientPool
+from clients.policy_db import PolicyDBClient
+from main import app
+
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+import httpx
+
+
+@dataclass
+class Harness:
+    api: httpx.AsyncClient
+    kube: FakeKubeAPI
+    db: FakePolicyDB
+
+
+@asynccontextmanager
+async def running_app(objects: int, size: int = 0, latency: float = 0.0, cache: bool = True):
+    # main.lifespan과 같은 순서로 구성하되 transport만 fake로 교체
+    kube = FakeKubeAPI(latency=latency)
+    kube.populate(objects, size)
+    db = FakePolicyDB(latency=latency)
+    db.populate(objects)
+
+    # 앱 자체의 처리 시간을 측정하므로 KubeAPI 흐름 제어(QPS / 동시 처리 제한)는 끔
+    app.state.kube_pool = KubeClientPool(
+        transport=kube.transport(), qps=0, write_qps=0, max_in_flight=0, max_mutating_in_flight=0
+    )
+    client = await app.state.kube_pool.start()
+    app.state.policy_db = await PolicyDBClient(transport=db.transport()).start()
+    app.state.informers = build_informers() if cache else {}
+    for informer in app.state.informers.values():
+        informer.start(client)
+    for informer in app.state.informers.values():
+        await informer.wait_synced(timeout=60)
+
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://app", timeout=60) as api:
+            yield Harness(api=api, kube=kube, db=db)
+    finally:
+        for informer in app.state.informers.values():
+            await informer.stop()
+        await app.state.policy_db.close()
+        await app.state.kube_pool.close()
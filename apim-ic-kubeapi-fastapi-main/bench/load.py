@@ -0,0 +1,320 @@
+"""uvicorn 앱 전체 부하 테스트 (혼합 트래픽, 처리량 / 지연 백분위 / 오류율)
+
+기본 동작은 fake KubeAPI / 정책 DB(bench.fake_apiserver)와 `uvicorn main:app`을 각각 별도 프로세스로 띄우고,
+/readyz 가 200이 된 뒤 --duration 초 동안 --mix 비율로 요청을 보냅니다.
+
+    --rate N        : 초당 N건을 일정 간격으로 발생 (open loop, 지연은 예정 시각부터 측정)
+    --concurrency N : N개 작업자가 응답을 받는 즉시 다음 요청 (closed loop, --rate 미지정 시)
+
+    python -m bench.load --duration 30 --rate 200 --json before.json
+    python -m bench.load --duration 30 --concurrency 64 --compare before.json --json after.json
+    python -m bench.load --url http://127.0.0.1:8000 --objects 1000   # 이미 실행 중인 앱 대상
+    python -m bench.load --in-process                                  # 소켓 없이 harness로 실행
+"""
+from bench.bench_endpoints import SCENARIOS, Scenario, percentile
+
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import httpx
+import orjson
+
+# 읽기 80% (servers / upstreams 목록) + 생성 / 수정 소량
+DEFAULT_MIX = {
+    "servers.read_all": 30,
+    "servers.read_namespace": 10,
+    "upstreams.read_all": 30,
+    "upstreams.read_namespace": 10,
+    "upstreams.create": 4,
+    "upstreams.update": 6,
+    "servers.create": 4,
+    "servers.update": 6,
+}
+
+
+@dataclass
+class Stats:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+
+    def add(self, latency_ms: float, status: str, error: bool):
+        self.latencies.append(latency_ms)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.errors += error
+
+    def summary(self, elapsed: float) -> dict:
+        count = len(self.latencies)
+        return {
+            "requests": count,
+            "throughput_rps": count / elapsed if elapsed else 0.0,
+            "error_rate": self.errors / count if count else 0.0,
+            "p50_ms": percentile(self.latencies, 0.50) if count else None,
+            "p90_ms": percentile(self.latencies, 0.90) if count else None,
+            "p99_ms": percentile(self.latencies, 0.99) if count else None,
+            "max_ms": max(self.latencies) if count else None,
+            "statuses": self.statuses,
+        }
+
+
+def parse_mix(values: List[str]) -> Dict[str, float]:
+    if not values:
+        return dict(DEFAULT_MIX)
+    known = {scenario.name for scenario in SCENARIOS}
+    mix = {}
+    for value in values:
+        name, _, weight = value.partition("=")
+        if name not in known:
+            raise SystemExit(f"알 수 없는 시나리오: {name} (사용 가능: {', '.join(sorted(known))})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class LoadGenerator:
+    def __init__(self, api: httpx.AsyncClient, mix: Dict[str, float], objects: int, seed: int = 0):
+        scenarios = {scenario.name: scenario for scenario in SCENARIOS}
+        self.api = api
+        self.objects = objects
+        self.names = list(mix)
+        self.scenarios = [scenarios[name] for name in self.names]
+        self.weights = [mix[name] for name in self.names]
+        self.random = random.Random(seed)
+        self.stats: Dict[str, Stats] = {name: Stats() for name in self.names}
+        self.total = Stats()
+        # 생성은 매번 새 이름, 수정은 기존 객체를 순환하도록 시나리오별 호출 순번을 유지
+        self.sequence: Dict[str, int] = {name: 0 for name in self.names}
+
+    def pick(self) -> Scenario:
+        return self.random.choices(self.scenarios, self.weights)[0]
+
+    async def request(self, scenario: Scenario, scheduled: Optional[float] = None):
+        i = self.sequence[scenario.name]
+        self.sequence[scenario.name] = i + 1
+        if scenario.method == "PUT":
+            i %= self.objects
+        start = scheduled if scheduled is not None else time.perf_counter()
+        try:
+            response = await self.api.request(
+                scenario.method,
+                scenario.path(i, self.objects),
+                params=scenario.params(i, self.objects) if scenario.params else None,
+                json=scenario.body(i, self.objects) if scenario.body else None,
+            )
+            status, error = str(response.status_code), response.status_code >= 400
+        except httpx.HTTPError as exc:
+            status, error = type(exc).__name__, True
+        latency = (time.perf_counter() - start) * 1000
+        self.stats[scenario.name].add(latency, status, error)
+        self.total.add(latency, status, error)
+
+    async def closed_loop(self, concurrency: int, duration: float):
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                await self.request(self.pick())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    async def open_loop(self, rate: float, duration: float, max_in_flight: int):
+        # 예정 시각 기준으로 지연을 측정해 서버가 밀릴 때의 대기 시간도 결과에 포함
+        interval = 1.0 / rate
+        start = time.perf_counter()
+        in_flight = asyncio.Semaphore(max_in_flight)
+        tasks = set()
+
+        async def fire(scenario: Scenario, scheduled: float):
+            async with in_flight:
+                await self.request(scenario, scheduled)
+
+        sent = 0
+        while sent * interval < duration:
+            scheduled = start + sent * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.create_task(fire(self.pick(), scheduled))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            sent += 1
+        if tasks:
+            await asyncio.gather(*tasks)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_ready(url: str, timeout: float):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url, timeout=5) as client:
+        while time.monotonic() < deadline:
+            with contextlib.suppress(httpx.HTTPError):
+                if (await client.get("/readyz")).status_code == 200:
+                    return
+            await asyncio.sleep(0.2)
+    raise SystemExit(f"{url}/readyz 가 {timeout:.0f}초 안에 준비되지 않았습니다")
+
+
+@asynccontextmanager
+async def spawned_app(args):
+    # fake 서버와 앱을 별도 프로세스로 실행하여 부하 생성기와 이벤트 루프/CPU를 나눔
+    fake_port, app_port = free_port(), free_port()
+    fake_url = f"http://127.0.0.1:{fake_port}"
+    env = dict(
+        # 앱 처리량 측정이 목적이므로 KubeAPI 흐름 제어는 끔 (환경 변수로 지정하면 그 값 사용)
+        {"K8S_QPS": "0", "K8S_WRITE_QPS": "0", "K8S_MAX_INFLIGHT": "0", "K8S_MAX_MUTATING_INFLIGHT": "0"},
+        **os.environ,
+        K8S_API_URL=fake_url,
+        K8S_TOKEN="load",
+        DB_URL_POLICY=f"{fake_url}/db/ipac/",
+        K8S_CACHE_ENABLED="false" if args.no_cache else "true",
+    )
+    fake = subprocess.Popen(
+        [sys.executable, "-m", "bench.fake_apiserver", "--port", str(fake_port),
+         "--objects", str(args.objects), "--size", str(args.object_size), "--latency", str(args.latency)],
+    )
+    app = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(app_port),
+         "--workers", str(args.app_workers), "--log-level", "warning", "--no-access-log"],
+        env=env, stdout=subprocess.DEVNULL,
+    )
+    try:
+        url = f"http://127.0.0.1:{app_port}"
+        await wait_ready(url, timeout=120)
+        async with httpx.AsyncClient(base_url=url, timeout=60, limits=httpx.Limits(max_connections=None)) as api:
+            yield api
+    finally:
+        for process in (app, fake):
+            process.terminate()
+        for process in (app, fake):
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+@asynccontextmanager
+async def in_process_app(args):
+    from bench.harness import running_app
+
+    # ip_allow/ip_deny의 디버그 print 출력은 결과에서 제외 (동시 요청이므로 실행 전체에 한 번만 적용)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        async with running_app(args.objects, args.object_size, args.latency, cache=not args.no_cache) as harness:
+            yield harness.api
+
+
+@asynccontextmanager
+async def external_app(args):
+    await wait_ready(args.url, timeout=30)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60, limits=httpx.Limits(max_connections=None)) as api:
+        yield api
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def print_report(result: dict, baseline: Optional[dict]):
+    previous = (baseline or {}).get("scenarios", {})
+    print(f"{'scenario':26s} {'reqs':>7s} {'rps':>8s} {'err %':>6s} {'p50 ms':>8s} {'p90 ms':>8s} {'p99 ms':>8s}")
+    rows = list(result["scenarios"].items()) + [("total", result["total"])]
+    for name, row in rows:
+        if not row["requests"]:
+            continue
+        line = (
+            f"{name:26s} {row['requests']:7d} {row['throughput_rps']:8.1f} {row['error_rate'] * 100:6.2f} "
+            f"{row['p50_ms']:8.2f} {row['p90_ms']:8.2f} {row['p99_ms']:8.2f}"
+        )
+        before = baseline["total"] if name == "total" and baseline else previous.get(name)
+        if before and before.get("p99_ms"):
+            line += f"   p99 {(row['p99_ms'] / before['p99_ms'] - 1) * 100:+6.1f}%  rps {(row['throughput_rps'] / before['throughput_rps'] - 1) * 100:+6.1f}%"
+        print(line)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0, help="측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="측정 전 워밍업 시간(초)")
+    parser.add_argument("--rate", type=float, default=0.0, help="초당 요청 수 (지정 시 open loop)")
+    parser.add_argument("--concurrency", type=int, default=32, help="closed loop 동시 요청 수 / open loop 최대 동시 요청 수")
+    parser.add_argument("--mix", nargs="*", default=[], metavar="SCENARIO=WEIGHT", help="트래픽 비율 (기본: 읽기 80%%, 생성/수정 20%%)")
+    parser.add_argument("--objects", type=int, default=1000, help="종류별 객체 수")
+    parser.add_argument("--object-size", type=int, default=0, help="객체당 추가 annotation 바이트")
+    parser.add_argument("--latency", type=float, default=0.0, help="fake KubeAPI/DB 요청당 지연(초)")
+    parser.add_argument("--no-cache", action="store_true", help="Informer 캐시 없이 측정")
+    parser.add_argument("--app-workers", type=int, default=1, help="uvicorn 워커 프로세스 수")
+    parser.add_argument("--url", default="", help="이미 실행 중인 앱 주소 (fake 서버도 직접 실행)")
+    parser.add_argument("--in-process", action="store_true", help="앱을 같은 프로세스에서 ASGI로 호출")
+    parser.add_argument("--seed", type=int, default=0, help="시나리오 선택 난수 시드")
+    parser.add_argument("--compare", default="", help="이전 결과 JSON과 p99/처리량 비교")
+    parser.add_argument("--json", default="", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    target = external_app if args.url else in_process_app if args.in_process else spawned_app
+    async with target(args) as api:
+        async def run(generator: LoadGenerator, duration: float):
+            if args.rate:
+                await generator.open_loop(args.rate, duration, args.concurrency)
+            else:
+                await generator.closed_loop(args.concurrency, duration)
+
+        if args.warmup:
+            await run(LoadGenerator(api, mix, args.objects, seed=args.seed + 1), args.warmup)
+        generator = LoadGenerator(api, mix, args.objects, seed=args.seed)
+        # 워밍업과 생성 이름이 겹치지 않도록 순번을 분리
+        generator.sequence = {name: 1_000_000 for name in generator.names}
+        start = time.perf_counter()
+        await run(generator, args.duration)
+        elapsed = time.perf_counter() - start
+
+    result = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "revision": git_revision(),
+        "config": {
+            "mode": "url" if args.url else "in-process" if args.in_process else "spawn",
+            "duration": args.duration,
+            "rate": args.rate or None,
+            "concurrency": args.concurrency,
+            "objects": args.objects,
+            "object_size": args.object_size,
+            "latency": args.latency,
+            "cache": not args.no_cache,
+            "app_workers": args.app_workers,
+            "mix": mix,
+        },
+        "elapsed": elapsed,
+        "total": generator.total.summary(elapsed),
+        "scenarios": {name: stats.summary(elapsed) for name, stats in generator.stats.items()},
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "rb") as f:
+            baseline = orjson.loads(f.read())
+    print_report(result, baseline)
+    if args.json:
+        with open(args.json, "wb") as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
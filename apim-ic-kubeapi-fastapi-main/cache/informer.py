@@ -0,0 +1,237 @@
+import setting.k8s as k8s
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+import asyncio
+import logging
+import httpx
+import orjson
+
+logger = logging.getLogger(__name__)
+
+Key = Tuple[str, str]
+Indexer = Callable[[dict], List[str]]
+
+
+class ResourceExpired(Exception):
+    """watch 중 410 Gone 수신: resourceVersion이 만료되어 재LIST 필요"""
+
+
+def namespace_index(obj: dict) -> List[str]:
+    return [obj.get("metadata", {}).get("namespace", "")]
+
+
+def name_index(obj: dict) -> List[str]:
+    return [obj.get("metadata", {}).get("name", "")]
+
+
+def strip_managed_fields(obj: dict) -> dict:
+    # 캐시 메모리 절약: 조회에 쓰이지 않는 managedFields 제거
+    obj.get("metadata", {}).pop("managedFields", None)
+    return obj
+
+
+class Informer:
+    """client-go Informer 방식의 LIST + WATCH 인메모리 캐시
+
+    최초 1회 LIST 후 마지막 resourceVersion부터 WATCH 하며,
+    BOOKMARK로 resourceVersion을 갱신하고 410 Gone 수신 시 재LIST 합니다.
+    """
+
+    def __init__(
+        self,
+        list_url: str,
+        params: Optional[Dict[str, str]] = None,
+        metadata_only: bool = False,
+        indexers: Optional[Dict[str, Indexer]] = None,
+        transform: Optional[Callable[[dict], dict]] = strip_managed_fields,
+        watch_timeout: int = k8s.K8S_WATCH_TIMEOUT,
+        max_backoff: float = 30.0,
+    ):
+        self.list_url = list_url
+        self.params = params or {}
+        # metadata_only: PartialObjectMetadata로 LIST/WATCH (Secret data 등 본문 미전송)
+        self.list_headers = k8s.API_HEADER_METADATA if metadata_only else k8s.API_HEADER
+        self.watch_headers = k8s.API_HEADER_METADATA_WATCH if metadata_only else k8s.API_HEADER
+        self.indexers: Dict[str, Indexer] = {"namespace": namespace_index, **(indexers or {})}
+        self.transform = transform
+        self.watch_timeout = watch_timeout
+        self.max_backoff = max_backoff
+
+        self.resource_version: str = ""
+        # 저장된 객체가 마지막으로 바뀐 resourceVersion (BOOKMARK으로는 바뀌지 않음, 목록 ETag에 사용)
+        self.version: str = ""
+        self._items: Dict[Key, dict] = {}
+        self._indices: Dict[str, Dict[str, Dict[Key, dict]]] = {name: {} for name in self.indexers}
+        self._snapshot: Optional[List[dict]] = None
+        self._synced = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    # ---- 조회 ----
+
+    @property
+    def ready(self) -> bool:
+        return self._synced.is_set()
+
+    async def wait_synced(self, timeout: Optional[float] = None) -> bool:
+        try:
+            await asyncio.wait_for(self._synced.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def list(self, namespace: Optional[str] = None) -> List[dict]:
+        if namespace is not None:
+            return self.by_index("namespace", namespace)
+        if self._snapshot is None:
+            self._snapshot = [self._items[key] for key in sorted(self._items)]
+        return self._snapshot
+
+    def get(self, namespace: str, name: str) -> Optional[dict]:
+        return self._items.get((namespace, name))
+
+    def by_index(self, index_name: str, value: str) -> List[dict]:
+        bucket = self._indices[index_name].get(value, {})
+        return [bucket[key] for key in sorted(bucket)]
+
+    # ---- 스토어 갱신 ----
+
+    @staticmethod
+    def _key(obj: dict) -> Key:
+        metadata = obj.get("metadata", {})
+        return metadata.get("namespace", ""), metadata.get("name", "")
+
+    def _index_add(self, key: Key, obj: dict):
+        for index_name, indexer in self.indexers.items():
+            index = self._indices[index_name]
+            for value in indexer(obj):
+                index.setdefault(value, {})[key] = obj
+
+    def _index_remove(self, key: Key, obj: dict):
+        for index_name, indexer in self.indexers.items():
+            index = self._indices[index_name]
+            for value in indexer(obj):
+                bucket = index.get(value)
+                if bucket is None:
+                    continue
+                bucket.pop(key, None)
+                if not bucket:
+                    del index[value]
+
+    def _upsert(self, obj: dict):
+        if self.transform:
+            obj = self.transform(obj)
+        key = self._key(obj)
+        old = self._items.get(key)
+        if old is not None:
+            self._index_remove(key, old)
+        self._items[key] = obj
+        self._index_add(key, obj)
+        self._snapshot = None
+
+    def _delete(self, obj: dict):
+        key = self._key(obj)
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._index_remove(key, old)
+            self._snapshot = None
+
+    def _replace(self, items: List[dict], resource_version: str):
+        self._items = {}
+        self._indices = {name: {} for name in self.indexers}
+        self._snapshot = None
+        for obj in items:
+            self._upsert(obj)
+        self.resource_version = resource_version
+        self.version = resource_version
+
+    # ---- LIST / WATCH ----
+
+    async def _list(self, client: httpx.AsyncClient):
+        response = await client.get(url=self.list_url, params=self.params, headers=self.list_headers)
+        response.raise_for_status()
+        response_json = orjson.loads(response.content)
+        self._replace(
+            response_json.get("items", []),
+            response_json.get("metadata", {}).get("resourceVersion", ""),
+        )
+        self._synced.set()
+
+    async def _watch(self, client: httpx.AsyncClient):
+        params = {
+            **self.params,
+            "watch": "1",
+            "resourceVersion": self.resource_version,
+            "allowWatchBookmarks": "true",
+            "timeoutSeconds": str(self.watch_timeout),
+        }
+        async with client.stream(
+            "GET",
+            url=self.list_url,
+            params=params,
+            headers=self.watch_headers,
+            timeout=httpx.Timeout(k8s.K8S_TIMEOUT, read=self.watch_timeout + 30),
+        ) as response:
+            if response.status_code == 410:
+                raise ResourceExpired()
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    self._handle_event(orjson.loads(line))
+
+    def _handle_event(self, event: dict):
+        event_type = event.get("type")
+        obj = event.get("object", {})
+
+        if event_type == "ERROR":
+            if obj.get("code") == 410:
+                raise ResourceExpired()
+            raise RuntimeError(f"watch error: {obj.get('message')}")
+
+        resource_version = obj.get("metadata", {}).get("resourceVersion")
+        if event_type in ("ADDED", "MODIFIED"):
+            self._upsert(obj)
+        elif event_type == "DELETED":
+            self._delete(obj)
+        # BOOKMARK은 resourceVersion만 전달
+        if resource_version:
+            self.resource_version = resource_version
+            if event_type != "BOOKMARK":
+                self.version = resource_version
+
+    async def run(self, client: httpx.AsyncClient):
+        backoff = 1.0
+        need_list = True
+        while True:
+            try:
+                if need_list:
+                    await self._list(client)
+                    need_list = False
+                await self._watch(client)
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except ResourceExpired:
+                logger.info("%s: resourceVersion %s 만료, 재LIST", self.list_url, self.resource_version)
+                need_list = True
+            except Exception as e:
+                logger.warning("%s: list/watch 실패 (%s), %.1fs 후 재시도", self.list_url, e, backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    def start(self, client: httpx.AsyncClient) -> asyncio.Task:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(client))
+        return self._task
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,51 @@
+import setting.k8s as k8s
+from cache.informer import Informer, name_index
+from cache.resolver import NameResolver
+
+from fastapi import Request
+
+from typing import Dict, Optional
+
+
+def build_informers() -> Dict[str, Informer]:
+    # 캐시 대상 리소스 목록 (K8S_CACHE_ENABLED=false면 모든 조회가 KubeAPI 직접 호출)
+    if not k8s.K8S_CACHE_ENABLED:
+        return {}
+    return {
+        "services": Informer(k8s.API_URL_SERVICE, indexers={"name": name_index}),
+        "virtualservers": Informer(k8s.API_URL_VIRTUALSERVER, indexers={"name": name_index}),
+        # 삭제 시 이름 -> 네임스페이스 확인용이므로 TLS Secret은 metadata만 캐시
+        "secrets": Informer(
+            k8s.API_URL_TLS_SECRET,
+            params={"fieldSelector": k8s.TLS_SECRET_FIELD_SELECTOR},
+            metadata_only=True,
+            indexers={"name": name_index},
+        ),
+    }
+
+
+def get_informers(request: Request) -> Dict[str, Informer]:
+    return getattr(request.app.state, "informers", {})
+
+
+def _ready_informer(request: Request, name: str) -> Optional[Informer]:
+    # 초기 동기화 전에는 None을 반환하여 KubeAPI 직접 조회로 대체
+    informer = get_informers(request).get(name)
+    return informer if informer is not None and informer.ready else None
+
+
+def get_service_informer(request: Request) -> Optional[Informer]:
+    return _ready_informer(request, "services")
+
+
+def get_virtualserver_informer(request: Request) -> Optional[Informer]:
+    return _ready_informer(request, "virtualservers")
+
+
+def get_secret_informer(request: Request) -> Optional[Informer]:
+    return _ready_informer(request, "secrets")
+
+
+def get_name_resolver(request: Request) -> NameResolver:
+    # 이름만 받는 삭제/수정 API의 네임스페이스 탐색
+    return NameResolver(get_informers(request))
@@ -0,0 +1,95 @@
+import setting.k8s as k8s
+from cache.informer import Informer
+from monitoring.timing import decode
+
+from fastapi import HTTPException
+
+from typing import Callable, Dict, List, Optional
+
+import asyncio
+import httpx
+
+NAMESPACE_QUERY_DESCRIPTION = "같은 이름이 여러 네임스페이스에 있을 때 대상 네임스페이스 지정"
+
+
+class AmbiguousNameError(HTTPException):
+    """같은 이름이 여러 네임스페이스에 있어 대상을 특정할 수 없음 (namespace 파라미터로 지정 필요)"""
+
+    def __init__(self, kind: str, name: str, namespaces: List[str]):
+        self.namespaces = namespaces
+        super().__init__(
+            status_code=409,
+            detail={
+                "message": f"{kind} '{name}'가 여러 네임스페이스에 존재합니다. namespace를 지정하세요.",
+                "namespaces": namespaces
+            }
+        )
+
+
+# kind -> (클러스터 전체 목록 URL, 헤더, 추가 fieldSelector)
+RESOLVABLE_KINDS = {
+    "services": (k8s.API_URL_SERVICE, k8s.API_HEADER, ""),
+    "virtualservers": (k8s.API_URL_VIRTUALSERVER, k8s.API_HEADER, ""),
+    "secrets": (k8s.API_URL_TLS_SECRET, k8s.API_HEADER_METADATA, k8s.TLS_SECRET_FIELD_SELECTOR),
+}
+
+
+class NameResolver:
+    """(kind, name) -> 네임스페이스별 객체 조회
+
+    동기화된 Informer의 name 인덱스(watch 이벤트로 갱신)를 우선 사용하고,
+    캐시 미사용/미동기화 또는 캐시 미스(방금 생성되어 아직 watch에 반영되지 않은 경우 등)에는
+    metadata.name fieldSelector로 해당 이름만 KubeAPI에서 조회합니다.
+    """
+
+    def __init__(self, informers: Dict[str, Informer]):
+        self.informers = informers
+
+    def _cached(self, kind: str, name: str) -> List[dict]:
+        informer = self.informers.get(kind)
+        if informer is None or not informer.ready:
+            return []
+        return informer.by_index("name", name)
+
+    async def _fetch(self, client: httpx.AsyncClient, kind: str, name: str) -> List[dict]:
+        url, headers, field_selector = RESOLVABLE_KINDS[kind]
+        selectors = [field_selector] if field_selector else []
+        response = await client.get(
+            url=url,
+            params={"fieldSelector": ",".join(selectors + [f"metadata.name={name}"])},
+            headers=headers
+        )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Kubernetes API error: {response.text}"
+            )
+        return decode(response).get("items", [])
+
+    async def resolve(
+        self,
+        client: httpx.AsyncClient,
+        kind: str,
+        name: str,
+        namespace: Optional[str] = None,
+        aliases: Optional[List[str]] = None,
+        predicate: Optional[Callable[[dict], bool]] = None,
+    ) -> Optional[dict]:
+        # 일치 항목이 없으면 None, 여러 네임스페이스에서 일치하면 AmbiguousNameError(409)
+        # name과 aliases가 모두 일치하면 name(없으면 aliases 순서상 앞의 이름)의 객체만 후보로 봄
+        names = [name, *(aliases or [])]
+
+        def accept(obj: dict) -> bool:
+            return (namespace is None or obj["metadata"].get("namespace") == namespace) \
+                and (predicate is None or predicate(obj))
+
+        matches = [[obj for obj in self._cached(kind, candidate) if accept(obj)] for candidate in names]
+        if not any(matches):
+            fetched = await asyncio.gather(*(self._fetch(client, kind, candidate) for candidate in names))
+            matches = [[obj for obj in items if accept(obj)] for items in fetched]
+
+        # 이름은 네임스페이스 안에서 유일하므로 같은 이름의 후보가 둘 이상이면 서로 다른 네임스페이스
+        found = next((objs for objs in matches if objs), [])
+        if len(found) > 1:
+            raise AmbiguousNameError(kind, name, sorted(obj["metadata"].get("namespace", "") for obj in found))
+        return found[0] if found else None
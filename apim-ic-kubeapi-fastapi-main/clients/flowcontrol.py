@@ -0,0 +1,148 @@
+import setting.k8s as k8s
+from monitoring.metrics import KUBE_FLOW_WAIT_SECONDS
+from monitoring.timing import current
+
+from typing import Dict, Optional
+
+import asyncio
+import time
+import httpx
+
+READ_METHODS = ("GET", "HEAD")
+
+
+class TokenBucket:
+    """client-go flowcontrol.NewTokenBucketRateLimiter와 같은 토큰 버킷 (qps 속도로 채워지며 최대 burst개)
+
+    토큰이 없으면 예약 방식으로 대기 시간을 계산해 sleep 하므로 도착 순서대로 처리됩니다.
+    qps가 0 이하면 제한하지 않습니다.
+    """
+
+    def __init__(self, qps: float, burst: int):
+        self.qps = qps
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> bool:
+        """토큰을 기다렸으면 True"""
+        if self.qps <= 0:
+            return False
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.qps)
+        self._updated = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return False
+        try:
+            await asyncio.sleep(-self.tokens / self.qps)
+        except asyncio.CancelledError:
+            # 대기 중 취소되면 예약한 토큰 반환
+            self.tokens += 1
+            raise
+        return True
+
+
+class Budget:
+    """읽기 또는 쓰기 요청 예산: 토큰 버킷 + 동시 처리 수 제한"""
+
+    def __init__(self, name: str, qps: float, burst: int, max_in_flight: int):
+        self.name = name
+        self.bucket = TokenBucket(qps, burst)
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(max_in_flight) if max_in_flight > 0 else None
+        self._histogram = KUBE_FLOW_WAIT_SECONDS.labels(name)
+
+    async def acquire(self, slot: bool) -> float:
+        """대기한 시간(초, 제한에 걸리지 않았으면 0)을 반환, slot이면 동시 처리 슬롯도 확보 (release 필요)"""
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            waited = await self.bucket.acquire()
+            if slot and self._semaphore is not None:
+                waited = self._semaphore.locked() or waited
+                await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        if slot:
+            self.in_flight += 1
+        wait = time.perf_counter() - start if waited else 0.0
+        self._histogram.observe(wait)
+        return wait
+
+    def release(self):
+        self.in_flight -= 1
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, int]:
+        return {"in_flight": self.in_flight, "waiting": self.waiting, "max_in_flight": self.max_in_flight}
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """응답 본문 수신이 끝나 스트림이 닫힐 때 동시 처리 슬롯 반환"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, budget: Budget):
+        self.stream = stream
+        self.budget: Optional[Budget] = budget
+
+    async def __aiter__(self):
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self.stream.aclose()
+        finally:
+            if self.budget is not None:
+                self.budget.release()
+                self.budget = None
+
+
+class FlowControlTransport(httpx.AsyncBaseTransport):
+    """KubeAPI 요청 흐름 제어 transport (모든 KubeAPI 호출이 공유)
+
+    GET / HEAD는 읽기, 그 외는 쓰기 예산을 사용합니다. WATCH는 토큰만 소비하고 동시 처리 슬롯은 차지하지 않습니다.
+    (kube-apiserver의 max-requests-inflight와 같이 장시간 요청은 동시 처리 수에서 제외)
+    대기 시간은 apim_kube_flow_wait_seconds와 Server-Timing의 kube-wait 구간에 기록합니다.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        read: Optional[Budget] = None,
+        write: Optional[Budget] = None,
+    ):
+        self.transport = transport
+        self.read = read or Budget("read", k8s.K8S_QPS, k8s.K8S_BURST, k8s.K8S_MAX_INFLIGHT)
+        self.write = write or Budget("write", k8s.K8S_WRITE_QPS, k8s.K8S_WRITE_BURST, k8s.K8S_MAX_MUTATING_INFLIGHT)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        budget = self.read if request.method in READ_METHODS else self.write
+        slot = b"watch=" not in request.url.query
+        wait = await budget.acquire(slot)
+        timing = current()
+        if timing is not None and wait:
+            timing.add("kube-wait", wait)
+        if not slot:
+            return await self.transport.handle_async_request(request)
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            budget.release()
+            raise
+        try:
+            # 본문이 이미 읽힌 응답(MockTransport 등)은 스트림이 닫히지 않으므로 바로 반환
+            response.content
+            budget.release()
+        except httpx.ResponseNotRead:
+            response.stream = _ReleasingStream(response.stream, budget)
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {"read": self.read.stats(), "write": self.write.stats()}
@@ -0,0 +1,275 @@
+from monitoring.metrics import InstrumentedTransport, KUBE_REQUEST_SECONDS, KUBE_REQUESTS, kube_request_labels, kube_resource, observe_coalesced_read
+from monitoring.timing import decode
+from clients.singleflight import SingleFlight
+from clients.flowcontrol import Budget, FlowControlTransport
+from clients.resilience import CircuitBreaker, ResilientTransport
+
+import setting.k8s as k8s
+
+from fastapi import HTTPException, Request
+
+from typing import List, Optional
+
+import os
+import ssl
+import time
+import logging
+import importlib.util
+import httpx
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# 재시도해도 안전한 KubeAPI 메서드 (WATCH는 ResilientTransport에서 제외)
+IDEMPOTENT_METHODS = {"GET", "HEAD"}
+
+# KubeAPI 목록 조회 병합 (프로세스당 하나의 이벤트 루프 / 클라이언트)
+kube_reads = SingleFlight()
+
+
+class KubeTokenAuth(httpx.Auth):
+    """요청마다 Bearer 토큰을 추가하는 httpx 인증
+
+    토큰 파일은 import 시점이 아닌 첫 요청 시점에 읽고, 서비스어카운트 토큰 갱신을
+    반영하도록 reload_interval초마다 다시 읽습니다. token을 주면 파일을 읽지 않습니다.
+    """
+
+    def __init__(
+        self,
+        token: str = k8s.K8S_TOKEN,
+        token_path: str = k8s.K8S_TOKEN_PATH,
+        reload_interval: float = k8s.K8S_TOKEN_RELOAD,
+    ):
+        self.token_path = token_path
+        self.reload_interval = reload_interval
+        self._token: Optional[str] = token or None
+        self._static = bool(token)
+        self._loaded_at = 0.0
+
+    def token(self) -> str:
+        if self._static:
+            return self._token
+        now = time.monotonic()
+        if self._token is None or now - self._loaded_at >= self.reload_interval:
+            try:
+                with open(self.token_path, 'r') as f:
+                    self._token = f.read().strip()
+            except OSError as e:
+                # 읽기 실패 시 이전 토큰 유지 (없으면 인증 없이 요청)
+                logger.warning("KubeAPI 토큰 파일 읽기 실패 (%s): %s", self.token_path, e)
+                self._token = self._token or ""
+            self._loaded_at = now
+        return self._token
+
+    def auth_flow(self, request: httpx.Request):
+        token = self.token()
+        if token:
+            request.headers["Authorization"] = "Bearer " + token
+        yield request
+
+
+class KubeClientPool:
+    """애플리케이션 lifespan 동안 유지되는 KubeAPI용 httpx.AsyncClient 풀"""
+
+    def __init__(
+        self,
+        max_connections: int = k8s.K8S_POOL_MAX_CONNECTIONS,
+        max_keepalive: int = k8s.K8S_POOL_MAX_KEEPALIVE,
+        keepalive_expiry: float = k8s.K8S_KEEPALIVE_EXPIRY,
+        timeout: float = k8s.K8S_TIMEOUT,
+        http2: bool = k8s.K8S_HTTP2,
+        ca_cert_path: str = k8s.K8S_CA_CERT_PATH,
+        insecure_skip_verify: bool = k8s.K8S_INSECURE_SKIP_VERIFY,
+        accept_encoding: str = k8s.K8S_ACCEPT_ENCODING,
+        qps: float = k8s.K8S_QPS,
+        burst: int = k8s.K8S_BURST,
+        write_qps: float = k8s.K8S_WRITE_QPS,
+        write_burst: int = k8s.K8S_WRITE_BURST,
+        max_in_flight: int = k8s.K8S_MAX_INFLIGHT,
+        max_mutating_in_flight: int = k8s.K8S_MAX_MUTATING_INFLIGHT,
+        retries: int = k8s.K8S_RETRIES,
+        breaker: Optional[CircuitBreaker] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        auth: Optional[httpx.Auth] = None,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout)
+        # h2 패키지가 없으면 HTTP/1.1 keep-alive로 동작
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self.ca_cert_path = ca_cert_path
+        self.insecure_skip_verify = insecure_skip_verify
+        # httpx 기본값(gzip, deflate[, br, zstd]) 대신 kube-apiserver가 지원하는 인코딩만 요청
+        self.headers = {"Accept-Encoding": accept_encoding or "identity"}
+        # 흐름 제어 예산 (읽기 / 쓰기, 0이면 제한 없음)
+        self.read_budget = (qps, burst, max_in_flight)
+        self.write_budget = (write_qps, write_burst, max_mutating_in_flight)
+        self.retries = retries
+        self.breaker = breaker or CircuitBreaker("kube")
+        self.transport = transport
+        self.auth = auth or KubeTokenAuth()
+        self.instrumented: Optional[InstrumentedTransport] = None
+        self.flow: Optional[FlowControlTransport] = None
+        self.resilient: Optional[ResilientTransport] = None
+        self._client: httpx.AsyncClient | None = None
+
+    def _verify(self) -> ssl.SSLContext | bool:
+        # 클러스터 CA가 마운트되어 있으면 그 CA로 검증
+        if self.ca_cert_path and os.path.exists(self.ca_cert_path):
+            return ssl.create_default_context(cafile=self.ca_cert_path)
+        # CA가 없으면 명시적으로 허용한 경우(로컬 개발)에만 검증 생략, 아니면 시스템 CA로 검증
+        if self.insecure_skip_verify:
+            logger.warning("KubeAPI CA 파일(%s)이 없어 TLS 검증을 생략합니다. (K8S_INSECURE_SKIP_VERIFY)", self.ca_cert_path)
+            return False
+        logger.warning("KubeAPI CA 파일(%s)이 없어 시스템 CA로 TLS를 검증합니다.", self.ca_cert_path)
+        return True
+
+    async def start(self) -> httpx.AsyncClient:
+        if self._client is None:
+            # 호출 메트릭 기록을 위해 transport를 감싸므로 TLS / HTTP2 / 풀 설정은 transport에 지정
+            transport = self.transport or httpx.AsyncHTTPTransport(
+                verify=self._verify(),
+                http2=self.http2,
+                limits=self.limits,
+            )
+            self.instrumented = InstrumentedTransport(transport, KUBE_REQUEST_SECONDS, KUBE_REQUESTS, kube_request_labels, "kube")
+            # 흐름 제어를 바깥에 두어 호출 시간 메트릭에 대기 시간이 섞이지 않도록 함 (Informer WATCH 포함 모든 호출 공유)
+            self.flow = FlowControlTransport(
+                self.instrumented,
+                Budget("read", *self.read_budget),
+                Budget("write", *self.write_budget),
+            )
+            # 재시도는 흐름 제어 바깥에서 하여 재시도 호출도 QPS / 동시 처리 예산을 다시 받도록 함
+            self.resilient = ResilientTransport(self.flow, "kube", self.retries, IDEMPOTENT_METHODS, self.breaker)
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers=self.headers,
+                transport=self.resilient,
+                auth=self.auth,
+                event_hooks={"response": [_forget_reads_on_write]},
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("KubeClientPool이 시작되지 않았습니다.")
+        return self._client
+
+
+async def _forget_reads_on_write(response: httpx.Response):
+    # 쓰기 응답 이후의 목록 조회는 그 전에 시작된 조회에 합류하지 않음
+    if response.request.method != "GET":
+        kube_reads.forget()
+
+
+def get_kube_client(request: Request) -> httpx.AsyncClient:
+    # 라우터 의존성: lifespan에서 생성한 공유 클라이언트 반환
+    return request.app.state.kube_pool.client
+
+
+async def list_items(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict,
+    params: Optional[dict] = None,
+) -> List[dict]:
+    """KubeAPI 목록 조회 items
+
+    동시에 들어온 같은 조회(URL, 헤더, 쿼리)는 KubeAPI 호출 1회와 파싱 결과를 공유하므로
+    반환된 목록과 객체는 수정하지 않습니다. 200이 아니면 HTTPException (오류도 함께 공유)
+    """
+    key = (url, tuple(sorted(headers.items())), tuple(sorted(params.items())) if params else ())
+
+    async def fetch() -> List[dict]:
+        response = await client.get(url=url, params=params, headers=headers)
+        if response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail=f"Kubernetes API error: {response.text}")
+        return decode(response).get("items", [])
+
+    items, shared = await kube_reads.do(key, fetch)
+    observe_coalesced_read(kube_resource(httpx.URL(url).path), shared)
+    return items
+
+
+def _differs(patch, before, after) -> bool:
+    # merge patch 기준: dict는 키 단위로 합치고 그 외(목록 포함)는 통째로 교체
+    if isinstance(patch, dict) and isinstance(before, dict) and isinstance(after, dict):
+        return any(_differs(value, before.get(key), after.get(key)) for key, value in patch.items())
+    return before != after
+
+
+def _owned(manifest: dict) -> dict:
+    # manifest가 실제로 쓰는 필드 (apiVersion / kind / 이름 등 식별 필드 제외)
+    owned = {key: value for key, value in manifest.items() if key not in ("apiVersion", "kind", "metadata")}
+    metadata = {key: value for key, value in manifest.get("metadata", {}).items() if key in ("labels", "annotations")}
+    if metadata:
+        owned["metadata"] = metadata
+    return owned
+
+
+def _conflicts(manifest: dict, base: dict, current: dict) -> bool:
+    """manifest가 쓰는 필드 중 base(수정 기준 객체) 이후 다른 쓰기로 바뀐 필드가 있는지"""
+    return _differs(_owned(manifest), base, current)
+
+
+def _inverse(patch, before):
+    # merge patch 기준: before에 없던 키는 null(삭제), dict가 아닌 값은 before 값으로 교체
+    if isinstance(patch, dict) and isinstance(before, dict):
+        return {key: _inverse(value, before[key]) if key in before else None for key, value in patch.items()}
+    return before
+
+
+def revert_manifest(manifest: dict, previous: dict) -> dict:
+    """manifest가 쓴 필드만 previous(업데이트 이전 객체)의 값으로 되돌리는 merge patch"""
+    return _inverse(_owned(manifest), previous)
+
+
+async def patch_object(
+    client: httpx.AsyncClient,
+    url: str,
+    manifest: dict,
+    base: Optional[dict] = None,
+    retries: int = k8s.K8S_UPDATE_RETRIES,
+    strategy: str = k8s.K8S_UPDATE_STRATEGY,
+) -> httpx.Response:
+    """객체당 쓰기 1회로 업데이트 (merge patch 또는 server-side apply)
+
+    base(수정 기준 객체)를 주면 그 resourceVersion을 낙관적 동시성 제어 조건으로 함께 보냅니다.
+    409 충돌 시 최신 객체를 조회하여, 이 업데이트가 쓰는 필드를 다른 쓰기가 바꾸지 않았으면
+    최신 resourceVersion으로 최대 retries회 다시 적용하고, 바꿨으면 덮어쓰지 않고 409 응답을 반환합니다.
+    """
+    if strategy == "apply":
+        headers = k8s.API_HEADER_APPLY
+        params = {"fieldManager": k8s.K8S_FIELD_MANAGER, "force": "true"}
+    else:
+        headers = k8s.API_HEADER_UPDATE
+        params = {"fieldManager": k8s.K8S_FIELD_MANAGER}
+
+    resource_version = base["metadata"].get("resourceVersion") if base else None
+    for attempt in range(retries + 1):
+        body = manifest
+        if resource_version:
+            body = {**manifest, "metadata": {**manifest.get("metadata", {}), "resourceVersion": resource_version}}
+        response = await client.patch(url=url, params=params, headers=headers, content=orjson.dumps(body))
+        if response.status_code != 409 or not resource_version or attempt == retries:
+            return response
+
+        # 충돌: 최신 객체에서 이 업데이트가 쓰는 필드가 그대로면 최신 resourceVersion으로 다시 적용
+        current = await client.get(url=url, headers=k8s.API_HEADER)
+        if current.status_code != 200:
+            return response
+        latest = decode(current)
+        if _conflicts(manifest, base, latest):
+            logger.info("%s 업데이트 충돌: 다른 쓰기가 같은 필드를 변경함", url)
+            return response
+        resource_version = latest["metadata"]["resourceVersion"]
+    return response
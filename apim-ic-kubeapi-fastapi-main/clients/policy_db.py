@@ -0,0 +1,85 @@
+from monitoring.metrics import InstrumentedTransport, POLICY_DB_REQUEST_SECONDS, POLICY_DB_REQUESTS
+from clients.resilience import CircuitBreaker, ResilientTransport
+
+import setting.k8s as k8s
+
+from fastapi import Request
+
+from typing import Optional
+
+import httpx
+
+# 재시도해도 안전한 메서드
+IDEMPOTENT_METHODS = {"GET", "PUT", "DELETE"}
+
+
+class PolicyDBClient:
+    """IP 정책 DB(k8s.DB_URL_Policy) 비동기 게이트웨이
+
+    ip_allow / ip_deny 라우터가 공유하며, 이벤트 루프를 막지 않도록
+    커넥션 풀을 가진 httpx.AsyncClient로 호출합니다.
+    재시도와 차단기는 ResilientTransport가 처리하므로 DB 장애 시 요청이 타임아웃까지 쌓이지 않습니다.
+    """
+
+    def __init__(
+        self,
+        base_url: str = k8s.DB_URL_Policy,
+        timeout: float = k8s.DB_TIMEOUT,
+        retries: int = k8s.DB_RETRIES,
+        max_connections: int = k8s.DB_POOL_MAX_CONNECTIONS,
+        breaker: Optional[CircuitBreaker] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url
+        self.timeout = httpx.Timeout(timeout)
+        self.retries = retries
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.breaker = breaker or CircuitBreaker("db")
+        self.transport = transport
+        # 메트릭 resource 라벨: base_url 마지막 경로 (예: ipac)
+        self.resource = httpx.URL(base_url).path.rstrip("/").rsplit("/", 1)[-1] or "root"
+        self.instrumented: Optional[InstrumentedTransport] = None
+        self.resilient: Optional[ResilientTransport] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _labels(self, request: httpx.Request):
+        return request.method, self.resource
+
+    async def start(self):
+        if self._client is None:
+            transport = self.transport or httpx.AsyncHTTPTransport(limits=self.limits)
+            self.instrumented = InstrumentedTransport(transport, POLICY_DB_REQUEST_SECONDS, POLICY_DB_REQUESTS, self._labels, "db")
+            self.resilient = ResilientTransport(self.instrumented, "db", self.retries, IDEMPOTENT_METHODS, self.breaker)
+            self._client = httpx.AsyncClient(timeout=self.timeout, transport=self.resilient)
+        return self
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def request(self, method: str, policy_id: str = "", **kwargs) -> httpx.Response:
+        if self._client is None:
+            raise RuntimeError("PolicyDBClient가 시작되지 않았습니다.")
+
+        return await self._client.request(method, self.base_url + policy_id, **kwargs)
+
+    async def list(self) -> httpx.Response:
+        return await self.request("GET")
+
+    async def get(self, policy_id: str) -> httpx.Response:
+        return await self.request("GET", policy_id)
+
+    async def create(self, data: dict) -> httpx.Response:
+        return await self.request("POST", json=data)
+
+    async def update(self, policy_id: str, data: dict) -> httpx.Response:
+        return await self.request("PUT", policy_id, json=data)
+
+    async def delete(self, policy_id: str) -> httpx.Response:
+        return await self.request("DELETE", policy_id)
+
+
+def get_policy_db(request: Request) -> PolicyDBClient:
+    # 라우터 의존성: lifespan에서 생성한 공유 정책 DB 클라이언트 반환
+    return request.app.state.policy_db
@@ -0,0 +1,237 @@
+import setting.k8s as k8s
+from monitoring.metrics import CIRCUIT_REJECTED, CIRCUIT_STATE, observe_retry
+from monitoring.timing import current
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Collection, Optional, Tuple
+
+import math
+import time
+import random
+import asyncio
+import logging
+import httpx
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# 재시도 대상 상태 코드 (429는 메서드와 관계없이 재시도: 서버가 처리하지 않고 거절한 요청)
+RETRY_STATUS = frozenset({429, 502, 503, 504})
+
+# 차단기 실패로 보는 상태 코드 (4xx와 500은 요청 자체의 오류로 보고 제외)
+FAILURE_STATUS = frozenset({502, 503, 504})
+
+# 요청이 서버에 전달되지 않은 것이 확실한 오류 (쓰기 요청도 재시도 가능)
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class CircuitOpenError(httpx.TransportError):
+    """차단기가 열려 호출하지 않고 바로 실패 처리"""
+
+    def __init__(self, target: str, retry_after: float, request: httpx.Request):
+        super().__init__(f"{target} circuit breaker open", request=request)
+        self.target = target
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """외부 의존성별 차단기 (closed -> open -> half_open)
+
+    연속 failures회 실패하면 reset_timeout초 동안 호출하지 않고 바로 실패 처리하며,
+    이후 요청 1개만 시험 호출하여 성공하면 닫고 실패하면 다시 엽니다. failures가 0 이하면 사용하지 않습니다.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+    _STATE_VALUE = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(
+        self,
+        target: str,
+        failures: int = k8s.BREAKER_FAILURES,
+        reset_timeout: float = k8s.BREAKER_RESET_TIMEOUT,
+    ):
+        self.target = target
+        self.threshold = failures
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._gauge = CIRCUIT_STATE.labels(target)
+        self._gauge.set(0)
+
+    def _set(self, state: str):
+        if state != self.state:
+            logger.warning("%s 차단기 %s -> %s (연속 실패 %d회)", self.target, self.state, state, self.failures)
+            self.state = state
+            self._gauge.set(self._STATE_VALUE[state])
+
+    def allow(self) -> Optional[float]:
+        """호출 가능하면 None, 아니면 다시 시도할 수 있을 때까지 남은 시간(초)"""
+        if self.threshold <= 0 or self.state == self.CLOSED:
+            return None
+        if self.state == self.OPEN:
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                return remaining
+            self._set(self.HALF_OPEN)
+        # half_open: 시험 호출 1개만 허용
+        if self._probing:
+            return 1.0
+        self._probing = True
+        return None
+
+    def record(self, ok: Optional[bool]):
+        """호출 결과 기록 (None: 의존성 상태와 무관한 결과, 예: 429 / 취소)"""
+        self._probing = False
+        if ok is None or self.threshold <= 0:
+            return
+        if ok:
+            self.failures = 0
+            self._set(self.CLOSED)
+            return
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+            self._opened_at = time.monotonic()
+            self._set(self.OPEN)
+
+
+def retry_after(response: httpx.Response) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP-date)를 초로 변환, 없거나 해석할 수 없으면 None"""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """외부 호출 재시도 + 차단기 transport
+
+    멱등 메서드는 일시적 오류(429 / 502 / 503 / 504, 연결 / 타임아웃 오류)를 최대 retries회 재시도하고,
+    그 외 메서드는 서버가 처리하지 않은 것이 확실한 경우(429, 연결 실패)만 재시도합니다.
+    대기 시간은 Retry-After가 있으면 그 값을, 없으면 full jitter 지수 백오프를 사용하며
+    Server-Timing의 {target}-retry 구간과 apim_outbound_retries에 기록합니다.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        target: str,
+        retries: int,
+        idempotent_methods: Collection[str],
+        breaker: Optional[CircuitBreaker] = None,
+        backoff: float = k8s.RETRY_BACKOFF,
+        max_backoff: float = k8s.RETRY_MAX_BACKOFF,
+        max_retry_after: float = k8s.RETRY_AFTER_MAX,
+    ):
+        self.transport = transport
+        self.target = target
+        self.retries = retries
+        self.idempotent_methods = frozenset(idempotent_methods)
+        self.breaker = breaker or CircuitBreaker(target)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self._rejected = CIRCUIT_REJECTED.labels(target)
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # WATCH는 재시도하지 않음 (Informer가 자체 백오프로 다시 연결)
+        watch = b"watch=" in request.url.query
+        idempotent = request.method in self.idempotent_methods and not watch
+        retries = 0 if watch else self.retries
+        attempt = 0
+        while True:
+            remaining = self.breaker.allow()
+            if remaining is not None:
+                self._rejected.inc()
+                raise CircuitOpenError(self.target, remaining, request)
+
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                self.breaker.record(False)
+                if attempt >= retries or not (idempotent or isinstance(e, NOT_SENT_ERRORS)):
+                    raise
+                reason = type(e).__name__
+                delay = self._backoff(attempt)
+            except BaseException:
+                self.breaker.record(None)
+                raise
+            else:
+                status = response.status_code
+                self.breaker.record(None if status == 429 else status not in FAILURE_STATUS)
+                if status not in RETRY_STATUS or attempt >= retries or not (idempotent or status == 429):
+                    return response
+                delay = retry_after(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                elif delay > self.max_retry_after:
+                    # 오래 기다려야 하면 재시도하지 않고 응답을 그대로 반환
+                    return response
+                else:
+                    # 같은 Retry-After를 받은 요청이 동시에 몰리지 않도록 약간의 jitter 추가
+                    delay += random.uniform(0, self.backoff)
+                await response.aclose()
+                reason = str(status)
+
+            attempt += 1
+            logger.info("%s %s %s 재시도 %d/%d (%s, %.3fs 후)", self.target, request.method, request.url.path, attempt, retries, reason, delay)
+            observe_retry(self.target, reason)
+            timing = current()
+            if timing is not None:
+                timing.add(f"{self.target}-retry", delay)
+            await asyncio.sleep(delay)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+# ---- 예외 처리기 (main.py에서 등록) ----
+
+def error_status(exc: Exception) -> Tuple[int, str]:
+    """외부 호출 예외 -> (상태 코드, 메시지), 예외 처리기와 일괄 작업의 항목별 결과가 공유"""
+    if isinstance(exc, CircuitOpenError):
+        return 503, f"{exc.target} 일시적으로 사용할 수 없습니다. (차단기 열림)"
+    if isinstance(exc, httpx.TimeoutException):
+        return 504, f"외부 호출 시간 초과: {type(exc).__name__}"
+    if isinstance(exc, httpx.TransportError):
+        return 502, f"외부 호출 실패: {type(exc).__name__}"
+    if isinstance(exc, orjson.JSONDecodeError):
+        # 게이트웨이 / 프록시가 반환한 JSON이 아닌 오류 본문 등
+        return 502, "외부 응답을 해석할 수 없습니다."
+    return 500, f"처리 중 오류: {type(exc).__name__}"
+
+
+def _error(exc: Exception, headers: Optional[dict] = None) -> JSONResponse:
+    status_code, detail = error_status(exc)
+    return JSONResponse(status_code=status_code, content={"detail": detail}, headers=headers)
+
+
+async def circuit_open_handler(request: Request, exc: CircuitOpenError) -> JSONResponse:
+    return _error(exc, {"Retry-After": str(math.ceil(exc.retry_after))})
+
+
+async def timeout_handler(request: Request, exc: httpx.TimeoutException) -> JSONResponse:
+    return _error(exc)
+
+
+async def transport_error_handler(request: Request, exc: httpx.TransportError) -> JSONResponse:
+    return _error(exc)
+
+
+async def decode_error_handler(request: Request, exc: orjson.JSONDecodeError) -> JSONResponse:
+    return _error(exc)
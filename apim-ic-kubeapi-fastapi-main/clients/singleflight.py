@@ -0,0 +1,40 @@
+from typing import Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+import asyncio
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 호출을 1회로 합치고 결과(예외 포함)를 공유 (Go singleflight 방식)
+
+    호출은 별도 태스크로 실행하므로 먼저 호출한 요청이 취소되어도 나머지 요청은 결과를 받습니다.
+    forget() 이후의 호출은 그 이전에 시작된 호출에 합류하지 않습니다. (쓰기 직후 조회가 쓰기 이전 결과를 받지 않도록)
+    결과 객체는 호출한 모든 요청이 공유하므로 수정하면 안 됩니다.
+    """
+
+    def __init__(self):
+        self.epoch = 0
+        self._calls: Dict[Tuple[int, Hashable], asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def forget(self):
+        self.epoch += 1
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """(결과, 진행 중인 호출 결과를 공유했는지 여부)"""
+        key = (self.epoch, key)
+        task = self._calls.get(key)
+        shared = task is not None
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._done(key, done))
+        return await asyncio.shield(task), shared
+
+    def _done(self, key: Tuple[int, Hashable], task: asyncio.Task):
+        self._calls.pop(key, None)
+        # 기다리던 요청이 모두 취소된 경우에도 예외 미확인 경고가 남지 않도록 확인
+        if not task.cancelled():
+            task.exception()
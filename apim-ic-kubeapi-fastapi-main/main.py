@@ -1,16 +1,63 @@
+import setting.k8s as k8s
 from routers.router import router
+from clients.kube import KubeClientPool
+from clients.policy_db import PolicyDBClient
+from clients.resilience import CircuitOpenError, circuit_open_handler, decode_error_handler, timeout_handler, transport_error_handler
+from cache.kube_cache import build_informers
+from monitoring.metrics import MetricsMiddleware
+from monitoring.timing import TimingMiddleware
+from monitoring.profiler import ProfilerMiddleware
+from monitoring.loop import LoopMonitor
+from monitoring.tracing import TracingMiddleware
+import monitoring.tracing as tracing
+from utils.compression import CompressionMiddleware
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 
 import uvicorn
+import httpx
+import orjson
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 트레이싱 (TRACE_EXPORTER 미설정 시 None, no-op tracer 유지)
+    app.state.tracer_provider = tracing.configure()
+
+    # KubeAPI 클라이언트 풀은 프로세스당 한 번 생성하고 종료 시 정리
+    app.state.kube_pool = KubeClientPool()
+    client = await app.state.kube_pool.start()
+    app.state.policy_db = await PolicyDBClient().start()
+
+    # Informer 캐시는 백그라운드에서 동기화 (완료 전까지 /readyz는 503)
+    app.state.informers = build_informers()
+    for informer in app.state.informers.values():
+        informer.start(client)
+
+    # 이벤트 루프 지연 측정 및 루프를 막는 코드의 스택 로그
+    app.state.loop_monitor = LoopMonitor() if k8s.LOOP_MONITOR else None
+    if app.state.loop_monitor is not None:
+        app.state.loop_monitor.start()
+    try:
+        yield
+    finally:
+        if app.state.loop_monitor is not None:
+            await app.state.loop_monitor.stop()
+        for informer in app.state.informers.values():
+            await informer.stop()
+        await app.state.policy_db.close()
+        await app.state.kube_pool.close()
+        # 남은 span을 exporter로 전송한 뒤 종료
+        tracing.shutdown(app.state.tracer_provider)
+
 
 app = FastAPI(
     title="NGINX APIM with FastAPI",
     description="FastAPI 기반 KubeAPI Policy, Secret, Config 구성",
     version="0.1.0",
+    lifespan=lifespan,
     openapi_tags=[
         {"name": "IPDeny", "description": "IPDeny Policy KubeAPI 구성"},
         {"name": "IPAllow", "description": "IPAllow Policy KubeAPI 구성"},
@@ -18,7 +65,10 @@ app = FastAPI(
         {"name": "Upstreams", "description": "API G/W Upstreams(k8s service) KubeAPI 구성"},
         {"name": "Routes", "description": "API G/W Routes 구성"},
         {"name": "Servers", "description": "API G/W Servers(k8s virtualserver) KubeAPI 구성"},
-        {"name": "Certs", "description": "API G/W Certs(k8s tls-secret) KubeAPI 구성"}
+        {"name": "Certs", "description": "API G/W Certs(k8s tls-secret) KubeAPI 구성"},
+        {"name": "Health", "description": "프로세스 상태 및 캐시 동기화 확인"},
+        {"name": "Monitoring", "description": "Prometheus 메트릭"},
+        {"name": "Admin", "description": "관리자 전용 진단 기능 (ADMIN_TOKEN 설정 시)"}
     ]
 )
 
@@ -30,6 +80,31 @@ app.add_middleware(
     allow_headers=["*"],  
 )
 
+# 응답 압축 (COMPRESSION=false면 미사용), Server-Timing / 프로파일에 압축 시간이 포함되도록 안쪽에 등록
+if k8s.COMPRESSION:
+    app.add_middleware(CompressionMiddleware)
+
+# 관리자 요청 프로파일링 (ADMIN_TOKEN 미설정 시 등록하지 않아 비용 없음)
+if k8s.ADMIN_TOKEN:
+    app.add_middleware(ProfilerMiddleware)
+
+# 응답 Server-Timing 헤더 (SERVER_TIMING=false면 미사용)
+if k8s.SERVER_TIMING:
+    app.add_middleware(TimingMiddleware)
+
+# 요청 span 생성 및 traceparent 전달 (TRACE_EXPORTER 미설정 시 등록하지 않음)
+if k8s.TRACE_EXPORTER:
+    app.add_middleware(TracingMiddleware)
+
+# 가장 바깥 미들웨어로 두어 CORS 처리까지 포함한 요청 시간을 기록
+app.add_middleware(MetricsMiddleware)
+
+# 외부 호출 실패는 500 대신 502 / 503(차단기 열림, Retry-After) / 504로 응답
+app.add_exception_handler(CircuitOpenError, circuit_open_handler)
+app.add_exception_handler(httpx.TimeoutException, timeout_handler)
+app.add_exception_handler(httpx.TransportError, transport_error_handler)
+app.add_exception_handler(orjson.JSONDecodeError, decode_error_handler)
+
 # Keycloak 라우터 추가
 app.include_router(router)
 
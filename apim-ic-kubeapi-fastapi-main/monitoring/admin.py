@@ -0,0 +1,34 @@
+"""관리자 전용 기능(프로파일링 등) 인증
+
+ADMIN_TOKEN이 비어 있으면 관리자 기능 전체가 비활성화되며, 요청은 X-Admin-Token 헤더로 토큰을 전달합니다.
+"""
+import setting.k8s as k8s
+
+from fastapi import HTTPException, Request
+
+from typing import Iterable, Optional, Tuple
+
+import hmac
+
+ADMIN_HEADER = "x-admin-token"
+
+
+def is_admin_token(value: Optional[str], token: str = k8s.ADMIN_TOKEN) -> bool:
+    # 토큰 미설정 시 항상 거부, 비교는 상수 시간
+    return bool(token) and value is not None and hmac.compare_digest(value.encode(), token.encode())
+
+
+def header_value(headers: Iterable[Tuple[bytes, bytes]], name: bytes) -> Optional[str]:
+    # ASGI scope 헤더 목록에서 값 조회 (이름은 소문자)
+    for key, value in headers:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def require_admin(request: Request):
+    # 라우터 의존성: 관리자 토큰이 없거나 틀리면 거부 (기능 미설정 시 404로 존재를 숨김)
+    if not k8s.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not is_admin_token(request.headers.get(ADMIN_HEADER)):
+        raise HTTPException(status_code=403, detail="admin token required")
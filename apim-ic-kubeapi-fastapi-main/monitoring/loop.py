@@ -0,0 +1,87 @@
+"""이벤트 루프 지연 측정 및 루프 점유(블로킹) 감지
+
+- heartbeat 태스크: interval마다 깨어나 예정 시각 대비 지연을 apim_event_loop_lag_seconds에 기록
+- watchdog 스레드: heartbeat가 interval + threshold 이상 갱신되지 않으면 그 시점에 루프 스레드가 실행 중인
+  스택을 경고 로그로 남기고 apim_event_loop_blocked_total을 증가 (멈춤 1회당 1번)
+
+스택은 루프를 점유하고 있는 동안 수집하므로 동기 I/O, 무거운 모델 생성 등 원인 코드가 그대로 보입니다.
+"""
+import setting.k8s as k8s
+from monitoring.metrics import EVENT_LOOP_BLOCKED, EVENT_LOOP_LAG_SECONDS
+
+from typing import Optional
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+logger = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    def __init__(self, interval: float = k8s.LOOP_LAG_INTERVAL, threshold: float = k8s.LOOP_BLOCK_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self.max_lag = 0.0
+        self.blocked = 0
+        self._beat = time.monotonic()
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> asyncio.Task:
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="apim-loop-watchdog", daemon=True)
+        self._watchdog.start()
+        return self._task
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    async def _heartbeat(self):
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(now - start - self.interval, 0.0)
+            self._beat = now
+            self.max_lag = max(self.max_lag, lag)
+            EVENT_LOOP_LAG_SECONDS.observe(lag)
+
+    def _watch(self):
+        # 멈춤 판정 기준 시각(beat)마다 한 번만 보고
+        reported = None
+        while not self._stop.wait(min(self.interval, self.threshold) / 2):
+            beat = self._beat
+            stalled = time.monotonic() - beat - self.interval
+            if stalled < self.threshold or beat == reported:
+                continue
+            reported = beat
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            self.blocked += 1
+            EVENT_LOOP_BLOCKED.inc()
+            logger.warning(
+                "이벤트 루프가 %.0fms 이상 멈춤 (기준 %.0fms), 실행 중인 코드:\n%s",
+                stalled * 1000,
+                self.threshold * 1000,
+                "".join(traceback.format_stack(frame)),
+            )
@@ -0,0 +1,165 @@
+"""tracemalloc 스냅샷 / 비교 (관리자 API용)
+
+할당 위치는 트레이스백에서 가장 안쪽의 애플리케이션 프레임(apis.*, cache.*, clients.* ...)으로 귀속합니다.
+monitoring.*(decode 등 계측 래퍼)는 건너뛰고 호출한 쪽으로 넘기며, 애플리케이션 프레임이 없으면
+가장 안쪽 프레임의 라이브러리(httpx, asyncio ...)로 묶습니다.
+"""
+import setting.k8s as k8s
+
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Literal, Tuple
+
+import datetime
+import os
+import sysconfig
+import tracemalloc
+
+GroupBy = Literal["module", "file", "line"]
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_LIB_ROOTS = sorted({os.path.abspath(path) for path in sysconfig.get_paths().values() if path}, key=len, reverse=True)
+# 할당을 호출한 쪽으로 넘기는 계측 모듈
+_PASS_THROUGH = ("monitoring.",)
+_EXCLUDE = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+@lru_cache(maxsize=4096)
+def _source(filename: str) -> Tuple[str, str, bool]:
+    """파일 경로 -> (모듈 이름, 표시용 경로, 애플리케이션 코드 여부)"""
+    path = os.path.abspath(filename)
+    if path.startswith(APP_ROOT + os.sep) and "site-packages" not in path:
+        relative = os.path.relpath(path, APP_ROOT)
+        return os.path.splitext(relative)[0].replace(os.sep, "."), relative, True
+    for root in _LIB_ROOTS:
+        if path.startswith(root + os.sep):
+            relative = os.path.relpath(path, root)
+            # 라이브러리는 최상위 패키지 단위 (httpx, pydantic, asyncio ...)
+            top = relative.split(os.sep, 1)[0]
+            return os.path.splitext(top)[0], relative, False
+    return filename, filename, False
+
+
+def _attribute(traceback: tracemalloc.Traceback) -> Tuple[str, str, int]:
+    frames = list(traceback)
+    fallback = None
+    # 가장 안쪽(최근) 프레임부터 검사
+    for frame in reversed(frames):
+        module, display, is_app = _source(frame.filename)
+        if fallback is None:
+            fallback = (module, display, frame.lineno)
+        if is_app and not module.startswith(_PASS_THROUGH):
+            return module, display, frame.lineno
+    return fallback or ("<unknown>", "<unknown>", 0)
+
+
+def _key(traceback: tracemalloc.Traceback, group: GroupBy) -> str:
+    module, display, lineno = _attribute(traceback)
+    if group == "module":
+        return module
+    if group == "file":
+        return display
+    return f"{display}:{lineno}"
+
+
+def _kib(size: int) -> float:
+    return round(size / 1024, 1)
+
+
+class MemoryTracker:
+    """tracemalloc 시작 / 중지와 이름 붙은 스냅샷 보관 (최대 keep개, 오래된 것부터 삭제)"""
+
+    def __init__(self, keep: int = k8s.MEMORY_SNAPSHOT_KEEP):
+        self.keep = keep
+        self.snapshots: "OrderedDict[str, Tuple[str, tracemalloc.Snapshot]]" = OrderedDict()
+
+    def status(self) -> dict:
+        traced, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "frames": tracemalloc.get_traceback_limit(),
+            "traced_kib": _kib(traced),
+            "peak_kib": _kib(peak),
+            "snapshots": [
+                {"name": name, "taken_at": taken_at, "total_kib": _kib(sum(stat.size for stat in snapshot.statistics("filename")))}
+                for name, (taken_at, snapshot) in self.snapshots.items()
+            ],
+        }
+
+    def start(self, frames: int = k8s.MEMORY_TRACE_FRAMES) -> dict:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        return self.status()
+
+    def stop(self) -> dict:
+        tracemalloc.stop()
+        self.snapshots.clear()
+        return self.status()
+
+    def take(self, name: str) -> dict:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc이 시작되지 않았습니다.")
+        snapshot = tracemalloc.take_snapshot().filter_traces(_EXCLUDE)
+        self.snapshots.pop(name, None)
+        self.snapshots[name] = (datetime.datetime.now(datetime.timezone.utc).isoformat(), snapshot)
+        while len(self.snapshots) > self.keep:
+            self.snapshots.popitem(last=False)
+        return self.top(name, "module", 10)
+
+    def delete(self, name: str) -> bool:
+        return self.snapshots.pop(name, None) is not None
+
+    def _get(self, name: str) -> Tuple[str, tracemalloc.Snapshot]:
+        if name not in self.snapshots:
+            raise KeyError(name)
+        return self.snapshots[name]
+
+    def top(self, name: str, group: GroupBy = "module", limit: int = 20) -> dict:
+        taken_at, snapshot = self._get(name)
+        sizes: Dict[str, List[int]] = {}
+        for stat in snapshot.statistics("traceback"):
+            entry = sizes.setdefault(_key(stat.traceback, group), [0, 0])
+            entry[0] += stat.size
+            entry[1] += stat.count
+        ordered = sorted(sizes.items(), key=lambda item: item[1][0], reverse=True)
+        return {
+            "name": name,
+            "taken_at": taken_at,
+            "group": group,
+            "total_kib": _kib(sum(size for size, _ in sizes.values())),
+            "data": [{group: key, "size_kib": _kib(size), "count": count} for key, (size, count) in ordered[:limit]],
+        }
+
+    def diff(self, base: str, target: str, group: GroupBy = "module", limit: int = 20) -> dict:
+        _, base_snapshot = self._get(base)
+        _, target_snapshot = self._get(target)
+        changes: Dict[str, List[int]] = {}
+        for stat in target_snapshot.compare_to(base_snapshot, "traceback"):
+            entry = changes.setdefault(_key(stat.traceback, group), [0, 0, 0])
+            entry[0] += stat.size_diff
+            entry[1] += stat.count_diff
+            entry[2] += stat.size
+        ordered = sorted(
+            ((key, values) for key, values in changes.items() if values[0] or values[1]),
+            key=lambda item: abs(item[1][0]),
+            reverse=True,
+        )
+        return {
+            "base": base,
+            "target": target,
+            "group": group,
+            "size_diff_kib": _kib(sum(size_diff for size_diff, _, _ in changes.values())),
+            "data": [
+                {group: key, "size_diff_kib": _kib(size_diff), "count_diff": count_diff, "size_kib": _kib(size)}
+                for key, (size_diff, count_diff, size) in ordered[:limit]
+            ],
+        }
+
+
+# tracemalloc은 프로세스 전역이므로 추적 상태와 스냅샷도 하나만 유지
+tracker = MemoryTracker()
@@ -0,0 +1,308 @@
+"""Prometheus 메트릭 (요청 지연, KubeAPI / 정책 DB 호출, 커넥션 풀 / 캐시 상태)
+
+기록 경로는 요청당 perf_counter 2회와 라벨별로 캐시한 Histogram child의 observe뿐이며,
+게이지(풀 사용량, 캐시 크기)는 /metrics 조회 시점에만 계산합니다.
+"""
+from monitoring.timing import CountingStream, current
+from monitoring.tracing import child_span, inject
+
+from opentelemetry.trace import SpanKind, StatusCode
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+
+from typing import Callable, Dict, Optional, Tuple
+
+import re
+import time
+import httpx
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "apim_http_request_duration_seconds",
+    "API 요청 처리 시간 (라우터 태그별)",
+    ["tag", "method", "code"],
+)
+HTTP_COMPRESSION_BYTES = Counter(
+    "apim_http_compression_bytes",
+    "압축한 응답 본문 바이트 수 (stage: raw 압축 전 / sent 압축 후)",
+    ["encoding", "stage"],
+)
+HTTP_COMPRESSION_SECONDS = Counter(
+    "apim_http_compression_seconds",
+    "응답 압축에 사용한 시간 합계",
+    ["encoding"],
+)
+KUBE_REQUEST_SECONDS = Histogram(
+    "apim_kube_request_duration_seconds",
+    "KubeAPI 호출 시간 (응답 헤더 수신까지, WATCH는 연결 수립까지)",
+    ["verb", "resource", "code"],
+)
+KUBE_REQUESTS = Counter(
+    "apim_kube_requests",
+    "KubeAPI 호출 수",
+    ["verb", "resource", "code"],
+)
+POLICY_DB_REQUEST_SECONDS = Histogram(
+    "apim_policy_db_request_duration_seconds",
+    "정책 DB 호출 시간 (응답 헤더 수신까지)",
+    ["verb", "resource", "code"],
+)
+POLICY_DB_REQUESTS = Counter(
+    "apim_policy_db_requests",
+    "정책 DB 호출 수",
+    ["verb", "resource", "code"],
+)
+KUBE_COALESCED_READS = Counter(
+    "apim_kube_coalesced_reads",
+    "KubeAPI 목록 조회 병합 결과 (executed: 직접 호출, shared: 진행 중인 같은 조회의 결과 공유)",
+    ["resource", "result"],
+)
+KUBE_FLOW_WAIT_SECONDS = Histogram(
+    "apim_kube_flow_wait_seconds",
+    "KubeAPI 흐름 제어 대기 시간 (QPS 토큰 + 동시 처리 슬롯, 제한에 걸리지 않으면 0)",
+    ["budget"],
+    buckets=(0.0, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+KUBE_FLOW_REQUESTS = Gauge(
+    "apim_kube_flow_requests",
+    "KubeAPI 흐름 제어 상태별 요청 수 (in_flight: 처리 중, waiting: 대기 중, max_in_flight: 동시 처리 한도)",
+    ["budget", "state"],
+)
+OUTBOUND_RETRIES = Counter(
+    "apim_outbound_retries",
+    "외부 호출 재시도 수 (reason: 재시도한 상태 코드 또는 오류 종류)",
+    ["target", "reason"],
+)
+CIRCUIT_STATE = Gauge(
+    "apim_circuit_breaker_state",
+    "외부 호출 차단기 상태 (0: closed, 1: half_open, 2: open)",
+    ["target"],
+)
+CIRCUIT_REJECTED = Counter(
+    "apim_circuit_breaker_rejected",
+    "차단기가 열려 호출하지 않고 바로 실패 처리한 요청 수",
+    ["target"],
+)
+POOL_CONNECTIONS = Gauge(
+    "apim_http_pool_connections",
+    "외부 호출용 커넥션 풀 연결 수 (state: active / idle)",
+    ["client", "state"],
+)
+POOL_MAX_CONNECTIONS = Gauge(
+    "apim_http_pool_max_connections",
+    "외부 호출용 커넥션 풀 최대 연결 수",
+    ["client"],
+)
+POOL_WAITING = Gauge(
+    "apim_http_pool_waiting_requests",
+    "연결을 할당받지 못하고 대기 중인 요청 수",
+    ["client"],
+)
+CACHE_OBJECTS = Gauge(
+    "apim_cache_objects",
+    "Informer 캐시 객체 수",
+    ["cache"],
+)
+CACHE_READY = Gauge(
+    "apim_cache_ready",
+    "Informer 캐시 초기 동기화 완료 여부",
+    ["cache"],
+)
+
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "apim_event_loop_lag_seconds",
+    "이벤트 루프 스케줄링 지연 (예정 시각 대비 heartbeat 실행 지연)",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+EVENT_LOOP_BLOCKED = Counter(
+    "apim_event_loop_blocked",
+    "콜백 하나가 LOOP_BLOCK_THRESHOLD 이상 이벤트 루프를 점유한 횟수",
+)
+
+UNMATCHED = "unmatched"
+
+# 라벨 조합별 child 캐시 (labels() 호출의 락/튜플 변환 비용 회피)
+_children: Dict[Tuple, object] = {}
+
+
+def _child(metric, *labels):
+    key = (metric, labels)
+    child = _children.get(key)
+    if child is None:
+        child = _children[key] = metric.labels(*labels)
+    return child
+
+
+def observe_request(tag: str, method: str, status: int, seconds: float):
+    _child(HTTP_REQUEST_SECONDS, tag, method, str(status)).observe(seconds)
+
+
+def observe_compression(encoding: str, raw: int, sent: int, seconds: float):
+    _child(HTTP_COMPRESSION_BYTES, encoding, "raw").inc(raw)
+    _child(HTTP_COMPRESSION_BYTES, encoding, "sent").inc(sent)
+    _child(HTTP_COMPRESSION_SECONDS, encoding).inc(seconds)
+
+
+class MetricsMiddleware:
+    """요청 처리 시간을 라우터 태그(Upstreams, Servers, Certs, IPAllow, IPDeny ...)별로 기록하는 ASGI 미들웨어
+
+    BaseHTTPMiddleware 대신 순수 ASGI로 구현하여 요청당 오버헤드를 최소화합니다.
+    시간은 응답 본문 전송(스트리밍 포함)이 끝날 때까지 측정합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            # 라우팅이 끝나면 FastAPI가 scope["route"]에 매칭된 APIRoute를 넣어 둠
+            route = scope.get("route")
+            tags = getattr(route, "tags", None)
+            observe_request(tags[0] if tags else UNMATCHED, scope["method"], status, time.perf_counter() - start)
+
+
+# ---- 외부 호출 ----
+
+_KUBE_PATH = re.compile(r"^/(?:api/v1|apis/[^/]+/[^/]+)(?:/namespaces/[^/]+)?/(?P<resource>[^/]+)(?:/(?P<name>[^/]+))?")
+_KUBE_VERBS = {"POST": "CREATE", "PUT": "UPDATE", "PATCH": "PATCH", "DELETE": "DELETE"}
+
+
+def kube_resource(path: str) -> str:
+    match = _KUBE_PATH.match(path)
+    return match.group("resource") if match else "other"
+
+
+def observe_retry(target: str, reason: str):
+    _child(OUTBOUND_RETRIES, target, reason).inc()
+
+
+def observe_coalesced_read(resource: str, shared: bool):
+    _child(KUBE_COALESCED_READS, resource, "shared" if shared else "executed").inc()
+
+
+def kube_request_labels(request: httpx.Request) -> Tuple[str, str]:
+    # KubeAPI 감사 로그와 같은 verb 구분 (GET 목록은 LIST, watch=true는 WATCH)
+    match = _KUBE_PATH.match(request.url.path)
+    resource = match.group("resource") if match else "other"
+    if request.method == "GET":
+        if match is None or match.group("name") is None:
+            verb = "WATCH" if b"watch=" in request.url.query else "LIST"
+        else:
+            verb = "GET"
+    else:
+        verb = _KUBE_VERBS.get(request.method, request.method)
+    return verb, resource
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """httpx transport 래퍼: 호출마다 (verb, resource, code) 라벨로 시간과 횟수를 기록
+
+    API 요청 처리 중의 호출이면 요청 타이밍(Server-Timing)의 target 구간에도 시간 / 횟수 / 수신 바이트를 누적합니다.
+    샘플링된 요청 안의 호출은 CLIENT span(응답 헤더 수신까지)을 만들고 traceparent 헤더를 함께 보냅니다.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        histogram: Histogram,
+        counter: Counter,
+        labels: Callable[[httpx.Request], Tuple[str, str]],
+        target: str,
+    ):
+        self.transport = transport
+        self.histogram = histogram
+        self.counter = counter
+        self.labels = labels
+        self.target = target
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        verb, resource = self.labels(request)
+        with child_span(
+            f"{self.target} {verb} {resource}",
+            kind=SpanKind.CLIENT,
+            attributes={"http.request.method": request.method, "url.path": request.url.path, "server.address": request.url.host},
+        ) as span:
+            if span is not None:
+                inject(request.headers)
+            start = time.perf_counter()
+            code = "error"
+            timing = current()
+            try:
+                response = await self.transport.handle_async_request(request)
+                code = str(response.status_code)
+                if timing is not None:
+                    try:
+                        # 본문이 이미 읽힌 응답(MockTransport 등)은 바로 집계
+                        timing.add_bytes(self.target, len(response.content))
+                    except httpx.ResponseNotRead:
+                        response.stream = CountingStream(response.stream, timing, self.target)
+                if span is not None:
+                    span.set_attribute("http.response.status_code", response.status_code)
+                    if response.status_code >= 500:
+                        span.set_status(StatusCode.ERROR)
+                return response
+            finally:
+                seconds = time.perf_counter() - start
+                _child(self.histogram, verb, resource, code).observe(seconds)
+                _child(self.counter, verb, resource, code).inc()
+                if timing is not None:
+                    timing.record_call(self.target, verb, resource, code, seconds)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+    def pool_stats(self) -> Optional[dict]:
+        # httpx.AsyncHTTPTransport의 httpcore 풀 상태 (MockTransport 등은 None)
+        pool = getattr(self.transport, "_pool", None)
+        if pool is None:
+            return None
+        connections = list(pool.connections)
+        idle = sum(1 for connection in connections if connection.is_idle())
+        waiting = sum(1 for pool_request in getattr(pool, "_requests", []) if pool_request.is_queued())
+        return {
+            "active": len(connections) - idle,
+            "idle": idle,
+            "max": pool._max_connections,
+            "waiting": waiting,
+        }
+
+
+# ---- /metrics ----
+
+def _update_pool(client: str, transport: Optional[InstrumentedTransport]):
+    stats = transport.pool_stats() if transport is not None else None
+    if stats is None:
+        return
+    POOL_CONNECTIONS.labels(client, "active").set(stats["active"])
+    POOL_CONNECTIONS.labels(client, "idle").set(stats["idle"])
+    POOL_MAX_CONNECTIONS.labels(client).set(stats["max"] or 0)
+    POOL_WAITING.labels(client).set(stats["waiting"])
+
+
+def render(state) -> Tuple[bytes, str]:
+    """조회 시점의 풀 / 캐시 게이지를 갱신하고 Prometheus 텍스트 형식으로 반환"""
+    kube_pool = getattr(state, "kube_pool", None)
+    policy_db = getattr(state, "policy_db", None)
+    _update_pool("kube", getattr(kube_pool, "instrumented", None))
+    _update_pool("policy_db", getattr(policy_db, "instrumented", None))
+    flow = getattr(kube_pool, "flow", None)
+    if flow is not None:
+        for budget, stats in flow.stats().items():
+            for phase, value in stats.items():
+                KUBE_FLOW_REQUESTS.labels(budget, phase).set(value)
+    for name, informer in getattr(state, "informers", {}).items():
+        CACHE_OBJECTS.labels(name).set(len(informer))
+        CACHE_READY.labels(name).set(1 if informer.ready else 0)
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,174 @@
+"""관리자 전용 요청 단위 CPU 프로파일러
+
+X-Profile 헤더와 관리자 토큰(X-Admin-Token)을 함께 보낸 요청 1건을 프로파일링하여 PROFILE_DIR에 저장하고,
+응답 헤더 X-Profile-Id로 파일 이름을 알려 줍니다. (GET /admin/profiles/{id}로 다운로드)
+
+    X-Profile: sample   : 이벤트 루프 스레드 스택 샘플링 -> .folded (flamegraph.pl, inferno, speedscope)
+    X-Profile: cprofile : cProfile 결정적 프로파일 -> .pstats (snakeviz, flameprof, gprof2dot)
+
+이벤트 루프 단위로 기록하므로 같은 시간에 처리된 다른 요청의 코드도 함께 포함됩니다.
+ADMIN_TOKEN이 없으면 미들웨어를 등록하지 않으며, 토큰이 틀리면 헤더를 무시하고 평소처럼 처리합니다.
+"""
+import setting.k8s as k8s
+from monitoring.admin import ADMIN_HEADER, header_value, is_admin_token
+
+from collections import Counter
+from typing import Dict, List, Optional
+
+import cProfile
+import datetime
+import logging
+import os
+import re
+import sys
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_MODES = {"sample": ".folded", "cprofile": ".pstats"}
+_SAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+# 이벤트 루프가 처리할 작업 없이 대기 중일 때의 최상위 프레임 (asyncio selector, uvloop은 C 코드라 run_* 에서 멈춤)
+IDLE_FRAMES = {"select", "run_forever", "run_until_complete"}
+
+
+class StackSampler:
+    """지정한 스레드의 호출 스택을 주기적으로 수집하여 folded stack 형식으로 집계
+
+    이벤트 루프가 I/O 대기 중인 샘플(IDLE_FRAMES)은 CPU 사용이 아니므로 제외합니다.
+    """
+
+    def __init__(self, thread_id: int, interval: float = k8s.PROFILE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="apim-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None or frame.f_code.co_name in IDLE_FRAMES:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class RequestProfile:
+    def __init__(self, mode: str, name: str):
+        self.mode = mode
+        self.name = name
+        self._sampler: Optional[StackSampler] = None
+        self._profile: Optional[cProfile.Profile] = None
+
+    def start(self):
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler = StackSampler(threading.get_ident())
+            self._sampler.start()
+
+    def stop(self, directory: str = k8s.PROFILE_DIR):
+        # 저장에 실패해도 수집은 멈추도록 먼저 중지한 뒤 저장
+        if self._profile is not None:
+            self._profile.disable()
+        else:
+            self._sampler.stop()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, self.name)
+        if self._profile is not None:
+            self._profile.dump_stats(path)
+        else:
+            with open(path, "w") as f:
+                f.write(self._sampler.folded())
+        _prune(directory)
+
+
+def _prune(directory: str, keep: int = k8s.PROFILE_KEEP):
+    # 오래된 프로파일부터 삭제하여 최대 keep개 보관
+    names = sorted(list_profiles(directory), reverse=True)
+    for name in names[keep:]:
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:
+            pass
+
+
+def list_profiles(directory: str = k8s.PROFILE_DIR) -> List[str]:
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name for name in os.listdir(directory) if name.endswith(tuple(PROFILE_MODES.values())))
+
+
+def profile_path(name: str, directory: str = k8s.PROFILE_DIR) -> Optional[str]:
+    # 저장된 프로파일 이름만 허용 (경로 조작 방지)
+    if name not in list_profiles(directory):
+        return None
+    return os.path.join(directory, name)
+
+
+def _profile_name(scope: Dict, mode: str) -> str:
+    timestamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S")
+    path = _SAFE.sub("_", scope["path"].strip("/")) or "root"
+    return f"{timestamp}-{scope['method']}-{path[:80]}-{uuid.uuid4().hex[:8]}{PROFILE_MODES[mode]}"
+
+
+class ProfilerMiddleware:
+    """X-Profile + 관리자 토큰이 있는 요청만 프로파일링하는 ASGI 미들웨어
+
+    그 외 요청은 헤더 이름 비교 외에 추가 작업이 없습니다.
+    """
+
+    def __init__(self, app, token: str = k8s.ADMIN_TOKEN, directory: str = k8s.PROFILE_DIR):
+        self.app = app
+        self.token = token
+        self.directory = directory
+        # 프로파일러는 프로세스(이벤트 루프) 단위이므로 동시에 1건만 수행
+        self._active = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        mode = header_value(scope["headers"], PROFILE_HEADER)
+        if mode is None:
+            return await self.app(scope, receive, send)
+        mode = mode.strip().lower() or "sample"
+        if mode not in PROFILE_MODES or self._active or not is_admin_token(header_value(scope["headers"], ADMIN_HEADER.encode()), self.token):
+            return await self.app(scope, receive, send)
+
+        profile = RequestProfile(mode, _profile_name(scope, mode))
+
+        async def send_profile_id(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", profile.name.encode())]}
+            await send(message)
+
+        self._active = True
+        try:
+            profile.start()
+            try:
+                await self.app(scope, receive, send_profile_id)
+            finally:
+                try:
+                    profile.stop(self.directory)
+                except Exception:
+                    # 저장 실패(디스크 / 권한 등)가 요청 응답이나 이후 프로파일링을 막지 않도록 기록만 함
+                    logger.exception("프로파일 %s 저장 실패 (%s)", profile.name, self.directory)
+        finally:
+            self._active = False
@@ -0,0 +1,202 @@
+"""요청별 처리 시간 분해 (Server-Timing 헤더)
+
+요청마다 RequestTiming을 contextvar에 두고, 다음 구간을 누적합니다.
+
+    kube / db : KubeAPI / 정책 DB 호출 (응답 본문 수신 포함, 동시 호출은 합산, 수신 바이트는 압축된 전송 크기)
+    json      : 외부 응답 JSON 디코딩 (decode)
+    render    : 목록 응답 투영 + 직렬화 (utils.streaming.list_response)
+    handler   : 엔드포인트 함수 실행
+    framework : 엔드포인트 함수 밖의 라우트 처리 (의존성 해석, 요청 검증, 응답 직렬화 등, 라우트 처리 시간 - handler)
+    compress  : 응답 압축 (utils.compression)
+    total     : 미들웨어 진입부터 응답 헤더 전송까지
+
+스트리밍 응답은 헤더 전송 이후의 호출이 포함되지 않습니다.
+트레이싱이 켜져 있고 샘플링된 요청이면 각 구간을 하위 span으로도 남깁니다. (monitoring.tracing)
+"""
+import setting.k8s as k8s
+from monitoring.tracing import child_span
+
+from fastapi.routing import APIRoute
+from starlette.routing import get_name
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+import time
+import asyncio
+import functools
+import httpx
+import orjson
+
+# 디버그 헤더에 남길 외부 호출 최대 개수
+MAX_TRACED_CALLS = 20
+
+
+class RequestTiming:
+    __slots__ = ("start", "phases", "calls", "bytes", "trace")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.bytes: Dict[str, int] = {}
+        self.trace: List[str] = []
+
+    def add(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def record_call(self, target: str, verb: str, resource: str, code: str, seconds: float):
+        self.add(target, seconds)
+        self.calls[target] = self.calls.get(target, 0) + 1
+        if len(self.trace) < MAX_TRACED_CALLS:
+            # 호출 순서대로 남겨 직렬 호출 패턴이 보이도록 함 (본문 수신 시간은 제외)
+            offset = (time.perf_counter() - seconds - self.start) * 1000
+            self.trace.append(f"{target} {verb} {resource} {code} +{offset:.1f}ms {seconds * 1000:.1f}ms")
+
+    def add_bytes(self, target: str, size: int):
+        self.bytes[target] = self.bytes.get(target, 0) + size
+
+    def server_timing(self, total: float) -> str:
+        phases = dict(self.phases)
+        if "app" in phases:
+            # 의존성 해석 등도 포함되며, Response를 직접 반환하는 라우트는 검증 / 직렬화 없이 이 시간만 남음
+            phases["framework"] = max(phases.pop("app") - phases.get("handler", 0.0), 0.0)
+        entries = []
+        for name, seconds in phases.items():
+            entry = f"{name};dur={seconds * 1000:.2f}"
+            if name in self.calls:
+                entry += f';desc="{self.calls[name]} calls, {self.bytes.get(name, 0)} B"'
+            elif name == "framework":
+                entry += ';desc="route processing outside the handler"'
+            entries.append(entry)
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+_current: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def current() -> Optional[RequestTiming]:
+    return _current.get()
+
+
+@contextmanager
+def phase(name: str, span: Optional[str] = None):
+    timing = _current.get()
+    with child_span(span or name, attributes={"apim.phase": name}):
+        if timing is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timing.add(name, time.perf_counter() - start)
+
+
+def decode(response: httpx.Response):
+    """외부 응답 JSON 디코딩 (json 구간에 기록)"""
+    with phase("json"):
+        return orjson.loads(response.content)
+
+
+class CountingStream(httpx.AsyncByteStream):
+    """응답 본문 수신 바이트 수와 수신 대기 시간을 요청 타이밍에 누적"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, timing: RequestTiming, target: str):
+        self.stream = stream
+        self.timing = timing
+        self.target = target
+
+    async def __aiter__(self):
+        iterator = self.stream.__aiter__()
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = await iterator.__anext__()
+            except StopAsyncIteration:
+                self.timing.add(self.target, time.perf_counter() - start)
+                return
+            self.timing.add(self.target, time.perf_counter() - start)
+            self.timing.add_bytes(self.target, len(chunk))
+            yield chunk
+
+    async def aclose(self):
+        await self.stream.aclose()
+
+
+class TimedRoute(APIRoute):
+    """라우트 처리 전체(app)와 엔드포인트 함수(handler) 시간을 분리 기록하는 APIRoute"""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        # 엔드포인트를 super().__init__ 전에 감싸서 FastAPI가 감싼 함수로 동기/비동기를 판별하도록 함
+        # (동기 엔드포인트는 동기 함수로 감싸야 스레드풀에서 실행됨, 시그니처는 functools.wraps로 유지)
+        # include_router는 이미 감싼 엔드포인트로 라우트를 다시 만들므로 한 번만 감쌈
+        if getattr(endpoint, "_timed", False):
+            super().__init__(path, endpoint, **kwargs)
+            return
+        span = f"handler {kwargs.get('name') or get_name(endpoint)}"
+
+        if asyncio.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def timed_endpoint(*args, **values):
+                with phase("handler", span):
+                    return await endpoint(*args, **values)
+        else:
+            @functools.wraps(endpoint)
+            def timed_endpoint(*args, **values):
+                with phase("handler", span):
+                    return endpoint(*args, **values)
+
+        timed_endpoint._timed = True
+        super().__init__(path, timed_endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        span = f"route {self.name}"
+
+        async def timed_handler(request):
+            with phase("app", span):
+                return await handler(request)
+
+        return timed_handler
+
+
+class TimingMiddleware:
+    """응답에 Server-Timing 헤더를 추가하는 ASGI 미들웨어
+
+    SERVER_TIMING_DEBUG가 켜져 있으면 외부 호출 수 / 수신 바이트 / 호출 순서 헤더를 함께 보냅니다.
+    """
+
+    def __init__(self, app, debug: bool = k8s.SERVER_TIMING_DEBUG):
+        self.app = app
+        self.debug = debug
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+
+        async def send_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.server_timing(time.perf_counter() - timing.start).encode()))
+                if self.debug and timing.calls:
+                    headers.append((b"x-outbound-calls", _pairs(timing.calls)))
+                    headers.append((b"x-outbound-bytes", _pairs(timing.bytes)))
+                    headers.append((b"x-outbound-trace", "; ".join(timing.trace).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timing)
+        finally:
+            _current.reset(token)
+
+
+def _pairs(values: Dict[str, int]) -> bytes:
+    return ", ".join(f"{name}={value}" for name, value in values.items()).encode()
@@ -0,0 +1,209 @@
+"""OpenTelemetry 트레이싱 (요청 / 라우트 처리 / 외부 호출 / JSON 파싱·직렬화 구간 span)
+
+TRACE_EXPORTER가 비어 있으면 no-op tracer를 사용하며 미들웨어도 등록하지 않습니다.
+들어온 요청의 traceparent / tracestate를 이어받고, 샘플링은 부모 결정을 따르되 유효한 부모가 없으면
+(traceparent가 없거나 형식이 잘못된 경우 포함) TRACE_SAMPLE_RATIO 비율로 결정합니다. 부모가 없는 요청의 샘플링은 TracingMiddleware가 span 생성 전에 결정하므로
+(ParentBased(ALWAYS_ON) + 미들웨어의 비율 판정) 샘플링되지 않은 요청은 span 객체도 만들지 않습니다.
+하위 span은 샘플링된 요청 안에서만 만들며, Informer의 백그라운드 LIST / WATCH는 추적하지 않습니다.
+
+    TRACE_EXPORTER=memory  : 최근 TRACE_MEMORY_SPANS개를 메모리에 보관 (GET /admin/traces)
+    TRACE_EXPORTER=file    : TRACE_FILE에 span을 한 줄씩 JSON으로 기록
+    TRACE_EXPORTER=console : 표준 출력
+    TRACE_EXPORTER=모듈:클래스 : 인자 없이 생성 가능한 SpanExporter (예: OTLP exporter 패키지)
+"""
+import setting.k8s as k8s
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor, ConsoleSpanExporter, SimpleSpanProcessor, SpanExporter, SpanExportResult,
+)
+from opentelemetry.sdk.trace.sampling import ALWAYS_ON, ParentBased
+from opentelemetry.trace import SpanKind, StatusCode
+from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence
+
+import importlib
+import random
+import threading
+import orjson
+
+_NOOP = trace.NoOpTracer()
+_tracer: trace.Tracer = _NOOP
+_memory: Optional["RingBufferSpanExporter"] = None
+_ratio = 0.0
+_propagator = TraceContextTextMapPropagator()
+_CONTEXT_HEADERS = (b"traceparent", b"tracestate")
+
+
+class RingBufferSpanExporter(SpanExporter):
+    """최근 maxlen개 span만 보관하는 메모리 exporter"""
+
+    def __init__(self, maxlen: int = k8s.TRACE_MEMORY_SPANS):
+        self.spans: deque = deque(maxlen=maxlen)
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        self.spans.extend(spans)
+        return SpanExportResult.SUCCESS
+
+    def traces(self, trace_id: Optional[str] = None, limit: int = 20) -> List[dict]:
+        # 최근 trace부터 limit개, trace마다 span 목록 (시작 시각 순)
+        grouped: Dict[str, List[ReadableSpan]] = {}
+        for span in reversed(self.spans):
+            key = format(span.context.trace_id, "032x")
+            if trace_id is not None and key != trace_id:
+                continue
+            if key not in grouped and len(grouped) >= limit:
+                continue
+            grouped.setdefault(key, []).append(span)
+        return [
+            {"trace_id": key, "spans": [orjson.loads(span.to_json(indent=None)) for span in sorted(spans, key=lambda s: s.start_time)]}
+            for key, spans in grouped.items()
+        ]
+
+    def shutdown(self):
+        self.spans.clear()
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """span을 한 줄에 하나씩 JSON으로 파일에 추가 기록"""
+
+    def __init__(self, path: str = k8s.TRACE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        with self._lock:
+            for span in spans:
+                self._file.write(span.to_json(indent=None) + "\n")
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+
+def build_exporter(name: str) -> SpanExporter:
+    if name == "memory":
+        return RingBufferSpanExporter()
+    if name == "file":
+        return JsonLinesSpanExporter()
+    if name == "console":
+        return ConsoleSpanExporter()
+    module, _, attr = name.partition(":")
+    if not attr:
+        raise ValueError(f"알 수 없는 TRACE_EXPORTER: {name}")
+    return getattr(importlib.import_module(module), attr)()
+
+
+def configure(exporter: str = k8s.TRACE_EXPORTER, ratio: float = k8s.TRACE_SAMPLE_RATIO) -> Optional[TracerProvider]:
+    """exporter를 지정하면 TracerProvider를 만들어 이 모듈의 tracer로 사용 (lifespan에서 호출)"""
+    global _tracer, _memory, _ratio
+    if not exporter:
+        return None
+    span_exporter = build_exporter(exporter)
+    provider = TracerProvider(
+        sampler=ParentBased(ALWAYS_ON),
+        resource=Resource.create({"service.name": k8s.TRACE_SERVICE_NAME}),
+    )
+    # 메모리 exporter는 바로 조회할 수 있도록 동기 처리, 그 외는 별도 스레드에서 일괄 전송
+    if isinstance(span_exporter, RingBufferSpanExporter):
+        provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+        _memory = span_exporter
+    else:
+        provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    _tracer = provider.get_tracer("apim-kubeapi")
+    _ratio = ratio
+    return provider
+
+
+def shutdown(provider: Optional[TracerProvider]):
+    global _tracer, _memory
+    if provider is not None:
+        provider.shutdown()
+    _tracer = _NOOP
+    _memory = None
+
+
+def enabled() -> bool:
+    return _tracer is not _NOOP
+
+
+def memory_exporter() -> Optional[RingBufferSpanExporter]:
+    return _memory
+
+
+@contextmanager
+def child_span(name: str, kind: SpanKind = SpanKind.INTERNAL, attributes: Optional[dict] = None):
+    """샘플링된 요청 안에서만 하위 span 생성 (그 외에는 None, 비용 없음)"""
+    if _tracer is _NOOP or not trace.get_current_span().is_recording():
+        yield None
+        return
+    with _tracer.start_as_current_span(name, kind=kind, attributes=attributes) as span:
+        yield span
+
+
+def inject(headers) -> None:
+    # 외부 호출에 현재 trace context 전달 (traceparent / tracestate)
+    _propagator.inject(headers)
+
+
+class TracingMiddleware:
+    """요청마다 SERVER span을 만들고 들어온 trace context를 이어받는 ASGI 미들웨어
+
+    샘플링된 요청은 응답 헤더 X-Trace-Id로 trace id를 알려 줍니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _tracer is _NOOP:
+            return await self.app(scope, receive, send)
+
+        carrier = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"] if key in _CONTEXT_HEADERS}
+        context = _propagator.extract(carrier) if carrier else None
+        # 유효한 부모가 없으면(헤더 없음, 잘못된 traceparent, tracestate만 있음) 비율로 판정
+        # (ParentBased(ALWAYS_ON)은 부모가 없으면 항상 샘플링하므로 헤더만으로 비율을 우회할 수 없도록 함)
+        if context is None or not trace.get_current_span(context).get_span_context().is_valid:
+            if random.random() >= _ratio:
+                return await self.app(scope, receive, send)
+            context = None
+        method = scope["method"]
+        with _tracer.start_as_current_span(
+            method,
+            context=context,
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        ) as span:
+            if not span.is_recording():
+                return await self.app(scope, receive, send)
+
+            trace_id = format(span.get_span_context().trace_id, "032x").encode()
+            status = 500
+
+            async def send_trace_id(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    message = {**message, "headers": [*message.get("headers", []), (b"x-trace-id", trace_id)]}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_trace_id)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.update_name(f"{method} {route.path}")
+                    span.set_attribute("http.route", route.path)
+                    if getattr(route, "tags", None):
+                        span.set_attribute("apim.tag", route.tags[0])
+                span.set_attribute("http.response.status_code", status)
+                if status >= 500:
+                    span.set_status(StatusCode.ERROR)
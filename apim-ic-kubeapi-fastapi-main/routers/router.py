@@ -4,6 +4,9 @@ from apis.upstreams import router as upstreams_router
 from apis.routes import router as routes_router
 from apis.servers import router as servers_router
 from apis.certs import router as certs_router
+from apis.health import router as health_router
+from apis.metrics import router as metrics_router
+from apis.admin import router as admin_router
 
 from fastapi import APIRouter
 
@@ -15,4 +18,7 @@ router.include_router(ip_deny_router)
 router.include_router(upstreams_router)
 router.include_router(routes_router)
 router.include_router(servers_router)
-router.include_router(certs_router)
\ No newline at end of file
+router.include_router(certs_router)
+router.include_router(health_router)
+router.include_router(metrics_router)
+router.include_router(admin_router)
\ No newline at end of file
@@ -3,14 +3,14 @@ from typing import List
 
 class Allow(BaseModel):
     PolicyName: str = Field(..., description="정책 이름")
-    AllowIP: List[str] = Field(..., description="허용 할 IP")
+    AllowIP: List[str] = Field(..., description="허용 할 IP 또는 CIDR (IPv4/IPv6, 저장 시 최소 CIDR 집합으로 정규화)")
     ApplyRange: str = Field(..., description="적용 범위(All, servers, routes)")
     
     class Config:
         json_schema_extra = {
             "example": {
                 "PolicyName": "example-policy",
-                "AllowIP": ["192.168.201.1","192.168.201.1","192.168.201.1"],
+                "AllowIP": ["192.168.201.1","192.168.201.2","10.10.0.0/16"],
                 "ApplyRange": "http"
             }
         }
@@ -18,14 +18,14 @@ class Allow(BaseModel):
 
 class Deny(BaseModel):
     PolicyName: str = Field(..., description="정책 이름")
-    DenyIP: List[str] = Field(..., description="거부 할 IP")
+    DenyIP: List[str] = Field(..., description="거부 할 IP 또는 CIDR (IPv4/IPv6, 저장 시 최소 CIDR 집합으로 정규화)")
     ApplyRange: str = Field(..., description="적용 범위(All, servers, routes)")
     
     class Config:
         json_schema_extra = {
             "example": {
                 "PolicyName": "example-policy",
-                "DenyIP": ["192.168.201.1","192.168.201.1","192.168.201.1"],
+                "DenyIP": ["192.168.201.1","192.168.201.2","2001:db8::/32"],
                 "DenyRange": "http"
             }
         }
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Annotated, List, Literal, Optional, Union
 
 class UpstreamItem(BaseModel):
     uid: str = Field(..., description="Service K8S uid")
@@ -50,4 +50,49 @@ class UpstreamUpdateRequest(BaseModel):
         }
 
 class UpstreamResponse(BaseModel):
-    data: List[UpstreamItem]
\ No newline at end of file
+    data: List[UpstreamItem]
+
+class UpstreamBatchCreate(UpstreamCreateRequest):
+    op: Literal["create"] = Field(..., description="작업 종류")
+
+class UpstreamBatchUpdate(UpstreamUpdateRequest):
+    op: Literal["update"] = Field(..., description="작업 종류")
+    name: str = Field(..., description="수정할 Upstream 이름")
+    namespace: Optional[str] = Field(None, description="같은 이름이 여러 네임스페이스에 있을 때 대상 네임스페이스 지정")
+
+class UpstreamBatchDelete(BaseModel):
+    op: Literal["delete"] = Field(..., description="작업 종류")
+    name: str = Field(..., description="삭제할 Upstream 이름")
+    namespace: Optional[str] = Field(None, description="같은 이름이 여러 네임스페이스에 있을 때 대상 네임스페이스 지정")
+
+UpstreamBatchOperation = Annotated[
+    Union[UpstreamBatchCreate, UpstreamBatchUpdate, UpstreamBatchDelete],
+    Field(discriminator="op")
+]
+
+class UpstreamBatchRequest(BaseModel):
+    operations: List[UpstreamBatchOperation] = Field(..., max_length=1000, description="실행할 작업 목록")
+    concurrency: Optional[int] = Field(None, ge=1, le=64, description="동시 실행 수 (기본값 K8S_BATCH_CONCURRENCY)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "operations": [
+                    {"op": "create", **UpstreamCreateRequest.Config.json_schema_extra["example"]},
+                    {"op": "update", "name": "external-svc-2", **UpstreamUpdateRequest.Config.json_schema_extra["example"]},
+                    {"op": "delete", "name": "external-svc-3", "namespace": "default"}
+                ],
+                "concurrency": 16
+            }
+        }
+
+class UpstreamBatchResult(BaseModel):
+    index: int = Field(..., description="요청 operations 내 순번")
+    op: str = Field(..., description="작업 종류")
+    name: str = Field(..., description="Upstream 이름")
+    status_code: int = Field(..., description="항목별 처리 결과 상태 코드")
+    message: str = Field(..., description="처리 결과 메시지")
+    details: Optional[dict] = Field(None, description="실패 시 KubeAPI 응답")
+
+class UpstreamBatchResponse(BaseModel):
+    data: List[UpstreamBatchResult]
\ No newline at end of file
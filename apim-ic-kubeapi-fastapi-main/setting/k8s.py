@@ -1,23 +1,175 @@
-K8S_JWT : str = open('/var/run/secrets/kubernetes.io/serviceaccount/token', 'r').readlines()[0]
-            
-API_URL_POLICY : str = 'https://kubernetes.default.svc.cluster.local/apis/k8s.nginx.org/v1/namespaces/nginx-ingress/policies/'
+import os
 
-API_URL_CONFIGMAP = 'https://kubernetes.default.svc.cluster.local/api/v1/namespaces/nginx-ingress/configmaps/nginx-config/'
+# KubeAPI 주소 (로컬 개발/벤치마크 시 fake apiserver 주소로 변경)
+K8S_API_URL : str = os.getenv('K8S_API_URL', 'https://kubernetes.default.svc.cluster.local').rstrip('/')
 
-DB_URL_Policy = "http://175.196.233.106:8123/db/ipac/"
+# 인증 토큰: K8S_TOKEN이 있으면 사용, 없으면 K8S_TOKEN_PATH 파일을 요청 시점에 읽고 K8S_TOKEN_RELOAD초마다 다시 읽음
+K8S_TOKEN : str = os.getenv('K8S_TOKEN', '')
 
-API_URL_SERVICE : str = 'https://kubernetes.default.svc.cluster.local/api/v1/services'
+K8S_TOKEN_PATH : str = os.getenv('K8S_TOKEN_PATH', '/var/run/secrets/kubernetes.io/serviceaccount/token')
 
-API_URL_VIRTUALSERVER : str = 'https://kubernetes.default.svc.cluster.local/apis/k8s.nginx.org/v1/virtualservers'
+K8S_TOKEN_RELOAD : float = float(os.getenv('K8S_TOKEN_RELOAD', '60'))
 
-API_URL_TLS_SECRET : str = 'https://kubernetes.default.svc.cluster.local/api/v1/secrets'
+API_URL_CORE : str = K8S_API_URL + '/api/v1'
 
+API_URL_NGINX : str = K8S_API_URL + '/apis/k8s.nginx.org/v1'
+
+API_URL_POLICY : str = API_URL_NGINX + '/namespaces/nginx-ingress/policies/'
+
+API_URL_CONFIGMAP = API_URL_CORE + '/namespaces/nginx-ingress/configmaps/nginx-config/'
+
+DB_URL_Policy = os.getenv('DB_URL_POLICY', "http://175.196.233.106:8123/db/ipac/")
+
+API_URL_SERVICE : str = API_URL_CORE + '/services'
+
+API_URL_VIRTUALSERVER : str = API_URL_NGINX + '/virtualservers'
+
+API_URL_TLS_SECRET : str = API_URL_CORE + '/secrets'
+
+# Authorization 헤더는 KubeClientPool의 토큰 인증(clients.kube.KubeTokenAuth)이 추가
 API_HEADER : dict = {
-    'Authorization' : 'Bearer '+ K8S_JWT,
     'Content-Type' : 'application/json'
     }
 
 API_HEADER_UPDATE : dict = {
-    'Authorization' : 'Bearer '+ K8S_JWT,
     'Content-Type' : 'application/merge-patch+json'
 }
+
+API_HEADER_APPLY : dict = {
+    'Content-Type' : 'application/apply-patch+yaml'
+}
+
+# 목록 조회 시 metadata만 받도록 요청 (PartialObjectMetadataList, 미지원 시 일반 JSON)
+API_HEADER_METADATA : dict = {
+    'Accept' : 'application/json;as=PartialObjectMetadataList;v=v1;g=meta.k8s.io,application/json'
+}
+
+API_HEADER_METADATA_WATCH : dict = {
+    'Accept' : 'application/json;as=PartialObjectMetadata;v=v1;g=meta.k8s.io,application/json'
+}
+
+TLS_SECRET_TYPE : str = 'kubernetes.io/tls'
+
+TLS_SECRET_FIELD_SELECTOR : str = 'type=' + TLS_SECRET_TYPE
+
+
+# 공유 KubeAPI 클라이언트 풀 설정 (환경 변수로 조정)
+K8S_CA_CERT_PATH : str = os.getenv('K8S_CA_CERT_PATH', '/var/run/secrets/kubernetes.io/serviceaccount/ca.crt')
+
+# CA 파일이 없을 때 TLS 검증 생략 여부 (로컬 개발용, false면 시스템 CA로 검증)
+K8S_INSECURE_SKIP_VERIFY : bool = os.getenv('K8S_INSECURE_SKIP_VERIFY', 'false').lower() in ('1', 'true', 'yes')
+
+K8S_HTTP2 : bool = os.getenv('K8S_HTTP2', 'false').lower() in ('1', 'true', 'yes')
+
+K8S_POOL_MAX_CONNECTIONS : int = int(os.getenv('K8S_POOL_MAX_CONNECTIONS', '100'))
+
+K8S_POOL_MAX_KEEPALIVE : int = int(os.getenv('K8S_POOL_MAX_KEEPALIVE', '20'))
+
+K8S_KEEPALIVE_EXPIRY : float = float(os.getenv('K8S_KEEPALIVE_EXPIRY', '30'))
+
+K8S_TIMEOUT : float = float(os.getenv('K8S_TIMEOUT', '10'))
+
+# KubeAPI 응답 압축 요청 (kube-apiserver는 gzip만 지원, 큰 목록 응답만 압축), 비어 있으면 압축하지 않은 응답 요청
+K8S_ACCEPT_ENCODING : str = os.getenv('K8S_ACCEPT_ENCODING', 'gzip')
+
+# KubeAPI 요청 흐름 제어 (client-go 토큰 버킷 방식, 읽기 / 쓰기 예산 분리, 0이면 제한 없음)
+# QPS / BURST: 초당 요청 수와 순간 허용량, MAX_INFLIGHT: 동시 처리 중인 요청 수 (WATCH 제외)
+K8S_QPS : float = float(os.getenv('K8S_QPS', '50'))
+
+K8S_BURST : int = int(os.getenv('K8S_BURST', '100'))
+
+K8S_WRITE_QPS : float = float(os.getenv('K8S_WRITE_QPS', '20'))
+
+K8S_WRITE_BURST : int = int(os.getenv('K8S_WRITE_BURST', '40'))
+
+K8S_MAX_INFLIGHT : int = int(os.getenv('K8S_MAX_INFLIGHT', '50'))
+
+K8S_MAX_MUTATING_INFLIGHT : int = int(os.getenv('K8S_MAX_MUTATING_INFLIGHT', '20'))
+
+# 외부 호출(KubeAPI / 정책 DB) 재시도 및 차단기
+# KubeAPI는 멱등 읽기(GET/HEAD, WATCH 제외)만 재시도, 429는 Retry-After를 따르며 RETRY_AFTER_MAX초를 넘으면 재시도하지 않음
+K8S_RETRIES : int = int(os.getenv('K8S_RETRIES', '2'))
+
+RETRY_BACKOFF : float = float(os.getenv('RETRY_BACKOFF', '0.1'))
+
+RETRY_MAX_BACKOFF : float = float(os.getenv('RETRY_MAX_BACKOFF', '2'))
+
+RETRY_AFTER_MAX : float = float(os.getenv('RETRY_AFTER_MAX', '5'))
+
+# 연속 BREAKER_FAILURES회 실패하면 BREAKER_RESET_TIMEOUT초 동안 바로 실패 처리 (0이면 차단기 미사용)
+BREAKER_FAILURES : int = int(os.getenv('BREAKER_FAILURES', '5'))
+
+BREAKER_RESET_TIMEOUT : float = float(os.getenv('BREAKER_RESET_TIMEOUT', '10'))
+
+# Informer(LIST + WATCH) 캐시 설정
+K8S_CACHE_ENABLED : bool = os.getenv('K8S_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+K8S_WATCH_TIMEOUT : int = int(os.getenv('K8S_WATCH_TIMEOUT', '300'))
+
+# 스트리밍 목록 조회 시 KubeAPI 페이지 크기 (limit/continue)
+K8S_PAGE_SIZE : int = int(os.getenv('K8S_PAGE_SIZE', '500'))
+
+# IP 정책 DB 비동기 클라이언트 설정
+DB_TIMEOUT : float = float(os.getenv('DB_TIMEOUT', '5'))
+
+DB_RETRIES : int = int(os.getenv('DB_RETRIES', '2'))
+
+DB_POOL_MAX_CONNECTIONS : int = int(os.getenv('DB_POOL_MAX_CONNECTIONS', '20'))
+
+# Upstream 일괄 작업 기본 동시 실행 수
+K8S_BATCH_CONCURRENCY : int = int(os.getenv('K8S_BATCH_CONCURRENCY', '16'))
+
+# 업데이트 방식: merge(JSON merge patch, 목록 필드 전체 교체) 또는 apply(server-side apply)
+K8S_UPDATE_STRATEGY : str = os.getenv('K8S_UPDATE_STRATEGY', 'merge')
+
+K8S_FIELD_MANAGER : str = os.getenv('K8S_FIELD_MANAGER', 'apim-kubeapi')
+
+K8S_UPDATE_RETRIES : int = int(os.getenv('K8S_UPDATE_RETRIES', '3'))
+
+# 응답 압축 (Accept-Encoding 협상, br은 brotli 패키지 설치 시), COMPRESS_MIN_SIZE 바이트 미만 응답은 압축하지 않음
+COMPRESSION : bool = os.getenv('COMPRESSION', 'true').lower() in ('1', 'true', 'yes')
+
+COMPRESS_MIN_SIZE : int = int(os.getenv('COMPRESS_MIN_SIZE', '1400'))
+
+GZIP_LEVEL : int = int(os.getenv('GZIP_LEVEL', '5'))
+
+BROTLI_QUALITY : int = int(os.getenv('BROTLI_QUALITY', '4'))
+
+# 응답 Server-Timing 헤더 (구간별 처리 시간) 및 외부 호출 수 / 수신 바이트 / 호출 순서 디버그 헤더
+SERVER_TIMING : bool = os.getenv('SERVER_TIMING', 'true').lower() in ('1', 'true', 'yes')
+
+SERVER_TIMING_DEBUG : bool = os.getenv('SERVER_TIMING_DEBUG', 'false').lower() in ('1', 'true', 'yes')
+
+# 관리자 기능(요청 프로파일링 등) 토큰, 비어 있으면 관리자 기능 비활성화
+ADMIN_TOKEN : str = os.getenv('ADMIN_TOKEN', '')
+
+# 요청 프로파일 저장 위치 / 샘플링 간격(초) / 보관 개수
+PROFILE_DIR : str = os.getenv('PROFILE_DIR', '/tmp/apim-profiles')
+
+PROFILE_INTERVAL : float = float(os.getenv('PROFILE_INTERVAL', '0.001'))
+
+PROFILE_KEEP : int = int(os.getenv('PROFILE_KEEP', '50'))
+
+# 이벤트 루프 지연 측정 주기(초)와 루프 점유 경고 기준(초, 초과 시 점유 중인 코드의 스택을 로그로 남김)
+LOOP_MONITOR : bool = os.getenv('LOOP_MONITOR', 'true').lower() in ('1', 'true', 'yes')
+
+LOOP_LAG_INTERVAL : float = float(os.getenv('LOOP_LAG_INTERVAL', '0.25'))
+
+LOOP_BLOCK_THRESHOLD : float = float(os.getenv('LOOP_BLOCK_THRESHOLD', '0.1'))
+
+# 관리자 메모리 스냅샷(tracemalloc) 트레이스백 깊이와 보관 개수
+MEMORY_TRACE_FRAMES : int = int(os.getenv('MEMORY_TRACE_FRAMES', '10'))
+
+MEMORY_SNAPSHOT_KEEP : int = int(os.getenv('MEMORY_SNAPSHOT_KEEP', '5'))
+
+# 분산 트레이싱 exporter (memory / file / console / 모듈:클래스, 비어 있으면 비활성화)와
+# 부모 trace context가 없는 요청의 샘플링 비율 (0.0 ~ 1.0)
+TRACE_EXPORTER : str = os.getenv('TRACE_EXPORTER', '')
+
+TRACE_SAMPLE_RATIO : float = float(os.getenv('TRACE_SAMPLE_RATIO', '0.01'))
+
+TRACE_SERVICE_NAME : str = os.getenv('TRACE_SERVICE_NAME', 'apim-kubeapi')
+
+TRACE_FILE : str = os.getenv('TRACE_FILE', '/tmp/apim-traces.jsonl')
+
+TRACE_MEMORY_SPANS : int = int(os.getenv('TRACE_MEMORY_SPANS', '10000'))
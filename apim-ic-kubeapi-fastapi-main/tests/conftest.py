@@ -0,0 +1,15 @@
+"""pytest 공통 설정 (앱 디렉터리에서 python -m pytest 로 실행)
+
+비동기 테스트는 anyio 플러그인(@pytest.mark.anyio)으로 asyncio 이벤트 루프에서 실행합니다.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
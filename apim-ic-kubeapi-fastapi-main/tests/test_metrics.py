@@ -0,0 +1,17 @@
+from bench.harness import running_app
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_metrics_exports_cache_gauges():
+    async with running_app(3) as h:
+        response = await h.api.get("/metrics")
+
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    # 흐름 제어 게이지와 캐시 게이지가 함께 노출되어야 함
+    assert any(line.startswith("apim_kube_flow_requests{") for line in lines)
+    assert 'apim_cache_objects{cache="services"} 3.0' in lines
+    assert 'apim_cache_ready{cache="services"} 1.0' in lines
@@ -0,0 +1,117 @@
+from clients.policy_db import PolicyDBClient
+from clients.resilience import CircuitBreaker
+from main import app
+
+from collections import Counter
+
+import asyncio
+import time
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+BASE_URL = "http://policy-db/db/ipac/"
+
+
+async def start_client(handler, **kwargs) -> PolicyDBClient:
+    # 차단기는 끄고 재시도 대기는 짧게 (재시도 횟수만 확인)
+    db = await PolicyDBClient(BASE_URL, transport=httpx.MockTransport(handler), breaker=CircuitBreaker("db", failures=0), **kwargs).start()
+    db.resilient.backoff = 0.001
+    return db
+
+
+@pytest.fixture
+async def silent_server():
+    # 연결은 받지만 응답하지 않는 서버 (실제 transport의 읽기 타임아웃 확인용)
+    async def accept(reader, writer):
+        await reader.read()
+
+    server = await asyncio.start_server(accept, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    yield f"http://{host}:{port}/db/ipac/"
+    server.close()
+
+
+async def test_timeout_returns_504(silent_server):
+    app.state.policy_db = await PolicyDBClient(silent_server, timeout=0.2, retries=0).start()
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://app") as api:
+            start = time.perf_counter()
+            response = await api.get("/kubeapi/ipallow/")
+            elapsed = time.perf_counter() - start
+    finally:
+        await app.state.policy_db.close()
+
+    assert response.status_code == 504
+    assert elapsed < 1.0
+
+
+@pytest.mark.parametrize("method, attempts", [("GET", 3), ("PUT", 3), ("DELETE", 3), ("POST", 1)])
+async def test_retries_only_idempotent_methods(method, attempts):
+    calls = Counter()
+
+    async def unavailable(request: httpx.Request) -> httpx.Response:
+        calls[request.method] += 1
+        return httpx.Response(503)
+
+    db = await start_client(unavailable, retries=2)
+    try:
+        response = await db.request(method, "policy-1")
+    finally:
+        await db.close()
+
+    assert response.status_code == 503
+    assert calls[method] == attempts
+
+
+@pytest.mark.parametrize("method, attempts", [("GET", 3), ("POST", 1)])
+async def test_read_timeout_retried_only_for_idempotent_methods(method, attempts):
+    calls = Counter()
+
+    async def timeout(request: httpx.Request) -> httpx.Response:
+        calls[request.method] += 1
+        raise httpx.ReadTimeout("timeout", request=request)
+
+    db = await start_client(timeout, retries=2)
+    try:
+        with pytest.raises(httpx.ReadTimeout):
+            await db.request(method, "policy-1")
+    finally:
+        await db.close()
+
+    assert calls[method] == attempts
+
+
+async def test_event_loop_stays_responsive_while_db_is_slow():
+    async def slow(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.3)
+        return httpx.Response(200, json=[{"Id": "policy-1", "IPArr": ["10.0.0.1"]}])
+
+    app.state.policy_db = await start_client(slow)
+    app.state.informers = {}
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://app") as api:
+            done = asyncio.Event()
+            lags = []
+
+            async def probe():
+                while not done.is_set():
+                    start = time.perf_counter()
+                    await api.get("/healthz")
+                    lags.append(time.perf_counter() - start)
+                    await asyncio.sleep(0.01)
+
+            probe_task = asyncio.create_task(probe())
+            start = time.perf_counter()
+            responses = await asyncio.gather(*(api.get("/kubeapi/ipallow/") for _ in range(20)))
+            elapsed = time.perf_counter() - start
+            done.set()
+            await probe_task
+    finally:
+        await app.state.policy_db.close()
+
+    assert all(response.status_code == 200 for response in responses)
+    # 느린 DB 호출 20건이 동시에 진행되고 그동안 /healthz는 DB 지연만큼 기다리지 않음
+    assert elapsed < 0.3 * 3
+    assert lags and max(lags) < 0.1
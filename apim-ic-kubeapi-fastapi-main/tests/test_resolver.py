@@ -0,0 +1,45 @@
+from bench.harness import running_app
+from main import app
+
+import asyncio
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+TLS_SECRET = {"type": "kubernetes.io/tls", "data": {"tls.crt": "", "tls.key": ""}}
+
+
+async def cached(name: str, count: int):
+    # watch 이벤트가 Informer 캐시에 반영될 때까지 대기
+    informer = app.state.informers.get("secrets")
+    for _ in range(100):
+        if informer is None or len(informer.by_index("name", name)) >= count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"{name} not cached")
+
+
+@pytest.mark.parametrize("cache", [True, False])
+@pytest.mark.parametrize("namespace", [None, "ns-0"])
+async def test_exact_name_preferred_over_alias(cache, namespace):
+    async with running_app(1, cache=cache) as h:
+        # 같은 네임스페이스에 server-0-cert(생성 시 이름)와 server-0이 함께 존재
+        h.kube.add("secrets", "ns-0", "server-0", TLS_SECRET)
+        await cached("server-0", 1)
+        params = {"name": "server-0", **({"namespace": namespace} if namespace else {})}
+        response = await h.api.delete("/kubeapi/certs/", params=params)
+
+        assert response.status_code == 200, response.text
+        assert ("ns-0", "server-0") not in h.kube.store["secrets"]
+        assert ("ns-0", "server-0-cert") in h.kube.store["secrets"]
+
+
+@pytest.mark.parametrize("cache", [True, False])
+async def test_same_name_in_other_namespaces_is_ambiguous(cache):
+    async with running_app(1, cache=cache) as h:
+        h.kube.add("secrets", "ns-1", "server-0-cert", TLS_SECRET)
+        await cached("server-0-cert", 2)
+        response = await h.api.delete("/kubeapi/certs/", params={"name": "server-0"})
+
+        assert response.status_code == 409
+        assert response.json()["detail"]["namespaces"] == ["ns-0", "ns-1"]
@@ -0,0 +1,44 @@
+from bench.harness import running_app
+from monitoring.timing import TimedRoute, TimingMiddleware
+
+from fastapi import APIRouter, Depends, FastAPI
+
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def phases(response: httpx.Response) -> set:
+    return {entry.split(";")[0].strip() for entry in response.headers["server-timing"].split(",")}
+
+
+async def test_server_timing_phases():
+    async with running_app(3) as h:
+        response = await h.api.get("/kubeapi/servers/")
+
+    assert response.status_code == 200
+    names = phases(response)
+    assert {"handler", "framework", "total"} <= names
+    assert "pydantic" not in names
+
+
+async def test_sync_endpoint_runs_in_threadpool():
+    router = APIRouter(route_class=TimedRoute)
+
+    def dependency() -> int:
+        return 2
+
+    @router.get("/sync")
+    def sync_endpoint(value: int = 1, factor: int = Depends(dependency)):
+        return {"value": value * factor}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(TimingMiddleware)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://app") as client:
+        response = await client.get("/sync", params={"value": 3})
+
+    assert response.json() == {"value": 6}
+    # include_router로 라우트를 다시 만들어도 handler 구간은 한 번만 기록
+    assert response.headers["server-timing"].count("handler;") == 1
@@ -0,0 +1,49 @@
+from monitoring import tracing
+
+from fastapi import FastAPI
+
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+@pytest.fixture
+def traced_app():
+    # 비율 0: 유효한 부모가 sampled로 보낸 요청만 샘플링되어야 함
+    provider = tracing.configure("memory", ratio=0.0)
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {}
+
+    app.add_middleware(tracing.TracingMiddleware)
+    yield app
+    tracing.shutdown(provider)
+
+
+@pytest.mark.parametrize("headers", [
+    {},
+    {"traceparent": "garbage"},
+    {"traceparent": f"00-{'0' * 32}-00f067aa0ba902b7-01"},
+    {"tracestate": "vendor=value"},
+])
+async def test_ratio_applies_without_valid_parent(traced_app, headers):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=traced_app), base_url="http://app") as client:
+        response = await client.get("/ping", headers=headers)
+
+    assert response.status_code == 200
+    assert "x-trace-id" not in response.headers
+    assert not tracing.memory_exporter().spans
+
+
+async def test_sampled_parent_is_followed(traced_app):
+    headers = {"traceparent": f"00-{TRACE_ID}-00f067aa0ba902b7-01", "tracestate": "vendor=value"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=traced_app), base_url="http://app") as client:
+        response = await client.get("/ping", headers=headers)
+
+    assert response.headers["x-trace-id"] == TRACE_ID
+    assert tracing.memory_exporter().spans
@@ -0,0 +1,72 @@
+from bench.harness import running_app
+from main import app
+
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+UPDATE = {"external_ips": ["192.168.100.20"], "service_port": 81, "target_port": 9090}
+KEY = ("ns-0", "upstream-0")
+
+
+def fail_endpoints_patch(h, before=None, error=None):
+    # Endpoints PATCH만 실패시키는 transport (before: 실패 직전에 실행할 다른 쓰기)
+    handle = h.kube.handle
+
+    async def failing(request: httpx.Request) -> httpx.Response:
+        if request.method == "PATCH" and "/endpoints/" in request.url.path:
+            if before is not None:
+                before()
+            if error is not None:
+                raise error(request)
+            return httpx.Response(500, json={"message": "endpoints write failed"})
+        return await handle(request)
+
+    app.state.kube_pool.instrumented.transport = httpx.MockTransport(failing)
+
+
+@pytest.mark.parametrize("cache", [True, False])
+async def test_endpoints_failure_reverts_service(cache):
+    async with running_app(1, cache=cache) as h:
+        previous = h.kube.store["services"][KEY]["spec"]
+        fail_endpoints_patch(h)
+        response = await h.api.put("/kubeapi/upstreams/upstream-0", json=UPDATE)
+
+        assert response.status_code == 400
+        assert h.kube.store["services"][KEY]["spec"] == previous
+
+
+async def test_endpoints_exception_reverts_service_and_reraises():
+    async with running_app(1) as h:
+        previous = h.kube.store["services"][KEY]["spec"]
+        fail_endpoints_patch(h, error=lambda request: httpx.ReadTimeout("timeout", request=request))
+        response = await h.api.put("/kubeapi/upstreams/upstream-0", json=UPDATE)
+
+        assert response.status_code == 504
+        assert h.kube.store["services"][KEY]["spec"] == previous
+
+
+async def test_revert_keeps_concurrent_write_to_same_field():
+    async with running_app(1) as h:
+        # 이 요청의 Service patch 이후 다른 쓰기가 같은 필드(spec.ports)를 변경
+        other = {"spec": {"ports": [{"port": 7000, "targetPort": 7000}]}}
+        fail_endpoints_patch(h, before=lambda: h.kube.bump("services", *KEY, other))
+        response = await h.api.put("/kubeapi/upstreams/upstream-0", json=UPDATE)
+
+        assert response.status_code == 400
+        assert h.kube.store["services"][KEY]["spec"]["ports"] == other["spec"]["ports"]
+
+
+async def test_revert_keeps_concurrent_write_to_other_field():
+    async with running_app(1) as h:
+        previous = h.kube.store["services"][KEY]["spec"]["ports"]
+        # 다른 쓰기가 이 요청이 쓰지 않은 필드만 변경하면 원복은 재시도 후 적용되고 그 변경은 유지
+        other = {"metadata": {"annotations": {"owner": "other"}}}
+        fail_endpoints_patch(h, before=lambda: h.kube.bump("services", *KEY, other))
+        response = await h.api.put("/kubeapi/upstreams/upstream-0", json=UPDATE)
+
+        assert response.status_code == 400
+        service = h.kube.store["services"][KEY]
+        assert service["spec"]["ports"] == previous
+        assert service["metadata"]["annotations"]["owner"] == "other"
@@ -0,0 +1,117 @@
+"""IP Allow/Deny 목록 정규화
+
+주소/CIDR을 검증한 뒤 중복, 겹치는 대역, 인접 대역을 합쳐 최소 CIDR 집합으로 만듭니다.
+ipaddress 모듈 대신 정수 구간 병합으로 처리하여 10만 건도 수십 ms 내에 끝납니다.
+"""
+from dataclasses import dataclass
+from typing import Iterable, List, Tuple
+
+import socket
+
+_FAMILIES = (
+    (socket.AF_INET, 32),
+    (socket.AF_INET6, 128),
+)
+
+
+@dataclass
+class AggregateResult:
+    addresses: List[str]
+    input_count: int
+
+    @property
+    def removed(self) -> int:
+        return self.input_count - len(self.addresses)
+
+    def summary(self) -> dict:
+        return {"input": self.input_count, "output": len(self.addresses), "removed": self.removed}
+
+
+class InvalidAddressError(ValueError):
+    def __init__(self, invalid: List[str]):
+        self.invalid = invalid
+        super().__init__(f"유효하지 않은 IP/CIDR: {', '.join(invalid[:10])}")
+
+
+def _parse(entry: str) -> Tuple[int, int, int]:
+    # (주소 체계 인덱스, 시작, 끝) — host bit가 있으면 네트워크 주소로 정렬
+    address, slash, prefix = entry.strip().partition("/")
+    for index, (family, bits) in enumerate(_FAMILIES):
+        try:
+            packed = socket.inet_pton(family, address)
+        except OSError:
+            continue
+        if slash:
+            # "1.2.3.4/"처럼 접두사가 비었거나 숫자(ASCII)가 아니면 오류
+            if not (prefix.isascii() and prefix.isdigit()) or int(prefix) > bits:
+                raise ValueError(entry)
+            length = int(prefix)
+        else:
+            length = bits
+        host_bits = bits - length
+        start = int.from_bytes(packed, "big") >> host_bits << host_bits
+        return index, start, start + (1 << host_bits) - 1
+    raise ValueError(entry)
+
+
+def _range_to_cidrs(index: int, start: int, end: int, out: List[str]):
+    family, bits = _FAMILIES[index]
+    width = bits // 8
+    while start <= end:
+        # start에 정렬된 가장 큰 블록 중 end를 넘지 않는 크기
+        size_bits = (start & -start).bit_length() - 1 if start else bits
+        while start + (1 << size_bits) - 1 > end:
+            size_bits -= 1
+        address = socket.inet_ntop(family, start.to_bytes(width, "big"))
+        # 단일 호스트는 입력과 같이 접두사 없이 표기
+        out.append(address if size_bits == 0 else f"{address}/{bits - size_bits}")
+        start += 1 << size_bits
+
+
+def aggregate(entries: Iterable[str]) -> AggregateResult:
+    # (start, end) 구간을 start << bits | end 정수 하나로 인코딩하여 정렬 비용 절감
+    ranges: List[List[int]] = [[] for _ in _FAMILIES]
+    invalid: List[str] = []
+    count = 0
+    inet_pton = socket.inet_pton
+    af_inet = socket.AF_INET
+    v4 = ranges[0]
+    for entry in entries:
+        count += 1
+        # 가장 흔한 단일 IPv4 주소는 바로 변환
+        try:
+            value = int.from_bytes(inet_pton(af_inet, entry), "big")
+        except (OSError, TypeError):
+            pass
+        else:
+            v4.append(value << 32 | value)
+            continue
+        try:
+            index, start, end = _parse(entry)
+        except (ValueError, AttributeError):
+            invalid.append(entry)
+        else:
+            ranges[index].append(start << _FAMILIES[index][1] | end)
+    if invalid:
+        raise InvalidAddressError(invalid)
+
+    addresses: List[str] = []
+    for index, family_ranges in enumerate(ranges):
+        if not family_ranges:
+            continue
+        bits = _FAMILIES[index][1]
+        mask = (1 << bits) - 1
+        family_ranges.sort()
+        current_start, current_end = family_ranges[0] >> bits, family_ranges[0] & mask
+        for key in family_ranges:
+            start, end = key >> bits, key & mask
+            # 겹치거나 바로 이어지는 구간 병합
+            if start <= current_end + 1:
+                if end > current_end:
+                    current_end = end
+                continue
+            _range_to_cidrs(index, current_start, current_end, addresses)
+            current_start, current_end = start, end
+        _range_to_cidrs(index, current_start, current_end, addresses)
+
+    return AggregateResult(addresses=addresses, input_count=count)
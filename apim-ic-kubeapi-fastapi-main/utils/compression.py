@@ -0,0 +1,174 @@
+"""응답 압축 (Accept-Encoding 협상, br / gzip)
+
+COMPRESS_MIN_SIZE 바이트 이상인 JSON / 텍스트 응답을 클라이언트가 지원하는 인코딩으로 압축합니다.
+brotli 패키지가 설치되어 있으면 br을 우선하고, 없으면 gzip만 사용합니다.
+스트리밍 응답은 크기와 관계없이 압축하며, 청크마다 flush하여 받은 페이지를 바로 전송합니다.
+압축 시간은 Server-Timing의 compress 구간과 apim_http_compression_* 메트릭에 기록합니다.
+"""
+import setting.k8s as k8s
+from monitoring.metrics import observe_compression
+from monitoring.timing import current
+from utils.etag import weak_etag
+
+from starlette.datastructures import MutableHeaders
+
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+import time
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 서버 선호 순서 (q값이 같으면 앞의 인코딩 사용)
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/problem+json", "text/")
+
+
+class GzipEncoder:
+    def __init__(self, level: int):
+        # wbits 31: gzip 헤더 / 트레일러 포함
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality, mode=brotli.MODE_TEXT)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        output = self._compressor.process(data)
+        return output + (self._compressor.finish() if final else self._compressor.flush())
+
+
+ENCODERS: Dict[str, Callable[[int], object]] = {"gzip": GzipEncoder, "br": BrotliEncoder}
+
+
+@lru_cache(maxsize=256)
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding에서 사용할 인코딩 (q값이 가장 높은 것, 같으면 ENCODINGS 순서), 없으면 None"""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        params = params.replace(" ", "")
+        try:
+            weight = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class CompressionMiddleware:
+    """응답 압축 ASGI 미들웨어
+
+    응답 시작 메시지를 첫 본문 메시지까지 보류했다가 압축 여부를 정합니다.
+    압축한 응답은 Content-Encoding / Vary를 추가하고 ETag를 약한 ETag로 바꿉니다.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = k8s.COMPRESS_MIN_SIZE,
+        gzip_level: int = k8s.GZIP_LEVEL,
+        brotli_quality: int = k8s.BROTLI_QUALITY,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            return await self.app(scope, receive, send)
+
+        encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                encoding = negotiate(value.decode("latin-1"))
+                break
+        if encoding is None:
+            return await self.app(scope, receive, send)
+        await self.app(scope, receive, _CompressingSend(send, encoding, self.levels[encoding], self.minimum_size))
+
+
+class _CompressingSend:
+    def __init__(self, send, encoding: str, level: int, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start: Optional[dict] = None
+        self.encoder = None
+        self.raw = 0
+        self.sent = 0
+        self.seconds = 0.0
+
+    def _compressible(self, status: int, headers: MutableHeaders, body: bytes, more_body: bool) -> bool:
+        if status < 200 or status in (204, 206, 304) or "content-encoding" in headers:
+            return False
+        if not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES):
+            return False
+        # 스트리밍 응답은 전체 크기를 알 수 없으므로 항상 압축
+        return more_body or len(body) >= self.minimum_size
+
+    def _compress(self, body: bytes, final: bool) -> bytes:
+        start = time.perf_counter()
+        data = self.encoder.compress(body, final)
+        seconds = time.perf_counter() - start
+        self.raw += len(body)
+        self.sent += len(data)
+        self.seconds += seconds
+        timing = current()
+        if timing is not None:
+            timing.add("compress", seconds)
+        if final:
+            observe_compression(self.encoding, self.raw, self.sent, self.seconds)
+        return data
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            return await self.send(message)
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is None:
+            if self.encoder is None:
+                return await self.send(message)
+            return await self.send({"type": "http.response.body", "body": self._compress(body, not more_body), "more_body": more_body})
+
+        start, self.start = self.start, None
+        start["headers"] = list(start.get("headers", []))
+        headers = MutableHeaders(raw=start["headers"])
+        if not self._compressible(start["status"], headers, body, more_body):
+            # 304의 ETag도 압축된 200 응답과 같은 약한 ETag로 맞춤
+            if start["status"] == 304 and "etag" in headers:
+                headers["etag"] = weak_etag(headers["etag"])
+            await self.send(start)
+            return await self.send(message)
+
+        self.encoder = ENCODERS[self.encoding](self.level)
+        data = self._compress(body, not more_body)
+        del headers["content-length"]
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if "etag" in headers:
+            headers["etag"] = weak_etag(headers["etag"])
+        if not more_body:
+            headers["content-length"] = str(len(data))
+        await self.send(start)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
@@ -0,0 +1,47 @@
+"""목록 조회 ETag / If-None-Match 처리
+
+Informer 캐시에서 응답하면 캐시의 resourceVersion으로 ETag를 만들어 목록 조회·직렬화 전에 비교하고,
+KubeAPI를 직접 조회한 경우에는 직렬화된 응답 본문의 해시로 ETag를 만듭니다.
+ETag가 같으면 본문 없이 304를 반환합니다.
+"""
+from fastapi.responses import Response
+
+from typing import Optional
+
+import hashlib
+
+IF_NONE_MATCH_DESCRIPTION = "이전 응답의 ETag (변경이 없으면 본문 없이 304 반환)"
+# 클라이언트가 저장한 응답을 매번 ETag로 재검증하도록 함
+CACHE_CONTROL = "no-cache"
+
+
+def version_etag(version: str) -> Optional[str]:
+    return f'"rv-{version}"' if version else None
+
+
+def body_etag(body: bytes) -> str:
+    return f'"h-{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def weak_etag(etag: str) -> str:
+    # 압축 등으로 본문 바이트가 달라지는 응답은 약한 ETag로 전송 (W/"rv-1" == "rv-1", 약한 비교)
+    return etag if etag.startswith("W/") else "W/" + etag
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    # If-None-Match는 약한 비교 (W/ 접두사 무시), '*'는 항상 일치
+    if not if_none_match or etag is None:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def etag_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
@@ -0,0 +1,96 @@
+import setting.k8s as k8s
+from monitoring.timing import phase
+from utils.etag import body_etag, etag_headers, etag_matches, not_modified
+
+from fastapi import HTTPException
+from fastapi.responses import Response, StreamingResponse
+
+from typing import AsyncIterator, Callable, List, Literal, Optional
+
+import httpx
+import orjson
+
+StreamFormat = Literal["ndjson", "json"]
+
+STREAM_QUERY_DESCRIPTION = "스트리밍 응답 형식 (ndjson: 한 줄당 한 항목, json: 기존과 동일한 {\"data\": [...]} 청크 전송)"
+
+
+async def list_pages(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict,
+    params: Optional[dict] = None,
+    limit: int = k8s.K8S_PAGE_SIZE,
+) -> AsyncIterator[List[dict]]:
+    # KubeAPI limit/continue 페이지 단위 조회: 메모리 사용량은 페이지 크기로 제한
+    params = {**(params or {}), "limit": str(limit)}
+    while True:
+        response = await client.get(url=url, params=params, headers=headers)
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Kubernetes API error: {response.text}"
+            )
+        body = orjson.loads(response.content)
+        yield body.get("items", [])
+
+        token = body.get("metadata", {}).get("continue")
+        if not token:
+            break
+        params["continue"] = token
+
+
+async def cached_pages(items: List[dict], limit: int = k8s.K8S_PAGE_SIZE) -> AsyncIterator[List[dict]]:
+    # Informer 캐시 스냅샷을 같은 페이지 단위로 전송
+    for start in range(0, len(items), limit):
+        yield items[start:start + limit]
+
+
+def list_response(
+    items: List[dict],
+    project: Callable[[dict], dict],
+    etag: Optional[str] = None,
+    if_none_match: Optional[str] = None,
+) -> Response:
+    # 원본 JSON에서 필요한 필드만 dict로 투영해 바로 orjson 직렬화
+    # (Response를 직접 반환하므로 response_model 재검증/직렬화를 건너뜀, 스키마는 동일)
+    with phase("render"):
+        body = orjson.dumps({"data": [project(item) for item in items]})
+    # 캐시 resourceVersion ETag가 없으면(KubeAPI 직접 조회) 본문 해시로 비교
+    if etag is None:
+        etag = body_etag(body)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    return Response(body, media_type="application/json", headers=etag_headers(etag))
+
+
+async def stream_list_response(
+    pages: AsyncIterator[List[dict]],
+    project: Callable[[dict], dict],
+    fmt: StreamFormat,
+) -> StreamingResponse:
+    # 첫 페이지는 응답 시작 전에 받아 KubeAPI 오류를 상태 코드로 전달
+    first_page = await anext(pages, [])
+
+    async def all_pages():
+        yield first_page
+        async for page in pages:
+            yield page
+
+    async def ndjson_body():
+        async for page in all_pages():
+            if page:
+                yield b"".join(orjson.dumps(project(item)) + b"\n" for item in page)
+
+    async def json_body():
+        yield b'{"data":['
+        separator = b""
+        async for page in all_pages():
+            if page:
+                yield separator + b",".join(orjson.dumps(project(item)) for item in page)
+                separator = b","
+        yield b"]}"
+
+    if fmt == "ndjson":
+        return StreamingResponse(ndjson_body(), media_type="application/x-ndjson")
+    return StreamingResponse(json_body(), media_type="application/json")